@@ -0,0 +1,46 @@
+"""
+Скорость извлечения двух ключей из payload разными декодерами
+на сообщениях разного размера: короткое, с метаданными и с крупным вложением.
+
+Запуск: python -m benchmarks.bench_decoders
+"""
+import json
+import timeit
+
+from src.design.decoders import JsonDecoder, MsgspecDecoder, OrjsonDecoder, ScannerDecoder
+
+
+def make_payloads() -> dict[str, str]:
+    """Формирует payload Telegram-сообщений трёх размеров."""
+    meta = {
+        "chat": {"id": -100123456, "title": "Команда", "type": "supergroup"},
+        "entities": [{"type": "mention", "offset": i, "length": 5} for i in range(20)],
+        "reply_to": {"id": 123, "text": "предыдущее сообщение " * 10},
+    }
+    attachment = {"file_name": "report.pdf", "mime": "application/pdf", "data": "QUJD" * 12_500}
+    return {
+        "короткое": json.dumps({"from": "Andrew", "message": "Hello, reviewer!"}),
+        "метаданные": json.dumps({"from": "Andrew", **meta, "message": "Hello, reviewer!"}),
+        "вложение 50КБ": json.dumps({"attachments": [attachment], "from": "Andrew", "message": "Hello!", **meta}),
+    }
+
+
+def main(number: int = 20_000) -> None:
+    decoders = {"json": JsonDecoder(), "scanner": ScannerDecoder(small_payload=0)}
+    for name, decoder_class in (("orjson", OrjsonDecoder), ("msgspec", MsgspecDecoder)):
+        try:
+            decoders[name] = decoder_class()
+        except ImportError:
+            print(f"{name} не установлен, пропускаем")
+
+    keys = ("from", "message")
+    for size_name, payload in make_payloads().items():
+        print(f"{size_name} ({len(payload)} байт):")
+        for name, decoder in decoders.items():
+            runs = number if len(payload) < 10_000 else number // 10
+            best = min(timeit.repeat(lambda: decoder.extract(payload, keys), number=runs, repeat=3))
+            print(f"    {name:>8}: {best / runs * 1e6:8.2f} мкс/сообщение")
+
+
+if __name__ == "__main__":
+    main()
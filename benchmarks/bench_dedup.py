@@ -0,0 +1,53 @@
+"""
+Пропускная способность Deduplicator на потоке с повторными доставками
+и сравнение "дедупликация + разбор" с разбором всех сообщений.
+
+Запуск: python -m benchmarks.bench_dedup
+"""
+import random
+import time
+
+from benchmarks.bench_messages import make_messages
+from src.design.dedup import Deduplicator
+from src.design.messages import handle_messages
+
+
+def with_redeliveries(n: int, ratio: float) -> list:
+    """Формирует поток, в котором доля ratio сообщений - повторы недавних."""
+    rnd = random.Random(1)
+    unique = make_messages(n)
+    stream = []
+    for message in unique:
+        stream.append(message)
+        if rnd.random() < ratio:
+            stream.append(stream[-rnd.randrange(1, min(len(stream), 1000) + 1)])
+    return stream
+
+
+def main(n: int = 500_000) -> None:
+    stream = with_redeliveries(n, ratio=0.2)
+
+    for name, dedup in (
+        ("окно 100k сообщений", Deduplicator(max_size=100_000)),
+        ("окно 100k + 60 секунд", Deduplicator(max_size=100_000, window_seconds=60)),
+    ):
+        start = time.perf_counter()
+        for _ in dedup.filter(stream):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"{name:>24}: {len(stream) / elapsed:>12,.0f} сообщений/с, доля дубликатов {dedup.dedup_ratio:.1%}")
+
+    start = time.perf_counter()
+    for _ in handle_messages(stream):
+        pass
+    all_parsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in handle_messages(Deduplicator().filter(stream)):
+        pass
+    deduplicated = time.perf_counter() - start
+    print(f"разбор всех: {all_parsed:.2f} с, дедупликация + разбор: {deduplicated:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Время холодного импорта подпакетов src по данным python -X importtime.
+Для каждого подпакета все его модули (кроме тестов) импортируются в отдельном
+интерпретаторе; печатается суммарное время импорта и самые тяжёлые модули.
+
+Запуск: python -m benchmarks.bench_imports
+"""
+import pkgutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import src
+
+SUBPACKAGES = ("wallets", "descriptors", "iterators", "design", "refactor")
+
+
+def subpackage_modules(name: str) -> List[str]:
+    """Возвращает модули подпакета src.<name> без тестов (не импортируя их)."""
+    path = Path(src.__path__[0]) / name
+    return [f"src.{name}"] + [
+        f"src.{name}.{module.name}" for module in pkgutil.iter_modules([str(path)]) if module.name != "tests"
+    ]
+
+
+def import_times(modules: List[str]) -> List[Tuple[int, int, int, str]]:
+    """
+    Импортирует модули в новом интерпретаторе с -X importtime.
+    Return:
+        Строки отчёта: (собственное время, накопленное время в мкс, уровень вложенности, модуль).
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True, cwd=Path(src.__path__[0]).parent,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), level, name.strip()))
+    return rows
+
+
+def package_import_time(rows: List[Tuple[int, int, int, str]]) -> int:
+    """Суммарное время импорта модулей src (в мкс) - без запуска самого интерпретатора."""
+    return sum(cumulative for _, cumulative, level, name in rows if level == 0 and name.split(".")[0] == "src")
+
+
+def main(repeat: int = 5) -> None:
+    for name in SUBPACKAGES:
+        modules = subpackage_modules(name)
+        runs = [import_times(modules) for _ in range(repeat)]
+        best = min(runs, key=package_import_time)
+        heaviest: Dict[str, int] = {row[3]: row[1] for row in best if row[2] <= 1}
+        top = sorted(heaviest.items(), key=lambda item: -item[1])[:4]
+        print(f"src.{name:<12} {package_import_time(best) / 1000:>8.1f} мс  " + ", ".join(
+            f"{module} {us / 1000:.1f}" for module, us in top
+        ))
+
+
+if __name__ == "__main__":
+    main()
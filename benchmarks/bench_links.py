@@ -0,0 +1,77 @@
+"""
+Сравнение скорости отбора ссылок на бюллетени:
+is_valid_xls_link + extract_date_from_href (strptime) против пакетного extract_links,
+а также разбор страницы BeautifulSoup против чтения из PageLinksCache.
+
+Запуск: python -m benchmarks.bench_links
+"""
+import random
+import tempfile
+import timeit
+from datetime import date, timedelta
+
+from src.refactor.links import (
+    BASE_URL,
+    EXPECTED_PATH_PREFIX,
+    PageLinksCache,
+    extract_date_from_href,
+    extract_links,
+    extract_page_links,
+    is_valid_xls_link,
+)
+
+
+def make_hrefs(n: int) -> list[str]:
+    """Генерирует ссылки, похожие на страницу архива: в основном бюллетени и немного мусора."""
+    rnd = random.Random(0)
+    start = date(2015, 1, 1)
+    hrefs = []
+    for _ in range(n):
+        day = start + timedelta(days=rnd.randrange(3650))
+        roll = rnd.random()
+        if roll < 0.8:
+            hrefs.append(f"{EXPECTED_PATH_PREFIX}{day:%Y%m%d}162000.xls?r={rnd.randrange(10**6)}")
+        elif roll < 0.9:
+            hrefs.append(f"{EXPECTED_PATH_PREFIX}{day:%Y%m%d}162000.pdf")
+        else:
+            hrefs.append(f"/upload/reports/other/{day:%Y%m%d}.xls")
+    return hrefs
+
+
+def per_link(hrefs: list[str]) -> list:
+    """Прежняя обработка: split + is_valid_xls_link + strptime для каждой ссылки."""
+    results = []
+    for href in hrefs:
+        href = href.split("?")[0]
+        if not is_valid_xls_link(href):
+            continue
+        file_date = extract_date_from_href(href)
+        if file_date:
+            results.append((f"{BASE_URL}{href}", file_date))
+    return results
+
+
+def main(n: int = 50_000, repeat: int = 5) -> None:
+    hrefs = make_hrefs(n)
+    assert per_link(hrefs) == extract_links(hrefs)
+
+    for name, func in (("per_link", per_link), ("extract_links", extract_links)):
+        best = min(timeit.repeat(lambda: func(hrefs), number=1, repeat=repeat))
+        print(f"{name:>14}: {best * 1000:8.2f} мс на {n} ссылок ({n / best:,.0f} ссылок/с)")
+
+    # страница списка: 20 бюллетеней среди прочей разметки
+    html = "<html><body>" + "".join(
+        f'<div class="item"><a class="accordeon-inner__item-title link xls" href="{href}">Бюллетень</a>'
+        f'<span>{"описание " * 20}</span></div>'
+        for href in hrefs[:20]
+    ) + "</body></html>"
+    with tempfile.TemporaryDirectory() as directory:
+        cache = PageLinksCache(directory)
+        cache.extract(html)
+        for name, func in (("BeautifulSoup", extract_page_links), ("PageLinksCache", cache.extract)):
+            best = min(timeit.repeat(lambda: func(html), number=100, repeat=repeat)) / 100
+            print(f"{name:>14}: {best * 1000:8.3f} мс на страницу")
+
+
+if __name__ == "__main__":
+    main()
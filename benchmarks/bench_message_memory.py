@@ -0,0 +1,56 @@
+"""
+Память на одно буферизованное сообщение: обычный dataclass с __dict__,
+dataclass со __slots__, слоты + интернирование имён и колоночный ParsedMessageBatch.
+
+Запуск: python -m benchmarks.bench_message_memory
+"""
+import json
+import random
+import tracemalloc
+from dataclasses import dataclass
+
+from src.design.messages import InternTable, ParsedMessage, ParsedMessageBatch
+
+
+@dataclass
+class DictParsedMessage:
+    """ParsedMessage в прежнем виде: dataclass без __slots__."""
+    user: str
+    text: str
+
+
+def make_payloads(n: int) -> list[str]:
+    """Генерирует payload с небольшим набором пользователей, как в реальном чате."""
+    rnd = random.Random(0)
+    users = [f"user_{i}" for i in range(200)]
+    return [json.dumps({"from": rnd.choice(users), "message": f"сообщение {i}"}) for i in range(n)]
+
+
+def measure(name: str, build, payloads: list[str]) -> None:
+    """Печатает прирост памяти при построении буфера из всех payload (без самих payload)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    buffer = build(payloads)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{name:>28}: {size / len(payloads):7.1f} байт/сообщение")
+    del buffer
+
+
+def main(n: int = 200_000) -> None:
+    payloads = make_payloads(n)
+
+    def decoded(payloads):
+        for payload in payloads:
+            data = json.loads(payload)
+            yield data["from"], data["message"]
+
+    interner = InternTable()
+    measure("dataclass с __dict__", lambda p: [DictParsedMessage(u, t) for u, t in decoded(p)], payloads)
+    measure("dataclass со __slots__", lambda p: [ParsedMessage(u, t) for u, t in decoded(p)], payloads)
+    measure("__slots__ + интернирование", lambda p: [ParsedMessage(interner(u), t) for u, t in decoded(p)], payloads)
+    measure("ParsedMessageBatch", lambda p: ParsedMessageBatch(ParsedMessage(u, t) for u, t in decoded(p)), payloads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Пропускная способность разбора сообщений:
+handle_message по одному против потокового handle_messages (в том числе с пулом процессов).
+
+Запуск: python -m benchmarks.bench_messages
+"""
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.design.messages import JsonMessage, MessageType, ParserFactory, handle_message, handle_messages
+
+
+FIELDS = {
+    MessageType.TELEGRAM: ("from", "message"),
+    MessageType.MATTERMOST: ("username", "text"),
+    MessageType.SLACK: ("user_name", "content"),
+}
+
+
+def make_messages(n: int) -> list[JsonMessage]:
+    """Генерирует сообщения из трёх источников вперемешку с небольшим набором пользователей."""
+    rnd = random.Random(0)
+    users = [f"user{i}" for i in range(50)]
+    messages = []
+    for i in range(n):
+        message_type = rnd.choice(list(FIELDS))
+        user_key, text_key = FIELDS[message_type]
+        payload = json.dumps({user_key: rnd.choice(users), text_key: f"message number {i}"})
+        messages.append(JsonMessage(message_type, payload))
+    return messages
+
+
+def handle_message_new_factory(json_message: JsonMessage):
+    """Прежняя реализация handle_message: новая фабрика на каждое сообщение."""
+    return ParserFactory().get_parser(json_message.message_type).parse(json_message.payload)
+
+
+def measure(name: str, func, messages: list[JsonMessage]) -> None:
+    start = time.perf_counter()
+    count = sum(1 for _ in func(messages))
+    elapsed = time.perf_counter() - start
+    print(f"{name:>32}: {count / elapsed:>12,.0f} сообщений/с")
+
+
+def main(n: int = 200_000) -> None:
+    messages = make_messages(n)
+    measure("новая фабрика на сообщение", lambda items: (handle_message_new_factory(m) for m in items), messages)
+    measure("handle_message по одному", lambda items: (handle_message(m) for m in items), messages)
+    measure("handle_messages", handle_messages, messages)
+    with ProcessPoolExecutor(4) as executor:
+        measure(
+            "handle_messages + 4 процесса",
+            lambda items: handle_messages(items, batch_size=65536, executor=executor, parallel_threshold=8192),
+            messages,
+        )
+
+
+if __name__ == "__main__":
+    main()
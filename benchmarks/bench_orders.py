@@ -0,0 +1,97 @@
+"""
+Скорость расчёта заказов: прежняя цепочка if/elif с созданием скидок на каждый заказ
+против таблицы правил DiscountRules (apply_discounts и DiscountRules.apply)
+и векторных apply_discounts_bulk/apply_bulk_minor (если установлен numpy), а также итог
+по всем заказам во float (с округлением каждого заказа до копеек) против точного total_exact.
+
+Запуск: python -m benchmarks.bench_orders
+"""
+import random
+import time
+from typing import List
+
+from src.design.orders import (
+    Discount,
+    FixedDiscount,
+    LoyaltyDiscount,
+    Order,
+    PercentageDiscount,
+    apply_discounts,
+    apply_discounts_bulk,
+    default_rules,
+    total_exact,
+)
+
+
+def make_orders(n: int) -> List[Order]:
+    """Генерирует корзины с типичными наборами промокодов."""
+    rnd = random.Random(0)
+    code_sets = [[], ["FIX10"], ["PERCENT5"], ["FIX10", "PERCENT5"], ["PROMO2024"], ["PERCENT5", "FIX10", "FIX10"]]
+    return [
+        Order(round(rnd.uniform(1, 500), 2), rnd.random() < 0.3, list(rnd.choice(code_sets)))
+        for _ in range(n)
+    ]
+
+
+def legacy_apply_discounts(order: Order) -> float:
+    """Прежний apply_discounts: новые объекты скидок для каждого заказа."""
+    discounts: List[Discount] = []
+    for code in order.discount_codes:
+        if code == "FIX10":
+            discounts.append(FixedDiscount(10))
+        elif code == "PERCENT5":
+            discounts.append(PercentageDiscount(5))
+    if order.is_loyal_customer:
+        discounts.append(LoyaltyDiscount(5))
+
+    total_discount = 0.0
+    for discount in discounts:
+        total_discount += discount.apply(order)
+    return max(0.0, order.total_amount - total_discount)
+
+
+def measure(name: str, func, orders: List[Order]) -> List[float]:
+    start = time.perf_counter()
+    results = [func(order) for order in orders]
+    elapsed = time.perf_counter() - start
+    print(f"{name:>24}: {len(orders) / elapsed:>12,.0f} заказов/с")
+    return results
+
+
+def main(n: int = 500_000) -> None:
+    orders = make_orders(n)
+    reference = measure("if/elif + новые скидки", legacy_apply_discounts, orders)
+    assert measure("apply_discounts", apply_discounts, orders) == reference
+    assert measure("DiscountRules.apply", default_rules().apply, orders) == reference
+    measure("DiscountRules.apply_minor", default_rules().apply_minor, orders)
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("numpy не установлен, apply_discounts_bulk пропущен")
+        return
+    start = time.perf_counter()
+    bulk = apply_discounts_bulk(orders)
+    elapsed = time.perf_counter() - start
+    print(f"{'apply_discounts_bulk':>24}: {n / elapsed:>12,.0f} заказов/с")
+    assert bulk.tolist() == reference
+
+    start = time.perf_counter()
+    bulk_minor = default_rules().apply_bulk_minor(orders)
+    elapsed = time.perf_counter() - start
+    print(f"{'apply_bulk_minor':>24}: {n / elapsed:>12,.0f} заказов/с")
+
+    # итог всех заказов: float с округлением до копеек против точного total_exact
+    start = time.perf_counter()
+    float_total = round(float(apply_discounts_bulk(orders).round(2).sum()), 2)
+    float_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    exact = total_exact(orders)
+    exact_elapsed = time.perf_counter() - start
+    print(f"{'итог float + round':>24}: {n / float_elapsed:>12,.0f} заказов/с ({float_total})")
+    print(f"{'итог total_exact':>24}: {n / exact_elapsed:>12,.0f} заказов/с ({exact.value})")
+    assert int(bulk_minor.sum()) == int(exact.value * 100)
+
+
+if __name__ == "__main__":
+    main()
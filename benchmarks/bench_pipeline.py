@@ -0,0 +1,49 @@
+"""
+Конвейер src.iterators.pipeline против обычного последовательного цикла
+на CPU-нагруженной функции: map_parallel по процессам с разным размером пачек.
+
+Запуск: python -m benchmarks.bench_pipeline
+"""
+import os
+import time
+
+from src.iterators.pipeline import Pipeline
+
+
+def checksum(x: int) -> int:
+    """CPU-нагруженная функция: несколько тысяч итераций хэширования числа."""
+    h = x
+    for _ in range(2_000):
+        h = (h * 1_000_003 + 7) % 2_147_483_647
+    return h
+
+
+def is_odd(x: int) -> bool:
+    return x % 2 == 1
+
+
+def main(n: int = 20_000) -> None:
+    start = time.perf_counter()
+    reference = []
+    for x in range(n):
+        value = checksum(x)
+        if is_odd(value):
+            reference.append(value)
+    serial = time.perf_counter() - start
+    print(f"{'последовательный цикл':>40}: {n / serial:>10,.0f} элементов/с")
+
+    workers = os.cpu_count() or 1
+    for chunk_size in (1, 64, 512):
+        for ordered in (True, False):
+            start = time.perf_counter()
+            results = list(
+                Pipeline(range(n)).map_parallel(checksum, workers=workers, ordered=ordered, chunk_size=chunk_size).filter(is_odd)
+            )
+            elapsed = time.perf_counter() - start
+            assert (results if ordered else sorted(results)) == (reference if ordered else sorted(reference))
+            name = f"map_parallel x{workers}, пачка {chunk_size}{'' if ordered else ', без порядка'}"
+            print(f"{name:>40}: {n / elapsed:>10,.0f} элементов/с ({serial / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
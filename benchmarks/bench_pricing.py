@@ -0,0 +1,74 @@
+"""
+Нагрузочный тест PricingService: множество корутин запрашивают цены по одному заказу.
+Сравнивает прямой вызов apply_discounts с микропакетами разного размера и задержки,
+в цикле событий и в пуле процессов, и печатает пропускную способность и p50/p99 задержки.
+
+Запуск: python -m benchmarks.bench_pricing
+"""
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.bench_orders import make_orders
+from src.design.consumer import LatencyStats
+from src.design.orders import apply_discounts
+from src.design.pricing import PricingService
+
+
+async def direct(order):
+    """Базовый вариант: каждый запрос считается сразу."""
+    await asyncio.sleep(0)
+    return apply_discounts(order)
+
+
+async def load(price, orders, clients: int) -> LatencyStats:
+    """Запускает clients корутин, которые по очереди запрашивают цены заказов."""
+    stats = LatencyStats(max_samples=len(orders))
+    per_client = len(orders) // clients
+
+    async def client(chunk):
+        for order in chunk:
+            start = time.perf_counter()
+            await price(order)
+            stats.record("price", time.perf_counter() - start)
+
+    await asyncio.gather(*(client(orders[i * per_client:(i + 1) * per_client]) for i in range(clients)))
+    return stats
+
+
+def report(name: str, stats: LatencyStats, elapsed: float) -> None:
+    percentiles = stats.percentiles((50, 99))["price"]
+    print(
+        f"{name:>32}: {stats.count('price') / elapsed:>10,.0f} заказов/с,"
+        f" p50 {percentiles[50] * 1e6:>8,.0f} мкс, p99 {percentiles[99] * 1e6:>8,.0f} мкс"
+    )
+
+
+async def run(n: int, clients: int) -> None:
+    orders = make_orders(n)
+
+    start = time.perf_counter()
+    stats = await load(direct, orders, clients)
+    report("apply_discounts напрямую", stats, time.perf_counter() - start)
+
+    for max_batch, max_delay_us in ((64, 0), (256, 200), (1024, 1000)):
+        service = PricingService(max_batch=max_batch, max_delay_us=max_delay_us)
+        start = time.perf_counter()
+        stats = await load(service.price, orders, clients)
+        report(f"пакет {max_batch}, {max_delay_us} мкс", stats, time.perf_counter() - start)
+
+    with ProcessPoolExecutor(2) as executor:
+        service = PricingService(max_batch=1024, max_delay_us=1000, executor=executor)
+        await service.price(orders[0])  # запуск процессов не входит в замер
+        start = time.perf_counter()
+        stats = await load(service.price, orders, clients)
+        report("пакет 1024, 1000 мкс, процессы", stats, time.perf_counter() - start)
+        await service.close()
+
+
+def main(n: int = 200_000, clients: int = 1000) -> None:
+    asyncio.run(run(n, clients))
+
+
+if __name__ == "__main__":
+    main()
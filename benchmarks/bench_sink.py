@@ -0,0 +1,63 @@
+"""
+Скорость архивации ParsedMessage: json.dumps и отдельная запись в файл для каждого
+сообщения против буферизованного MessageSink (NDJSON/двоичный формат, со сжатием и без),
+а также скорость чтения архива через read_messages.
+
+Запуск: python -m benchmarks.bench_sink
+"""
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_messages import make_messages
+from src.design.messages import handle_messages
+from src.design.sink import MessageSink, replay
+
+
+def per_message_writes(messages, path: Path) -> None:
+    """Прежний способ: json.dumps и file.write на каждое сообщение."""
+    with open(path, "w", encoding="utf-8") as file:
+        for message in messages:
+            file.write(json.dumps({"user": message.user, "text": message.text}, ensure_ascii=False))
+            file.write("\n")
+
+
+def main(n: int = 200_000) -> None:
+    messages = list(handle_messages(make_messages(n)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        per_message_writes(messages, Path(directory) / "plain.ndjson")
+        elapsed = time.perf_counter() - start
+        print(f"{'dumps + write на сообщение':>28}: {n / elapsed:>12,.0f} сообщений/с")
+
+    variants = [("ndjson", None), ("binary", None), ("ndjson", "gzip"), ("binary", "gzip")]
+    try:
+        import zstandard  # noqa: F401
+        variants += [("ndjson", "zstd"), ("binary", "zstd")]
+    except ImportError:
+        print("zstandard не установлен, сжатие zstd пропущено")
+
+    for data_format, compression in variants:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            with MessageSink(directory, format=data_format, compression=compression) as sink:
+                sink.write_many(messages)
+            write_elapsed = time.perf_counter() - start
+            size = sum(path.stat().st_size for path in sink.files)
+
+            start = time.perf_counter()
+            count = sum(1 for _ in replay(sink.files))
+            read_elapsed = time.perf_counter() - start
+            assert count == n
+
+        name = f"MessageSink {data_format}/{compression or 'без сжатия'}"
+        print(
+            f"{name:>28}: {n / write_elapsed:>12,.0f} сообщений/с запись,"
+            f" {n / read_elapsed:>12,.0f} чтение, {size / n:5.1f} байт/сообщение"
+        )
+
+
+if __name__ == "__main__":
+    main()
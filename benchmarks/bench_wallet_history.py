@@ -0,0 +1,60 @@
+"""
+Запрос баланса кошелька на момент времени: проигрывание всех операций с начала дня
+против двоичного поиска по WalletHistory, а также стоимость записи истории.
+
+Запуск: python -m benchmarks.bench_wallet_history
+"""
+import random
+import time
+from decimal import Decimal
+
+from src.wallets.currency import usd
+from src.wallets.history import WalletHistory
+from src.wallets.money import Money, Wallet
+
+
+def main(n: int = 200_000, queries: int = 1_000) -> None:
+    rnd = random.Random(0)
+    postings = [(i * 0.4, Decimal(rnd.randint(1, 10_000)) / 100) for i in range(n)]
+
+    start = time.perf_counter()
+    plain = Wallet()
+    for _, amount in postings:
+        plain.add(Money(amount, usd))
+    plain_elapsed = time.perf_counter() - start
+
+    now = [0.0]
+    history = WalletHistory(clock=lambda: now[0])
+    start = time.perf_counter()
+    wallet = Wallet(history=history)
+    for when, amount in postings:
+        now[0] = when
+        wallet.add(Money(amount, usd))
+    history_elapsed = time.perf_counter() - start
+    print(f"{'запись без истории':>24}: {n / plain_elapsed:>12,.0f} операций/с")
+    print(f"{'запись с историей':>24}: {n / history_elapsed:>12,.0f} операций/с")
+
+    moments = [rnd.uniform(0, n * 0.4) for _ in range(queries)]
+
+    start = time.perf_counter()
+    replayed = []
+    for moment in moments[:20]:
+        balance = Decimal(0)
+        for when, amount in postings:
+            if when > moment:
+                break
+            balance += amount
+        replayed.append(balance)
+    replay_elapsed = (time.perf_counter() - start) / 20
+
+    start = time.perf_counter()
+    answers = [history.balance_at(usd, moment).value for moment in moments]
+    bisect_elapsed = (time.perf_counter() - start) / queries
+    assert answers[:20] == replayed
+
+    print(f"{'проигрывание операций':>24}: {replay_elapsed * 1e6:>12,.1f} мкс/запрос")
+    print(f"{'WalletHistory.balance_at':>24}: {bisect_elapsed * 1e6:>12,.1f} мкс/запрос")
+
+
+if __name__ == "__main__":
+    main()
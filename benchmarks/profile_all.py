@@ -0,0 +1,284 @@
+"""
+Профилирование всех подсистем src одной командой: для каждой типовой нагрузки
+замеряются время, число вызовов функций (cProfile) и память (tracemalloc) на операцию,
+результаты сравниваются с сохранённым JSON-базисом и отмечаются регрессии.
+
+Метрики на операцию:
+    seconds - время (лучший из трёх прогонов без профилировщиков),
+    calls - число вызовов функций по cProfile (не зависит от машины),
+    blocks, bytes - блоки и байты памяти, оставшиеся после операции,
+        когда её результат сохраняется (по tracemalloc),
+    alloc_bytes - сколько памяти операция занимает на пике, включая временные объекты,
+        которые освобождаются до её завершения (пик tracemalloc над памятью перед операцией;
+        в blocks и bytes такие объекты не попадают),
+    peak_bytes - пик памяти за весь прогон без сохранения результатов, байт (не на операцию).
+
+Запуск:
+    python -m benchmarks.profile_all                   # сравнить с базисом (создаётся, если его нет)
+    python -m benchmarks.profile_all --update-baseline # перезаписать базис
+    python -m benchmarks.profile_all --only orders     # только нагрузки, в имени которых есть "orders"
+Код возврата 1, если выросла любая метрика, кроме времени (рост времени - только предупреждение).
+Вызовы и аллокации зависят от версий Python и библиотек, поэтому окружение сохраняется
+вместе с базисом. Если окружение не совпадает, сравнивать не с чем: скрипт завершается
+с кодом 2, пока базис не перезаписан с --update-baseline.
+"""
+import argparse
+import cProfile
+import gc
+import json
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.bench_messages import make_messages
+from benchmarks.bench_orders import make_orders
+from src.descriptors.models import Field, Model
+from src.design.decoders import JsonDecoder
+from src.design.messages import InternTable, ParserFactory
+from src.design.orders import apply_discounts
+from src.iterators.utils import Fibo, RetrieveRemoteData
+from src.refactor.links import EXPECTED_PATH_PREFIX, parse_page_links
+from src.wallets.currency import rub
+from src.wallets.money import Money, Wallet
+
+DEFAULT_BASELINE = Path(__file__).with_name("profile_baseline.json")
+
+# Допустимый рост метрики относительно базиса. Рост времени только выводится предупреждением:
+# оно зависит от машины и её загрузки, а остальные метрики воспроизводимы
+THRESHOLDS = {"seconds": 0.5, "calls": 0.1, "blocks": 0.1, "bytes": 0.1, "alloc_bytes": 0.1, "peak_bytes": 0.25}
+ADVISORY = {"seconds"}
+
+# Абсолютный запас: мелкие значения (доли блока, сотни байт пика) колеблются от запуска к запуску
+SLACK = {"seconds": 0, "calls": 1, "blocks": 1, "bytes": 64, "alloc_bytes": 64, "peak_bytes": 4096}
+
+# Нагрузка: функция подготовки, возвращающая (операция от номера итерации, число итераций)
+Workload = Callable[[], Tuple[Callable[[int], Any], int]]
+
+
+def money_workload():
+    amounts = [Money(Decimal(i) / 100, rub) for i in range(1000)]
+    return (lambda i: amounts[i % 1000] + amounts[(i * 7) % 1000] - amounts[(i * 3) % 1000]), 50_000
+
+
+def wallet_workload():
+    wallet = Wallet(Money(Decimal(10**9), rub))
+    amounts = [Money(Decimal(i) / 100, rub) for i in range(1000)]
+
+    def operation(i):
+        wallet.add(amounts[i % 1000])
+        return wallet.sub(amounts[(i * 7) % 1000])
+
+    return operation, 50_000
+
+
+class _Project(Model):
+    slug = Field("meta.slug")
+    href = Field("meta.remote.href")
+
+
+def field_workload():
+    projects = [_Project({"meta": {"slug": f"p{i}", "remote": {"href": f"/p/{i}"}}}) for i in range(1000)]
+
+    def operation(i):
+        project = projects[i % 1000]
+        project.slug = project.href
+        return project.slug
+
+    return operation, 100_000
+
+
+def fibo_workload():
+    return (lambda i: list(Fibo(50))), 20_000
+
+
+def remote_data_workload():
+    return (lambda i: list(RetrieveRemoteData(per_page=3))), 20_000
+
+
+def links_workload():
+    links = "".join(
+        f'<div class="item"><a class="accordeon-inner__item-title link xls" '
+        f'href="{EXPECTED_PATH_PREFIX}202401{day:02d}162000.xls?r={day}">Бюллетень</a></div>'
+        for day in range(1, 21)
+    )
+    html = f"<html><body>{links}</body></html>"
+    return (lambda i: parse_page_links(html, date(2024, 1, 5), date(2024, 1, 25))), 300
+
+
+def messages_workload():
+    # декодер закреплён явно, чтобы вызовы и аллокации не зависели от декодера по умолчанию
+    factory = ParserFactory(JsonDecoder(), interner=InternTable())
+    messages = [(message.message_type, message.payload) for message in make_messages(1000)]
+    return (lambda i: factory.parse(*messages[i % 1000])), 50_000
+
+
+def orders_workload():
+    orders = make_orders(1000)
+    return (lambda i: apply_discounts(orders[i % 1000])), 100_000
+
+
+WORKLOADS: Dict[str, Workload] = {
+    "wallets.money": money_workload,
+    "wallets.wallet": wallet_workload,
+    "descriptors.field": field_workload,
+    "iterators.fibo": fibo_workload,
+    "iterators.remote_data": remote_data_workload,
+    "refactor.parse_page_links": links_workload,
+    "design.parse_message": messages_workload,
+    "design.apply_discounts": orders_workload,
+}
+
+
+def environment() -> Dict[str, str]:
+    """Версии Python и библиотек, от которых зависят число вызовов и аллокаций в нагрузках."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = {"python": f"{platform.python_implementation()} {platform.python_version()}"}
+    for package in ("beautifulsoup4", "more-itertools"):
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def _transient_bytes(operation: Callable[[int], Any], n: int) -> float:
+    """Средний пик памяти над уровнем перед операцией; tracemalloc должен быть запущен."""
+    reset_peak = tracemalloc.reset_peak
+    traced = tracemalloc.get_traced_memory
+    total = 0
+    for i in range(n):
+        reset_peak()
+        before = traced()[0]
+        operation(i)
+        total += traced()[1] - before
+    return total / n
+
+
+def profile(workload: Workload, top: int = 5) -> Dict[str, Any]:
+    """
+    Прогоняет нагрузку без профилировщиков, под cProfile и под tracemalloc.
+    Return:
+        Метрики на операцию и самые затратные функции.
+    """
+    operation, n = workload()
+    operation(0)  # прогрев: ленивые импорты и кэши не должны попадать в замер
+
+    seconds = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for i in range(n):
+            operation(i)
+        seconds = min(seconds, (time.perf_counter() - start) / n)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for i in range(n):
+        operation(i)
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+    hot = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:top]
+
+    # циклический мусор (например, деревья BeautifulSoup) собирается перед снимками,
+    # иначе число оставшихся блоков зависело бы от момента запуска сборщика
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [operation(i) for i in range(n)]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    del results
+    gc.collect()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    for i in range(n):
+        operation(i)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    # собственные объекты замера (кортежи и числа get_traced_memory) вычитаются по пустой операции
+    alloc = _transient_bytes(operation, n) - _transient_bytes(lambda i: None, n)
+    tracemalloc.stop()
+
+    trace_filter = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(trace_filter).compare_to(before.filter_traces(trace_filter), "filename")
+    return {
+        "operations": n,
+        "seconds": seconds,
+        "calls": stats.total_calls / n,
+        "blocks": sum(stat.count_diff for stat in diff) / n,
+        "bytes": sum(stat.size_diff for stat in diff) / n,
+        "alloc_bytes": alloc,
+        "peak_bytes": peak,
+        "hot": [
+            {"function": f"{Path(filename).name}:{line}({name})", "calls": calls, "tottime": tottime}
+            for (filename, line, name), (_, calls, tottime, _, _) in hot
+        ],
+    }
+
+
+def regressions(result: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Возвращает метрики, выросшие сильнее допустимого относительно базиса."""
+    flagged = []
+    for metric, threshold in THRESHOLDS.items():
+        old, new = baseline.get(metric), result[metric]
+        if old is None:
+            continue
+        if new > old * (1 + threshold) and new - old > SLACK[metric]:
+            flagged.append(f"{metric} {old:.4g} -> {new:.4g}")
+    return flagged
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="JSON-файл базиса")
+    parser.add_argument("--update-baseline", action="store_true", help="перезаписать базис текущими результатами")
+    parser.add_argument("--only", default="", help="подстрока имени нагрузки")
+    args = parser.parse_args(argv)
+
+    stored = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+    current = environment()
+    baseline = stored.get("workloads", {})
+    if stored and stored.get("environment") != current:
+        print(
+            f"ОШИБКА: окружение {current} отличается от базиса {stored.get('environment')}:"
+            f" вызовы и аллокации несравнимы. Перезапишите базис с --update-baseline",
+            file=sys.stderr,
+        )
+        if not args.update_baseline:
+            return 2
+        baseline = {}
+    results = dict(baseline)
+    failed = False
+    for name, workload in WORKLOADS.items():
+        if args.only not in name:
+            continue
+        result = results[name] = profile(workload)
+        flagged = regressions(result, baseline[name]) if name in baseline and not args.update_baseline else []
+        warnings = [entry for entry in flagged if entry.split()[0] in ADVISORY]
+        flagged = [entry for entry in flagged if entry not in warnings]
+        failed = failed or bool(flagged)
+        print(
+            f"{name:<26} {result['seconds'] * 1e6:>9.2f} мкс {result['calls']:>8.1f} вызовов"
+            f" {result['blocks']:>6.1f} блоков {result['bytes']:>8.1f} байт/оп"
+            f" {result['alloc_bytes']:>8.1f} байт на пике/оп"
+            f" пик {result['peak_bytes'] / 1024:>8.1f} КиБ"
+            + (f"  РЕГРЕССИЯ: {', '.join(flagged)}" if flagged else "")
+            + (f"  медленнее: {', '.join(warnings)}" if warnings else "")
+        )
+        for entry in result["hot"][:3]:
+            print(f"{'':<28}{entry['tottime']:>8.3f} с {entry['calls']:>9} {entry['function']}")
+
+    if args.update_baseline or not stored:
+        stored = {"environment": current, "workloads": results}
+        args.baseline.write_text(json.dumps(stored, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Базис записан в {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
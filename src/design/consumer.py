@@ -0,0 +1,185 @@
+import asyncio
+import inspect
+import math
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Optional, Sequence, Union
+
+from src.design.messages import JsonMessage, MessageType, ParsedMessage, handle_message
+
+
+# Обработчик разобранного сообщения: обычная функция или корутина
+MessageHandler = Callable[[ParsedMessage], Union[None, Awaitable[None]]]
+
+# Признак закрытия источника в очереди
+_CLOSED = object()
+
+
+class QueueSource:
+    """
+    Источник сообщений в памяти поверх asyncio.Queue.
+    Используется вместо сокетов и брокеров в тестах и при локальной отладке.
+
+    Attributes:
+        maxsize: размер очереди (0 - без ограничения).
+    """
+    def __init__(self, maxsize: int = 0):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def put(self, message: JsonMessage) -> None:
+        """Добавляет сообщение в источник (ждёт, если очередь заполнена)."""
+        await self._queue.put(message)
+
+    async def close(self) -> None:
+        """Закрывает источник: после уже добавленных сообщений итерация завершится."""
+        await self._queue.put(_CLOSED)
+
+    async def __aiter__(self) -> AsyncIterator[JsonMessage]:
+        while True:
+            message = await self._queue.get()
+            if message is _CLOSED:
+                return
+            yield message
+
+
+class LatencyStats:
+    """
+    Задержки обработки сообщений по типам источников.
+    Для каждого типа хранятся последние max_samples замеров.
+
+    Attributes:
+        max_samples: сколько последних замеров хранить для каждого типа.
+    """
+    def __init__(self, max_samples: int = 10_000):
+        self.max_samples = max_samples
+        self._samples: Dict[MessageType, Deque[float]] = {}
+
+    def record(self, message_type: MessageType, seconds: float) -> None:
+        """Добавляет замер задержки."""
+        samples = self._samples.get(message_type)
+        if samples is None:
+            samples = self._samples[message_type] = deque(maxlen=self.max_samples)
+        samples.append(seconds)
+
+    def percentiles(self, percents: Sequence[float] = (50, 90, 99)) -> Dict[MessageType, Dict[float, float]]:
+        """
+        Считает перцентили задержки методом ближайшего ранга:
+        p-й перцентиль выборки из n замеров - элемент с номером ceil(p / 100 * n).
+        Parameters:
+            percents: нужные перцентили (от 0 до 100).
+        Return:
+            Словарь {тип: {перцентиль: задержка в секундах}}.
+        """
+        result = {}
+        for message_type, samples in self._samples.items():
+            ordered = sorted(samples)
+            result[message_type] = {
+                percent: ordered[min(len(ordered) - 1, max(0, math.ceil(percent * len(ordered) / 100) - 1))]
+                for percent in percents
+            }
+        return result
+
+    def count(self, message_type: MessageType) -> int:
+        """Возвращает количество хранимых замеров для типа."""
+        return len(self._samples.get(message_type, ()))
+
+
+class MessageConsumer:
+    """
+    Асинхронный обработчик сообщений из нескольких источников.
+
+    Сообщения из всех источников попадают в общую ограниченную очередь: когда
+    обработчики не успевают, чтение источников приостанавливается (backpressure).
+    Обработчики разбирают сообщения через handle_message (то есть через ParserFactory),
+    а сообщения с payload от offload_threshold символов разбираются в executor,
+    чтобы не блокировать цикл событий.
+
+    Attributes:
+        handler: функция или корутина, получающая каждое ParsedMessage,
+        workers: число одновременно работающих обработчиков,
+        queue_size: размер общей очереди,
+        offload_threshold: размер payload, начиная с которого разбор идёт в executor,
+        executor: пул для тяжёлых сообщений (None - пул потоков цикла событий),
+        on_error: вызывается с (JsonMessage, исключение) при ошибке разбора;
+            если не задан, ошибка останавливает run(),
+        stats: задержки от получения сообщения до завершения его обработки.
+    """
+    def __init__(
+        self,
+        handler: MessageHandler,
+        workers: int = 4,
+        queue_size: int = 1024,
+        offload_threshold: int = 64 * 1024,
+        executor: Optional[Executor] = None,
+        on_error: Optional[Callable[[JsonMessage, Exception], None]] = None,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+        self.offload_threshold = offload_threshold
+        self.executor = executor
+        self.on_error = on_error
+        self.stats = LatencyStats()
+
+    async def run(self, sources: Iterable[AsyncIterable[JsonMessage]]) -> None:
+        """
+        Читает все источники до их закрытия и обрабатывает сообщения.
+        Parameters:
+            sources: асинхронные источники JsonMessage
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        workers = [asyncio.create_task(self._work(queue)) for _ in range(self.workers)]
+        readers = asyncio.gather(*(self._read(source, queue) for source in sources))
+        try:
+            # обработчики завершаются только с ошибкой, и она должна остановить чтение,
+            # а не ждать закрытия источников
+            done, _ = await asyncio.wait([readers, *workers], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+            await self._join(queue, workers)
+        finally:
+            readers.cancel()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(readers, *workers, return_exceptions=True)
+
+    @staticmethod
+    async def _read(source: AsyncIterable[JsonMessage], queue: asyncio.Queue) -> None:
+        """Перекладывает сообщения источника в общую очередь вместе со временем получения."""
+        async for message in source:
+            await queue.put((time.perf_counter(), message))
+
+    @staticmethod
+    async def _join(queue: asyncio.Queue, workers) -> None:
+        """Ждёт опустошения очереди; ошибка обработчика прерывает ожидание."""
+        joined = asyncio.create_task(queue.join())
+        done, _ = await asyncio.wait([joined, *workers], return_when=asyncio.FIRST_COMPLETED)
+        joined.cancel()
+        for task in done:
+            if task is not joined:
+                task.result()
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        """Забирает сообщения из очереди, разбирает их и передаёт в handler."""
+        loop = asyncio.get_running_loop()
+        while True:
+            received, message = await queue.get()
+            try:
+                try:
+                    if len(message.payload) >= self.offload_threshold:
+                        parsed = await loop.run_in_executor(self.executor, handle_message, message)
+                    else:
+                        parsed = handle_message(message)
+                except Exception as exc:
+                    if self.on_error is None:
+                        raise
+                    self.on_error(message, exc)
+                    continue
+
+                result = self.handler(parsed)
+                if inspect.isawaitable(result):
+                    await result
+                self.stats.record(message.message_type, time.perf_counter() - received)
+            finally:
+                queue.task_done()
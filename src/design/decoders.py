@@ -0,0 +1,286 @@
+import json
+import re
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Tuple
+
+
+class PayloadDecoder:
+    """
+    Абстрактный декодер JSON-payload.
+    Достаёт из JSON-объекта верхнего уровня только нужные ключи.
+    """
+    def extract(self, payload: str, keys: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """
+        Извлекает значения ключей из JSON-объекта.
+        Parameters:
+            payload: строка в формате JSON,
+            keys: ключи верхнего уровня, которые нужно достать.
+        Return:
+            Значения в порядке keys.
+        Raises:
+            KeyError: если какого-то ключа нет;
+            ValueError: если payload не является JSON-объектом.
+        """
+        raise NotImplementedError("Метод extract() должен быть реализован в подклассе.")
+
+
+class JsonDecoder(PayloadDecoder):
+    """
+    Декодер на стандартном json: разбирает payload целиком.
+    """
+    def extract(self, payload: str, keys: Tuple[str, ...]) -> Tuple[Any, ...]:
+        data = json.loads(payload)
+        if not isinstance(data, dict):
+            raise ValueError("Ожидался JSON-объект.")
+        return tuple(data[key] for key in keys)
+
+
+class OrjsonDecoder(PayloadDecoder):
+    """
+    Декодер на orjson: разбирает payload целиком, но в разы быстрее стандартного json.
+    """
+    def __init__(self):
+        import orjson
+
+        self._loads = orjson.loads
+
+    def extract(self, payload: str, keys: Tuple[str, ...]) -> Tuple[Any, ...]:
+        data = self._loads(payload)
+        if not isinstance(data, dict):
+            raise ValueError("Ожидался JSON-объект.")
+        return tuple(data[key] for key in keys)
+
+
+class MsgspecDecoder(PayloadDecoder):
+    """
+    Декодер на msgspec: разбирает payload в структуру только с нужными полями,
+    остальные значения пропускаются без создания Python-объектов.
+    """
+    def __init__(self):
+        import msgspec
+
+        self._msgspec = msgspec
+        self._decoders = {}
+
+    def extract(self, payload: str, keys: Tuple[str, ...]) -> Tuple[Any, ...]:
+        decoder = self._decoders.get(keys)
+        if decoder is None:
+            decoder = self._decoders[keys] = self._make_decoder(keys)
+        decode, getter = decoder
+        try:
+            return getter(decode(payload))
+        except self._msgspec.ValidationError as exc:
+            missing = _MISSING_FIELD_RE.search(str(exc))
+            if missing:
+                raise KeyError(missing.group(1)) from None
+            raise
+
+    def _make_decoder(self, keys: Tuple[str, ...]):
+        """
+        Создаёт декодер под набор ключей (один раз на набор).
+        Return:
+            Кортеж (функция декодирования, функция получения значений в порядке keys).
+        """
+        names = [f"f{i}" for i in range(len(keys))]
+        struct = self._msgspec.defstruct(
+            "Payload", [(name, Any) for name in names], rename=dict(zip(names, keys))
+        )
+        getter = attrgetter(*names) if len(names) > 1 else lambda obj: (getattr(obj, names[0]),)
+        return self._msgspec.json.Decoder(struct).decode, getter
+
+
+_MISSING_FIELD_RE = re.compile(r"missing required field `(.*)`")
+
+
+class ScannerDecoder(PayloadDecoder):
+    """
+    Декодер без сторонних зависимостей, разбирающий только нужные ключи.
+
+    Проходит по JSON-объекту верхнего уровня: значения нужных ключей разбирает
+    стандартным json, длинные строки и крупные вложения пропускает поиском по строке,
+    не создавая объектов. Объект проходится до конца: при повторяющихся ключах
+    берётся последнее значение, а символы после объекта (кроме пробельных) считаются
+    ошибкой, как в json.loads. Пропускаемые скаляры и escape-последовательности в строках
+    проверяются, но полного совпадения с json.loads нет: внутри крупных пропускаемых объектов
+    и массивов проверяются только строки и парность скобок (например, [tru, ...] длиннее
+    _SMALL_CONTAINER не вызывает ошибки), а управляющие символы в пропускаемых строках
+    не отвергаются.
+
+    Короткие payload выгоднее целиком разобрать C-парсером json, поэтому
+    сканирование включается только начиная с размера small_payload.
+
+    Attributes:
+        small_payload: размер payload в символах, до которого используется json.loads.
+    """
+    def __init__(self, small_payload: int = 8192):
+        self.small_payload = small_payload
+        self._decode_value = json.JSONDecoder().raw_decode
+        self._json = JsonDecoder()
+
+    def extract(self, payload: str, keys: Tuple[str, ...]) -> Tuple[Any, ...]:
+        if len(payload) < self.small_payload:
+            return self._json.extract(payload, keys)
+
+        found = {}
+        idx = _WS_RE.match(payload).end()
+        if payload[idx:idx + 1] != "{":
+            raise json.JSONDecodeError("Ожидался JSON-объект", payload, idx)
+        idx = _WS_RE.match(payload, idx + 1).end()
+
+        if payload[idx:idx + 1] != "}":
+            while True:
+                if payload[idx:idx + 1] != '"':
+                    raise json.JSONDecodeError("Ожидался ключ", payload, idx)
+                key, idx = _scanstring(payload, idx + 1)
+                idx = _WS_RE.match(payload, idx).end()
+                if payload[idx:idx + 1] != ":":
+                    raise json.JSONDecodeError("Ожидалось ':'", payload, idx)
+                idx = _WS_RE.match(payload, idx + 1).end()
+
+                if key in keys:
+                    found[key], idx = self._decode_value(payload, idx)
+                else:
+                    idx = _skip_value(payload, idx, self._decode_value)
+
+                idx = _WS_RE.match(payload, idx).end()
+                separator = payload[idx:idx + 1]
+                if separator == "}":
+                    break
+                if separator != ",":
+                    raise json.JSONDecodeError("Ожидалось ',' или '}'", payload, idx)
+                idx = _WS_RE.match(payload, idx + 1).end()
+
+        idx = _WS_RE.match(payload, idx + 1).end()
+        if idx != len(payload):
+            raise json.JSONDecodeError("Лишние данные после объекта", payload, idx)
+        return tuple(found[key] for key in keys)
+
+
+_scanstring = json.decoder.scanstring
+
+_WS_RE = re.compile(r"[ \t\n\r]*")
+
+# Скаляр, как его принимает json.loads: число, true, false, null, NaN или Infinity,
+# за которым следует разделитель или конец строки
+_SCALAR_RE = re.compile(
+    r"(?:-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null|NaN|-?Infinity)(?=[ \t\n\r,}\]]|\Z)"
+)
+
+# Символы, важные при пропуске вложенных объектов и массивов
+_STRUCTURAL = '"{}[]'
+
+# Контейнеры короче этого размера выгоднее пропускать C-парсером json, длиннее - поиском по строке
+_SMALL_CONTAINER = 2048
+
+
+def _skip_value(payload: str, idx: int, decode_value) -> int:
+    """
+    Пропускает JSON-значение, начинающееся с позиции idx.
+    Return:
+        Позицию сразу после значения.
+    """
+    char = payload[idx:idx + 1]
+    if char == '"':
+        return _skip_string(payload, idx + 1)
+    if char in ("{", "["):
+        closing = payload.find("}" if char == "{" else "]", idx)
+        if 0 <= closing - idx < _SMALL_CONTAINER:
+            return decode_value(payload, idx)[1]
+        return _skip_container(payload, idx)
+    match = _SCALAR_RE.match(payload, idx)
+    if match is None:
+        raise json.JSONDecodeError("Некорректное значение", payload, idx)
+    return match.end()
+
+
+def _skip_string(payload: str, idx: int) -> int:
+    """
+    Пропускает строку, начиная с позиции после открывающей кавычки.
+    Кавычка считается закрывающей, если перед ней чётное число обратных слэшей.
+    Строка с escape-последовательностями проверяется стандартным json
+    (некорректная, например "\\q", вызывает JSONDecodeError); управляющие символы
+    внутри строки не проверяются.
+    Return:
+        Позицию сразу после закрывающей кавычки.
+    """
+    find = payload.find
+    start = idx
+    while True:
+        end = find('"', idx)
+        if end < 0:
+            raise json.JSONDecodeError("Незакрытая строка", payload, idx)
+        backslash = end - 1
+        while payload[backslash] == "\\":
+            backslash -= 1
+        if (end - 1 - backslash) % 2 == 0:
+            break
+        idx = end + 1
+    if find("\\", start, end) >= 0:
+        return _scanstring(payload, start)[1]
+    return end + 1
+
+
+def _skip_container(payload: str, idx: int) -> int:
+    """
+    Пропускает объект или массив, учитывая вложенность и строки со скобками внутри.
+    Следующие вхождения каждого структурного символа ищутся str.find и запоминаются,
+    поэтому длинные строки и данные внутри пропускаются без посимвольного цикла.
+    Return:
+        Позицию сразу после закрывающей скобки.
+    """
+    find = payload.find
+    size = len(payload)
+    positions = []
+    for char in _STRUCTURAL:
+        position = find(char, idx)
+        positions.append(position if position >= 0 else size)
+
+    depth = 0
+    while True:
+        position = min(positions)
+        if position == size:
+            raise json.JSONDecodeError("Незакрытый объект или массив", payload, idx)
+        char = payload[position]
+        if char == '"':
+            idx = _skip_string(payload, position + 1)
+        else:
+            idx = position + 1
+            depth += 1 if char in "{[" else -1
+            if depth == 0:
+                return idx
+        for i, position in enumerate(positions):
+            if position < idx:
+                position = find(_STRUCTURAL[i], idx)
+                positions[i] = position if position >= 0 else size
+
+
+@lru_cache(maxsize=None)
+def default_decoder() -> PayloadDecoder:
+    """
+    Декодер по умолчанию - JsonDecoder: результат и ошибки совпадают с json.loads
+    независимо от того, какие необязательные библиотеки установлены.
+    Декодеры не хранят состояния сообщений, поэтому экземпляр создаётся один раз на процесс.
+    Return:
+        Экземпляр декодера.
+    """
+    return JsonDecoder()
+
+
+@lru_cache(maxsize=None)
+def fast_decoder() -> PayloadDecoder:
+    """
+    Выбирает самый быстрый доступный декодер: msgspec, затем orjson,
+    а без сторонних библиотек - ScannerDecoder. Подключается явно
+    (ParserFactory(fast_decoder())): msgspec и orjson строже json.loads - не принимают
+    NaN, Infinity, числа вне диапазона double и одиночные суррогаты "\\ud800",
+    а orjson превращает целые шире 64 бит во float.
+    Return:
+        Экземпляр декодера.
+    """
+    for decoder_class in (MsgspecDecoder, OrjsonDecoder):
+        try:
+            return decoder_class()
+        except ImportError:
+            continue
+    return ScannerDecoder()
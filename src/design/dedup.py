@@ -0,0 +1,106 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Iterator, Optional, Tuple
+
+from src.design.messages import JsonMessage
+
+
+class Deduplicator:
+    """
+    Отбрасывает повторно доставленные сообщения до их разбора.
+
+    Отпечаток сообщения - пара (тип источника, hash(payload)): хэш строки вычисляется
+    в C и кэшируется в самой строке, поэтому дешевле любого разбора JSON. Отпечатки
+    хранятся в окне FIFO, ограниченном количеством (max_size) и, при необходимости,
+    временем (window_seconds): вытесняются самые давно добавленные, повторное
+    появление сообщения его место в очереди не обновляет. Вместе с отпечатком хранится
+    16-байтовый дайджест blake2b payload, а не сам payload, поэтому память окна
+    не зависит от размера сообщений; при совпадении отпечатков сравниваются дайджесты,
+    и коллизия hash() не приводит к потере сообщения.
+
+    Attributes:
+        max_size: сколько последних уникальных сообщений помнить,
+        window_seconds: сколько секунд помнить сообщение (None - без ограничения по времени),
+        clock: источник времени (по умолчанию time.monotonic),
+        seen: сколько сообщений проверено,
+        dropped: сколько из них отброшено как дубликаты.
+    """
+    def __init__(
+        self,
+        max_size: int = 100_000,
+        window_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.seen = 0
+        self.dropped = 0
+        # отпечаток -> (время первого появления, дайджест payload); порядок вставки совпадает с порядком времени
+        self._window: OrderedDict[Tuple[Hashable, int], Tuple[float, bytes]] = OrderedDict()
+
+    def is_duplicate(self, message: JsonMessage) -> bool:
+        """
+        Проверяет сообщение и запоминает его, если оно новое.
+        Parameters:
+            message: входящее сообщение
+        Return:
+            True, если такое же сообщение уже было в окне.
+        """
+        self.seen += 1
+        window = self._window
+        now = 0.0
+        if self.window_seconds is not None:
+            now = self.clock()
+            self._expire(now - self.window_seconds)
+
+        key = (message.message_type, hash(message.payload))
+        digest = _digest(message.payload)
+        entry = window.get(key)
+        if entry is not None:
+            if entry[1] == digest:
+                self.dropped += 1
+                return True
+            del window[key]  # коллизия хэшей: запоминаем новое сообщение вместо старого
+
+        window[key] = (now, digest)
+        if len(window) > self.max_size:
+            window.popitem(last=False)
+        return False
+
+    def filter(self, messages: Iterable[JsonMessage]) -> Iterator[JsonMessage]:
+        """
+        Потоково пропускает только новые сообщения, например перед handle_messages.
+        Parameters:
+            messages: входящие сообщения
+        Return:
+            Итератор сообщений без дубликатов в исходном порядке.
+        """
+        is_duplicate = self.is_duplicate
+        for message in messages:
+            if not is_duplicate(message):
+                yield message
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Доля отброшенных сообщений среди проверенных."""
+        return self.dropped / self.seen if self.seen else 0.0
+
+    def __len__(self) -> int:
+        """Возвращает количество сообщений в окне."""
+        return len(self._window)
+
+    def _expire(self, threshold: float) -> None:
+        """Удаляет из окна сообщения, впервые появившиеся раньше threshold."""
+        window = self._window
+        while window:
+            key, (first_seen, _) = next(iter(window.items()))
+            if first_seen >= threshold:
+                break
+            del window[key]
+
+
+def _digest(payload: str) -> bytes:
+    """Возвращает 16-байтовый дайджест blake2b строки payload."""
+    return hashlib.blake2b(payload.encode("utf-8", "surrogatepass"), digest_size=16).digest()
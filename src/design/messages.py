@@ -1,7 +1,14 @@
 import enum
-import json
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Dict, Any
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.design.decoders import PayloadDecoder, default_decoder
+from src.design.registry import ParserStats, load_entry_points, profiled, register_parser, registered_parsers
 
 
 class MessageType(enum.Enum):
@@ -14,7 +21,7 @@ class MessageType(enum.Enum):
     SLACK = enum.auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class JsonMessage:
     """
     Сообщение, полученное из внешней системы.
@@ -26,7 +33,7 @@ class JsonMessage:
     payload: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedMessage:
     """
     Сообщение приведенное к единому внутреннему формату.
@@ -38,12 +45,113 @@ class ParsedMessage:
     text: str
 
 
+class InternTable:
+    """
+    Ограниченная таблица интернирования строк.
+
+    Одинаковые имена пользователей, пришедшие в разных сообщениях, заменяются
+    одним и тем же объектом строки. При переполнении вытесняются давно не
+    встречавшиеся строки, поэтому таблица не растёт бесконечно (в отличие от sys.intern).
+    Таблицу можно вызывать из нескольких потоков (общий интернер default_factory()
+    используется и из пулов потоков handle_messages и MessageConsumer).
+
+    Attributes:
+        maxsize: максимальное количество хранимых строк.
+    """
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._strings: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, value: str) -> str:
+        """
+        Возвращает каноничный экземпляр строки.
+        Parameters:
+            value: строка
+        Return:
+            Ранее сохранённая равная строка или сама value.
+        """
+        strings = self._strings
+        # чтение, перемещение и вытеснение должны быть атомарными: иначе другой поток
+        # может вытеснить строку между get и move_to_end
+        with self._lock:
+            cached = strings.get(value)
+            if cached is not None:
+                strings.move_to_end(value)
+                return cached
+            strings[value] = value
+            if len(strings) > self.maxsize:
+                strings.popitem(last=False)
+            return value
+
+    def __len__(self) -> int:
+        """Возвращает количество хранимых строк."""
+        return len(self._strings)
+
+
+class ParsedMessageBatch:
+    """
+    Компактное колоночное хранилище ParsedMessage для буферизации больших пачек.
+
+    Имена пользователей хранятся один раз в справочнике, а для каждого сообщения -
+    только 4-байтовый номер имени в array("I"); тексты хранятся списком.
+    Объекты ParsedMessage создаются только при чтении.
+    """
+    def __init__(self, messages: Iterable[ParsedMessage] = ()):
+        self._names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self._users = array("I")
+        self._texts: List[str] = []
+        self.extend(messages)
+
+    def append(self, message: ParsedMessage) -> None:
+        """Добавляет сообщение в конец пачки."""
+        name_id = self._name_ids.get(message.user)
+        if name_id is None:
+            name_id = self._name_ids[message.user] = len(self._names)
+            self._names.append(message.user)
+        self._users.append(name_id)
+        self._texts.append(message.text)
+
+    def extend(self, messages: Iterable[ParsedMessage]) -> None:
+        """Добавляет сообщения в конец пачки."""
+        for message in messages:
+            self.append(message)
+
+    def __len__(self) -> int:
+        """Возвращает количество сообщений."""
+        return len(self._texts)
+
+    def __getitem__(self, index: int) -> ParsedMessage:
+        """Возвращает сообщение по индексу."""
+        return ParsedMessage(user=self._names[self._users[index]], text=self._texts[index])
+
+    def __iter__(self) -> Iterator[ParsedMessage]:
+        names = self._names
+        for name_id, text in zip(self._users, self._texts):
+            yield ParsedMessage(user=names[name_id], text=text)
+
+    @property
+    def users(self) -> List[str]:
+        """Возвращает справочник различных имён пользователей в пачке."""
+        return list(self._names)
+
+
 class MessageParser:
     """
     Абстрактный класс парсера сообщений.
     Все конкретные классы-парсеры должны реализовать метод parse(),
     который преобразует JSON-строку в ParsedMessage.
+
+    Attributes:
+        decoder: декодер JSON, извлекающий из payload только нужные ключи
+            (по умолчанию - JsonDecoder, см. default_decoder(); быстрый - fast_decoder()),
+        interner: таблица интернирования имён пользователей (None - без интернирования).
     """
+    def __init__(self, decoder: Optional[PayloadDecoder] = None, interner: Optional[InternTable] = None):
+        self.decoder = decoder or default_decoder()
+        self.interner = interner
+
     def parse(self, payload: str) -> ParsedMessage:
         """
         Преобразует JSON-payload в ParsedMessage.
@@ -54,7 +162,25 @@ class MessageParser:
         """
         raise NotImplementedError("Метод parse() должен быть реализован в подклассе.")
 
+    def parse_many(self, payloads: Sequence[str]) -> List[ParsedMessage]:
+        """
+        Преобразует пачку JSON-payload одного источника.
+        Parameters:
+            payloads: строки в формате JSON
+        Return:
+            Список ParsedMessage в том же порядке.
+        """
+        parse = self.parse
+        return [parse(payload) for payload in payloads]
+
+    def _message(self, user: str, text: str) -> ParsedMessage:
+        """Создаёт ParsedMessage, интернируя имя пользователя, если задана таблица."""
+        if self.interner is not None:
+            user = self.interner(user)
+        return ParsedMessage(user=user, text=text)
+
 
+@register_parser(MessageType.TELEGRAM)
 class TelegramParser(MessageParser):
     """
     Парсер сообщений из Telegram.
@@ -66,10 +192,11 @@ class TelegramParser(MessageParser):
     }
     """
     def parse(self, payload: str) -> ParsedMessage:
-        data: Dict[str, Any] = json.loads(payload)
-        return ParsedMessage(user=data["from"], text=data["message"])
+        user, text = self.decoder.extract(payload, ("from", "message"))
+        return self._message(user, text)
 
 
+@register_parser(MessageType.MATTERMOST)
 class MattermostParser(MessageParser):
     """
     Парсер сообщений из Mattermost.
@@ -81,10 +208,11 @@ class MattermostParser(MessageParser):
     }
     """
     def parse(self, payload: str) -> ParsedMessage:
-        data: Dict[str, Any] = json.loads(payload)
-        return ParsedMessage(user=data["username"], text=data["text"])
+        user, text = self.decoder.extract(payload, ("username", "text"))
+        return self._message(user, text)
 
 
+@register_parser(MessageType.SLACK)
 class SlackParser(MessageParser):
     """
     Парсер сообщений из Slack.
@@ -96,20 +224,37 @@ class SlackParser(MessageParser):
     }
     """
     def parse(self, payload: str) -> ParsedMessage:
-        data: Dict[str, Any] = json.loads(payload)
-        return ParsedMessage(user=data["user_name"], text=data["content"])
+        user, text = self.decoder.extract(payload, ("user_name", "content"))
+        return self._message(user, text)
 
 
 class ParserFactory:
     """
     Фабрика для выбора подходящего парсера на основе типа сообщения.
+
+    Парсеры берутся из реестра (см. register_parser). Экземпляры создаются один раз
+    и складываются в плоскую таблицу "тип источника -> метод parse", поэтому выбор
+    парсера - это одно обращение к словарю. Если для типа парсера нет, фабрика
+    один раз загружает подключаемые парсеры из entry points и перестраивает таблицу.
+
+    Attributes:
+        decoder: общий декодер JSON для всех парсеров (по умолчанию - default_decoder()),
+        interner: общая таблица интернирования имён пользователей (необязательно),
+        profile: включить счётчики вызовов, ошибок, объёма и времени для каждого парсера.
     """
-    def __init__(self):
-        self._parsers = {
-            MessageType.TELEGRAM: TelegramParser(),
-            MessageType.MATTERMOST: MattermostParser(),
-            MessageType.SLACK: SlackParser()
-        }
+    def __init__(
+        self,
+        decoder: Optional[PayloadDecoder] = None,
+        interner: Optional[InternTable] = None,
+        profile: bool = False,
+    ):
+        self.decoder = decoder or default_decoder()
+        self.interner = interner
+        self.profile = profile
+        self.stats: Dict[Hashable, ParserStats] = {}
+        self._parsers: Dict[Hashable, MessageParser] = {}
+        self._dispatch: Dict[Hashable, Callable[[str], ParsedMessage]] = {}
+        self._build()
 
     def get_parser(self, message_type: MessageType) -> MessageParser:
         """
@@ -120,10 +265,88 @@ class ParserFactory:
             Экземпляр соответствующего парсера.
         """
         parser = self._parsers.get(message_type)
-        if not parser:
-            raise ValueError(f"Парсер не найден для типа: {message_type}")
+        if parser is None:
+            load_entry_points()
+            self._build()
+            parser = self._parsers.get(message_type)
+            if parser is None:
+                raise ValueError(f"Парсер не найден для типа: {message_type}")
         return parser
 
+    def parse(self, message_type: MessageType, payload: str) -> ParsedMessage:
+        """
+        Разбирает payload парсером для типа источника через плоскую таблицу.
+        Parameters:
+            message_type: тип источника,
+            payload: строка в формате JSON
+        Return:
+            ParsedMessage.
+        """
+        try:
+            parse = self._dispatch[message_type]
+        except KeyError:
+            parse = self.get_parser(message_type).parse
+        return parse(payload)
+
+    def enable_profiling(self) -> None:
+        """Включает счётчики для всех парсеров (в том числе уже созданных)."""
+        if not self.profile:
+            self.profile = True
+            for message_type, parser in self._parsers.items():
+                self._profile(message_type, parser)
+
+    def stats_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Возвращает текущие значения счётчиков.
+        Return:
+            Словарь {имя типа источника: {"parser", "calls", "errors", "bytes", "seconds"}}.
+        """
+        return {
+            getattr(message_type, "name", str(message_type)): {
+                "parser": type(self._parsers[message_type]).__name__,
+                **stats.as_dict(),
+            }
+            for message_type, stats in self.stats.items()
+        }
+
+    def _build(self) -> None:
+        """Создаёт парсеры для зарегистрированных типов, которых ещё нет в таблице."""
+        for message_type, parser_class in registered_parsers().items():
+            if message_type in self._parsers:
+                continue
+            parser = parser_class(self.decoder, self.interner)
+            self._parsers[message_type] = parser
+            if self.profile:
+                self._profile(message_type, parser)
+            self._dispatch[message_type] = parser.parse
+
+    def _profile(self, message_type: Hashable, parser: MessageParser) -> None:
+        """
+        Подменяет parse у экземпляра парсера обёрткой со счётчиками.
+        Без профилирования вызывается исходный метод класса без накладных расходов.
+        """
+        stats = self.stats[message_type] = ParserStats()
+        parser.parse = profiled(parser.parse, stats)
+        self._dispatch[message_type] = parser.parse
+
+
+# Парсеры не хранят состояния между вызовами, поэтому фабрика создаётся один раз на процесс;
+# имена пользователей повторяются из сообщения в сообщение, поэтому интернируются
+_FACTORY: Optional[ParserFactory] = None
+
+
+def default_factory() -> ParserFactory:
+    """
+    Возвращает фабрику, которой пользуются handle_message и handle_messages
+    (например, чтобы включить профилирование: default_factory().enable_profiling()).
+    Фабрика создаётся при первом обращении, поэтому импорт модуля не загружает
+    msgspec/orjson для декодера по умолчанию.
+    """
+    global _FACTORY
+    if _FACTORY is None:
+        _FACTORY = ParserFactory(interner=InternTable())
+    return _FACTORY
+
 
 def handle_message(json_message: JsonMessage) -> ParsedMessage:
     """
@@ -134,9 +357,66 @@ def handle_message(json_message: JsonMessage) -> ParsedMessage:
     Return:
         ParsedMessage - сообщение приведенное к единому внутреннему формату.
     """
-    factory = ParserFactory()
-    parser = factory.get_parser(json_message.message_type)
-    return parser.parse(json_message.payload)
+    return default_factory().parse(json_message.message_type, json_message.payload)
+
+
+def handle_messages(
+    json_messages: Iterable[JsonMessage],
+    batch_size: int = 1024,
+    executor: Optional[Executor] = None,
+    parallel_threshold: int = 4096,
+) -> Iterator[ParsedMessage]:
+    """
+    Потоково обрабатывает сообщения пачками.
+
+    Сообщения читаются пачками по batch_size, внутри пачки группируются по типу источника
+    и разбираются одним вызовом parse_many на группу. Если передан executor, группы
+    размером от parallel_threshold делятся на части по parallel_threshold и разбираются в нём
+    (имеет смысл для ProcessPoolExecutor и больших пачек).
+    Parameters:
+        json_messages: входящие сообщения
+        batch_size: размер пачки
+        executor: пул для разбора больших групп (необязательно)
+        parallel_threshold: минимальный размер группы для разбора в пуле
+    Return:
+        Итератор ParsedMessage в порядке входящих сообщений.
+    """
+    messages = iter(json_messages)
+    while batch := list(islice(messages, batch_size)):
+        groups: Dict[MessageType, Tuple[List[int], List[str]]] = {}
+        for position, json_message in enumerate(batch):
+            positions, payloads = groups.setdefault(json_message.message_type, ([], []))
+            positions.append(position)
+            payloads.append(json_message.payload)
+
+        results: List[Optional[ParsedMessage]] = [None] * len(batch)
+        pending = []
+        for message_type, (positions, payloads) in groups.items():
+            if executor is not None and len(payloads) >= parallel_threshold:
+                for start in range(0, len(payloads), parallel_threshold):
+                    chunk = slice(start, start + parallel_threshold)
+                    pending.append((positions[chunk], executor.submit(_parse_group, message_type, payloads[chunk])))
+            else:
+                _place(results, positions, _parse_group(message_type, payloads))
+
+        for positions, future in pending:
+            _place(results, positions, future.result())
+
+        yield from results
+
+
+def _parse_group(message_type: MessageType, payloads: Sequence[str]) -> List[ParsedMessage]:
+    """
+    Разбирает группу сообщений одного типа.
+    Функция верхнего уровня, чтобы её можно было выполнять в пуле процессов.
+    """
+    return default_factory().get_parser(message_type).parse_many(payloads)
+
+
+def _place(results: List[Optional[ParsedMessage]], positions: Sequence[int], parsed: Sequence[ParsedMessage]) -> None:
+    """Раскладывает разобранные сообщения группы по их исходным позициям в пачке."""
+    for position, message in zip(positions, parsed):
+        results[position] = message
 
 
 if __name__ == "__main__":
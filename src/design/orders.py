@@ -1,5 +1,13 @@
-from dataclasses import dataclass
-from typing import List
+import json
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from src.wallets.currency import Currency, rub
+from src.wallets.exceptions import NotComparisonException
+from src.wallets.money import Money
 
 
 @dataclass
@@ -16,10 +24,69 @@ class Order:
     discount_codes: List[str]
 
 
+# Количество минимальных единиц (копеек, центов) в единице валюты
+MINOR_UNITS = 100
+
+# Сумма, которую можно перевести в минимальные единицы
+Amount = Union[int, float, Decimal, Money]
+
+
+def to_minor_units(value: Amount) -> int:
+    """
+    Переводит сумму в целое число минимальных единиц с округлением половины вверх
+    (от нуля), как Decimal.quantize(..., ROUND_HALF_UP).
+    Число float переводится по его десятичной записи (repr), а не по двоичному значению,
+    поэтому 1.005 превращается в 101, а не в 100.
+    Parameters:
+        value: сумма (int, float, Decimal или Money)
+    Return:
+        Сумма в минимальных единицах.
+    """
+    if type(value) is float:
+        # быстрый путь: сумма уже в копейках, ошибка умножения намного меньше полкопейки
+        units = value * MINOR_UNITS
+        rounded = round(units)
+        if -1e-6 < units - rounded < 1e-6 and -_FAST_LIMIT < units < _FAST_LIMIT:
+            return rounded
+        value = Decimal(repr(value))
+    elif isinstance(value, Money):
+        value = value.value
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+    return int((value * MINOR_UNITS).to_integral_value(ROUND_HALF_UP))
+
+
+# Граница быстрого пути to_minor_units: до неё ошибка float при умножении пренебрежимо мала
+_FAST_LIMIT = 1e11
+
+
+def from_minor_units(units: int, currency: Currency = rub) -> Money:
+    """
+    Переводит сумму в минимальных единицах в Money.
+    Parameters:
+        units: сумма в минимальных единицах,
+        currency: валюта.
+    Return:
+        Money с Decimal-значением ровно с двумя знаками после запятой.
+    """
+    return Money(Decimal(units).scaleb(-2), currency)
+
+
+def _divide_half_up(numerator: int, denominator: int) -> int:
+    """Целочисленное деление (denominator > 0) с округлением половины от нуля."""
+    if numerator >= 0:
+        return (2 * numerator + denominator) // (2 * denominator)
+    return -((denominator - 2 * numerator) // (2 * denominator))
+
+
 class Discount:
     """
     Абстрактный класс, все классы скидок должны иметь метод apply().
+    Экземпляры скидок общие для всех заказов, поэтому конкретные скидки -
+    неизменяемые датаклассы (frozen), а производные поля вычисляются один раз при создании.
     """
+    __slots__ = ()
+
     def apply(self, order: Order):
         """
         Вычисляет сумму скидки к заказу.
@@ -30,13 +97,52 @@ class Discount:
         """
         raise NotImplementedError("Метод apply() должен быть реализован в подклассе.")
 
+    def apply_minor(self, order: Order, amount: int) -> int:
+        """
+        Вычисляет скидку точно, в целых минимальных единицах.
+        Parameters:
+            order: объект заказа,
+            amount: сумма заказа в минимальных единицах.
+        Return:
+            Сумма скидки в минимальных единицах.
+        """
+        raise NotImplementedError("Метод apply_minor() должен быть реализован в подклассе.")
 
+    def apply_bulk(self, amounts, loyal):
+        """
+        Вычисляет скидки для массива заказов (требуется numpy).
+        Результат для каждого заказа должен совпадать с apply() до бита.
+        Parameters:
+            amounts: numpy-массив исходных сумм заказов,
+            loyal: numpy-массив флагов постоянного клиента.
+        Return:
+            numpy-массив сумм скидок.
+        """
+        raise NotImplementedError("Метод apply_bulk() должен быть реализован в подклассе.")
+
+    def apply_bulk_minor(self, amounts, loyal):
+        """
+        Вычисляет точные скидки для массива заказов (требуется numpy).
+        Результат для каждого заказа должен совпадать с apply_minor().
+        Parameters:
+            amounts: numpy-массив (int64) сумм заказов в минимальных единицах,
+            loyal: numpy-массив флагов постоянного клиента.
+        Return:
+            numpy-массив (int64) сумм скидок в минимальных единицах.
+        """
+        raise NotImplementedError("Метод apply_bulk_minor() должен быть реализован в подклассе.")
+
+
+@dataclass(frozen=True, slots=True)
 class FixedDiscount(Discount):
     """
     Скидка фиксированной суммы (например -10).
     """
-    def __init__(self, amount: float):
-        self.amount = amount
+    amount: float
+    _amount_minor: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_amount_minor", to_minor_units(self.amount))
 
     def apply(self, order: Order) -> float:
         """
@@ -48,13 +154,40 @@ class FixedDiscount(Discount):
         """
         return self.amount
 
+    def apply_minor(self, order: Order, amount: int) -> int:
+        return self._amount_minor
+
+    def apply_bulk(self, amounts, loyal):
+        import numpy as np
 
+        return np.full(len(amounts), self.amount, dtype=np.float64)
+
+    def apply_bulk_minor(self, amounts, loyal):
+        import numpy as np
+
+        return np.full(len(amounts), self._amount_minor, dtype=np.int64)
+
+
+@dataclass(frozen=True, slots=True)
 class PercentageDiscount(Discount):
     """
     Скидка в процентах от суммы заказа (например -5%).
     """
-    def __init__(self, percent: float):
-        self.percent = percent
+    percent: Union[float, int, Decimal]
+    _rate: float = field(init=False, repr=False, compare=False)
+    _numerator: int = field(init=False, repr=False, compare=False)
+    _denominator: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        percent = self.percent
+        # доля для вычислений во float
+        object.__setattr__(self, "_rate", float(percent) / 100)
+        # процент как точная дробь: amount * percent / 100 = amount * numerator / denominator;
+        # float берётся по десятичной записи (5.1 -> 51/10), int и Decimal - как есть
+        exact = Decimal(str(percent)) if isinstance(percent, float) else Decimal(percent)
+        numerator, denominator = exact.as_integer_ratio()
+        object.__setattr__(self, "_numerator", numerator)
+        object.__setattr__(self, "_denominator", denominator * 100)
 
     def apply(self, order: Order) -> float:
         """
@@ -64,15 +197,48 @@ class PercentageDiscount(Discount):
         Return:
             Сумма скидки
         """
-        return order.total_amount * (self.percent / 100)
+        return order.total_amount * self._rate
+
+    def apply_minor(self, order: Order, amount: int) -> int:
+        """
+        Возвращает скидку в процентах, округлённую до минимальной единицы
+        половиной вверх (от нуля) - одинаково для любой суммы и любого процента.
+        """
+        return _divide_half_up(amount * self._numerator, self._denominator)
+
+    def apply_bulk(self, amounts, loyal):
+        return amounts * self._rate
+
+    def apply_bulk_minor(self, amounts, loyal):
+        import numpy as np
+
+        denominator = self._denominator
+        largest = int(np.abs(amounts).max(initial=0))
+        if 2 * largest * abs(self._numerator) + 2 * denominator >= 2**63:
+            # промежуточные произведения не помещаются в int64 (например, процент 100/3
+            # с длинной десятичной записью): считаем целыми Python, как apply_minor
+            return np.array(
+                [_divide_half_up(amount * self._numerator, denominator) for amount in amounts.tolist()],
+                dtype=np.int64,
+            )
+        numerator = amounts * self._numerator
+        return np.where(
+            numerator >= 0,
+            (2 * numerator + denominator) // (2 * denominator),
+            -((denominator - 2 * numerator) // (2 * denominator)),
+        )
 
 
+@dataclass(frozen=True, slots=True)
 class LoyaltyDiscount(Discount):
     """
     Скидка для постоянных клиентов.
     """
-    def __init__(self, amount: float):
-        self.amount = amount
+    amount: float
+    _amount_minor: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_amount_minor", to_minor_units(self.amount))
 
     def apply(self, order: Order) -> float:
         """
@@ -86,10 +252,305 @@ class LoyaltyDiscount(Discount):
             return self.amount
         return 0.0
 
+    def apply_minor(self, order: Order, amount: int) -> int:
+        return self._amount_minor if order.is_loyal_customer else 0
+
+    def apply_bulk(self, amounts, loyal):
+        import numpy as np
+
+        return np.where(loyal, np.float64(self.amount), 0.0)
+
+    def apply_bulk_minor(self, amounts, loyal):
+        import numpy as np
+
+        return np.where(loyal, np.int64(self._amount_minor), np.int64(0))
+
+
+# Таблица промокодов по умолчанию
+DEFAULT_RULES_PATH = Path(__file__).with_name("discounts.json")
+
+# Конструкторы скидок по полю "type" в таблице промокодов
+DISCOUNT_TYPES: Dict[str, Callable[..., Discount]] = {
+    "fixed": FixedDiscount,
+    "percentage": PercentageDiscount,
+    "loyalty": LoyaltyDiscount,
+}
+
+
+@dataclass(frozen=True)
+class DiscountTable:
+    """
+    Неизменяемый снимок правил скидок.
+    Attributes:
+        codes: промокод -> общий для всех заказов экземпляр скидки,
+        loyalty: скидка для постоянных клиентов (None - нет),
+        version: номер версии правил, растёт при каждой перезагрузке.
+    """
+    codes: Mapping[str, Discount]
+    loyalty: Optional[Discount]
+    version: int
+
+    def __reduce__(self):
+        """mappingproxy не сериализуется pickle, поэтому промокоды передаются обычным словарём."""
+        return _discount_table, (dict(self.codes), self.loyalty, self.version)
+
+
+def _discount_table(codes: Dict[str, Discount], loyalty: Optional[Discount], version: int) -> DiscountTable:
+    """Восстанавливает DiscountTable после pickle (например, в пуле процессов)."""
+    return DiscountTable(codes=MappingProxyType(codes), loyalty=loyalty, version=version)
+
+
+class DiscountRules:
+    """
+    Правила скидок, загружаемые из JSON-файла.
+
+    Формат файла:
+    {
+        "codes": {"FIX10": {"type": "fixed", "amount": 10}, ...},
+        "loyalty": {"type": "loyalty", "amount": 5}
+    }
+
+    Промокоды заранее превращаются в таблицу общих экземпляров скидок, поэтому
+    на заказ не создаётся ни одного объекта скидки. При перезагрузке строится новая
+    таблица и подменяется одним присваиванием, поэтому чтение обходится без блокировок:
+    каждый заказ видит либо старую, либо новую таблицу целиком.
+
+    Attributes:
+        path: путь к файлу правил.
+    """
+    def __init__(self, path: Path | str = DEFAULT_RULES_PATH):
+        self.path = Path(path)
+        self._signature = None
+        self._table = DiscountTable(codes=MappingProxyType({}), loyalty=None, version=0)
+        self.reload()
+
+    @property
+    def table(self) -> DiscountTable:
+        """Текущий снимок правил."""
+        return self._table
+
+    @property
+    def version(self) -> int:
+        """Номер версии текущих правил."""
+        return self._table.version
+
+    def reload(self) -> None:
+        """Перечитывает файл правил и атомарно подменяет таблицу."""
+        signature = self._file_signature()
+        config = json.loads(self.path.read_text(encoding="utf-8"))
+        codes = {code: self._make_discount(spec) for code, spec in config.get("codes", {}).items()}
+        loyalty = config.get("loyalty")
+        self._table = DiscountTable(
+            codes=MappingProxyType(codes),
+            loyalty=self._make_discount(loyalty) if loyalty else None,
+            version=self._table.version + 1,
+        )
+        self._signature = signature
+
+    def reload_if_changed(self) -> bool:
+        """
+        Перечитывает правила, если файл изменился с последней загрузки.
+        Return:
+            True, если правила были перезагружены.
+        """
+        if self._file_signature() == self._signature:
+            return False
+        self.reload()
+        return True
+
+    def discounts_for(self, order: Order) -> List[Discount]:
+        """
+        Возвращает список применимых скидок для заказа в том же порядке,
+        что и прежняя цепочка if/elif: промокоды по порядку, затем скидка лояльности.
+        Parameters:
+            order: объект заказа
+        Return:
+            Список общих экземпляров скидок (их нельзя изменять).
+        """
+        table = self._table
+        codes = table.codes
+        discounts = [codes[code] for code in order.discount_codes if code in codes]
+        if order.is_loyal_customer and table.loyalty is not None:
+            discounts.append(table.loyalty)
+        return discounts
+
+    def apply(self, order: Order) -> float:
+        """
+        Применяет скидки к заказу, как apply_discounts, но без промежуточного списка.
+        Parameters:
+            order: исходный заказ
+        Return:
+            Финальная сумма после применения всех скидок (не меньше 0).
+        """
+        table = self._table
+        codes = table.codes
+        total_discount = 0.0
+        for code in order.discount_codes:
+            discount = codes.get(code)
+            if discount is not None:
+                total_discount += discount.apply(order)
+        if order.is_loyal_customer and table.loyalty is not None:
+            total_discount += table.loyalty.apply(order)
+        return max(0.0, order.total_amount - total_discount)
+
+    def apply_minor(self, order: Order) -> int:
+        """
+        Точно применяет скидки к заказу в целых минимальных единицах.
+        Сумма заказа переводится в минимальные единицы (см. to_minor_units), каждая скидка
+        округляется до минимальной единицы отдельно, итог не меньше 0.
+        Parameters:
+            order: исходный заказ (total_amount - float, int, Decimal или Money)
+        Return:
+            Финальная сумма в минимальных единицах.
+        """
+        table = self._table
+        codes = table.codes
+        amount = to_minor_units(order.total_amount)
+        total_discount = 0
+        for code in order.discount_codes:
+            discount = codes.get(code)
+            if discount is not None:
+                total_discount += discount.apply_minor(order, amount)
+        if order.is_loyal_customer and table.loyalty is not None:
+            total_discount += table.loyalty.apply_minor(order, amount)
+        return max(0, amount - total_discount)
+
+    def apply_exact(self, order: Order, currency: Currency = rub) -> Money:
+        """
+        Точно применяет скидки к заказу.
+        Parameters:
+            order: исходный заказ,
+            currency: валюта результата, если total_amount задан не в Money.
+        Return:
+            Финальная сумма в Money.
+        """
+        if isinstance(order.total_amount, Money):
+            currency = order.total_amount.currency
+        return from_minor_units(self.apply_minor(order), currency)
+
+    def apply_bulk(self, orders: Sequence[Order]):
+        """
+        Применяет скидки сразу к множеству заказов (требуется numpy).
+
+        Суммы и флаги заказов превращаются в столбцы NumPy, а скидки считаются
+        векторно: для каждой позиции промокода в заказе - по группам заказов с одинаковым
+        промокодом на этой позиции, затем скидка лояльности. Скидки складываются в том же порядке,
+        что и в apply(), а нулевые слагаемые не меняют сумму, поэтому результат
+        совпадает со скалярным путём до бита, включая ограничение снизу нулём.
+        Parameters:
+            orders: заказы
+        Return:
+            numpy-массив итоговых сумм (float64) в порядке orders.
+        """
+        import numpy as np
+
+        amounts = np.fromiter((order.total_amount for order in orders), dtype=np.float64, count=len(orders))
+        final = amounts - self._bulk_discounts(orders, amounts, "apply_bulk")
+        # как max(0.0, x): x остаётся, только если он строго больше нуля
+        return np.where(final > 0.0, final, 0.0)
+
+    def apply_bulk_minor(self, orders: Sequence[Order]):
+        """
+        Точно применяет скидки сразу к множеству заказов (требуется numpy).
+        Результат совпадает с apply_minor() для каждого заказа. Вычисления идут в int64,
+        поэтому суммы заказов должны быть меньше ~10^15 минимальных единиц.
+        Parameters:
+            orders: заказы
+        Return:
+            numpy-массив (int64) итоговых сумм в минимальных единицах в порядке orders.
+        """
+        import numpy as np
+
+        amounts = _minor_units_array([order.total_amount for order in orders])
+        return np.maximum(amounts - self._bulk_discounts(orders, amounts, "apply_bulk_minor"), 0)
+
+    def _bulk_discounts(self, orders: Sequence[Order], amounts, method: str):
+        """
+        Векторно считает суммарные скидки заказов.
+        Parameters:
+            orders: заказы,
+            amounts: numpy-массив сумм заказов,
+            method: метод скидки, считающий массив скидок ("apply_bulk" или "apply_bulk_minor").
+        Return:
+            numpy-массив суммарных скидок того же типа, что amounts.
+        """
+        import numpy as np
+
+        table = self._table
+        codes = table.codes
+        count = len(orders)
+        loyal = np.fromiter((order.is_loyal_customer for order in orders), dtype=bool, count=count)
+
+        # наборов промокодов обычно немного: сначала группируем заказы по набору целиком
+        combinations: Dict[tuple, List[int]] = {}
+        for i, order in enumerate(orders):
+            combinations.setdefault(tuple(order.discount_codes), []).append(i)
+
+        # позиция промокода в заказе -> промокод -> массивы номеров заказов
+        positions: List[Dict[str, List[Any]]] = []
+        for combination, indices in combinations.items():
+            index = np.array(indices, dtype=np.intp)
+            for position, code in enumerate(combination):
+                if code in codes:
+                    while len(positions) <= position:
+                        positions.append({})
+                    positions[position].setdefault(code, []).append(index)
+
+        total_discount = np.zeros(count, dtype=amounts.dtype)
+        for groups in positions:
+            component = np.zeros(count, dtype=amounts.dtype)
+            for code, indices in groups.items():
+                index = np.concatenate(indices)
+                component[index] = getattr(codes[code], method)(amounts[index], loyal[index])
+            total_discount += component
+
+        if table.loyalty is not None:
+            component = np.zeros(count, dtype=amounts.dtype)
+            component[loyal] = getattr(table.loyalty, method)(amounts[loyal], loyal[loyal])
+            total_discount += component
+        return total_discount
+
+    def _file_signature(self) -> tuple:
+        """
+        Признаки версии файла: время изменения, размер и inode
+        (inode меняется при атомарной замене файла через rename).
+        """
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    @staticmethod
+    def _make_discount(spec: Dict[str, Any]) -> Discount:
+        """
+        Создаёт скидку по описанию из файла правил.
+        Parameters:
+            spec: словарь с полем "type" и параметрами конструктора
+        Return:
+            Экземпляр скидки.
+        """
+        params = dict(spec)
+        discount_type = params.pop("type")
+        if discount_type not in DISCOUNT_TYPES:
+            raise ValueError(f"Неизвестный тип скидки: {discount_type}")
+        return DISCOUNT_TYPES[discount_type](**params)
+
+
+_RULES: Optional[DiscountRules] = None
+
+
+def default_rules() -> DiscountRules:
+    """
+    Возвращает правила из DEFAULT_RULES_PATH (загружаются при первом обращении).
+    """
+    global _RULES
+    if _RULES is None:
+        _RULES = DiscountRules()
+    return _RULES
+
 
 class DiscountFactory:
     """
-    Фабрика для выбора и создания подходящих скидок.
+    Фабрика для выбора подходящих скидок.
+    Скидки берутся из таблицы правил по умолчанию (см. DiscountRules).
     """
     @staticmethod
     def get_discounts_for_order(order: Order) -> List[Discount]:
@@ -100,18 +561,7 @@ class DiscountFactory:
         Return:
             Список объектов классов-скидок.
         """
-        discounts = []
-
-        for code in order.discount_codes:
-            if code == "FIX10":
-                discounts.append(FixedDiscount(10))
-            elif code == "PERCENT5":
-                discounts.append(PercentageDiscount(5))
-
-        if order.is_loyal_customer:
-            discounts.append(LoyaltyDiscount(5))
-
-        return discounts
+        return default_rules().discounts_for(order)
 
 
 def apply_discounts(order: Order) -> float:
@@ -122,15 +572,85 @@ def apply_discounts(order: Order) -> float:
     Return:
         Финальная сумма после применения всех скидок (не меньше 0).
     """
-    discounts = DiscountFactory.get_discounts_for_order(order)
+    return default_rules().apply(order)
 
-    total_discount = 0.0
-    for discount in discounts:
-        discount_value = discount.apply(order)
-        total_discount += discount_value
 
-    final_amount = max(0.0, order.total_amount - total_discount)
-    return final_amount
+def apply_discounts_bulk(orders: Sequence[Order]):
+    """
+    Применяет скидки сразу к множеству заказов (требуется numpy),
+    например при ночном пересчёте всех открытых заказов.
+    Parameters:
+        orders: заказы
+    Return:
+        numpy-массив итоговых сумм, совпадающих с apply_discounts для каждого заказа.
+    """
+    return default_rules().apply_bulk(orders)
+
+
+def apply_discounts_exact(order: Order, currency: Currency = rub) -> Money:
+    """
+    Применяет скидки к заказу в точном режиме (целые минимальные единицы).
+    Parameters:
+        order: исходный заказ,
+        currency: валюта результата, если total_amount задан не в Money.
+    Return:
+        Финальная сумма в Money.
+    """
+    return default_rules().apply_exact(order, currency)
+
+
+def total_exact(orders: Iterable[Order], currency: Currency = rub) -> Money:
+    """
+    Считает сумму заказов после скидок без накопления ошибки округления:
+    итоги складываются как целые числа и переводятся в Money один раз.
+    Валюта берётся из сумм Money, как в apply_discounts_exact.
+    Parameters:
+        orders: заказы в одной валюте,
+        currency: валюта результата, если суммы заказов заданы не в Money.
+    Return:
+        Общая сумма в Money.
+    Raises:
+        NotComparisonException: если суммы заказов в разных валютах.
+    """
+    orders = list(orders)
+    currencies = {order.total_amount.currency for order in orders if isinstance(order.total_amount, Money)}
+    if len(currencies) > 1:
+        raise NotComparisonException("Операция с разными валютами невозможна.")
+    if currencies:
+        currency = currencies.pop()
+    rules = default_rules()
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return from_minor_units(sum(rules.apply_minor(order) for order in orders), currency)
+    return from_minor_units(int(rules.apply_bulk_minor(orders).sum()), currency)
+
+
+def _minor_units_array(values: List[Amount]):
+    """
+    Переводит суммы в numpy-массив (int64) минимальных единиц, как to_minor_units.
+    Числа float переводятся векторно, остальные значения и неточные случаи - по одному.
+    """
+    import numpy as np
+
+    if set(map(type, values)) <= {float}:
+        others: List[int] = []
+        floats = np.array(values, dtype=np.float64)
+    else:
+        others = [i for i, value in enumerate(values) if type(value) is not float]
+        floats = np.array([value if type(value) is float else 0.0 for value in values], dtype=np.float64)
+    units = floats * MINOR_UNITS
+    rounded = np.rint(units)
+    # сравнения с NaN ложны, поэтому NaN и бесконечности не попадают в быстрый путь:
+    # они переводятся по одному, и to_minor_units возбуждает ошибку, как для одного значения
+    with np.errstate(invalid="ignore"):
+        fast = (np.abs(units) < _FAST_LIMIT) & (np.abs(units - rounded) < 1e-6)
+    result = np.where(fast, rounded, 0).astype(np.int64)
+    for i in others:
+        result[i] = to_minor_units(values[i])
+    for i in np.flatnonzero(~fast):
+        result[i] = to_minor_units(values[i])
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,270 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import List, Optional, Sequence, Set, Tuple
+
+from src.design.orders import DiscountRules, Order, default_rules
+
+
+# Сигнатура заказа: (сумма, флаг постоянного клиента, промокоды по порядку)
+OrderSignature = Tuple[float, bool, Tuple[str, ...]]
+
+
+class PricingCache:
+    """
+    Кэш итоговых сумм для повторяющихся заказов (например, повторных запросов цены
+    при оформлении заказа).
+
+    Ключ - сигнатура заказа: сумма, флаг постоянного клиента и кортеж промокодов.
+    Промокоды остаются кортежем, а не множеством: повторный промокод применяется
+    дважды, а порядок промокодов определяет порядок сложения скидок во float.
+    Кэш ограничен max_size записями и вытесняет давно не использованные (LRU).
+    Когда меняется версия правил скидок (DiscountRules.version), кэш очищается.
+
+    Attributes:
+        rules: правила скидок (None - правила по умолчанию),
+        max_size: сколько сигнатур помнить,
+        hits: сколько запросов получено из кэша,
+        misses: сколько запросов посчитано заново,
+        evictions: сколько записей вытеснено из-за ограничения размера,
+        invalidations: сколько раз кэш очищался из-за смены правил.
+    """
+    def __init__(self, rules: Optional[DiscountRules] = None, max_size: int = 65_536):
+        self.rules = rules or default_rules()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._version = self.rules.version
+        self._cache: OrderedDict[OrderSignature, float] = OrderedDict()
+
+    @staticmethod
+    def signature(order: Order) -> OrderSignature:
+        """Возвращает сигнатуру заказа - ключ кэша (в apply() вычисляется так же, без вызова метода)."""
+        return order.total_amount, bool(order.is_loyal_customer), tuple(order.discount_codes)
+
+    def apply(self, order: Order) -> float:
+        """
+        Возвращает итоговую сумму заказа, как apply_discounts, но из кэша, если такой заказ уже считался.
+        Parameters:
+            order: исходный заказ
+        Return:
+            Финальная сумма после применения всех скидок (не меньше 0).
+        """
+        rules = self.rules
+        cache = self._cache
+        if rules.version != self._version:
+            self.invalidate()
+
+        key = (order.total_amount, bool(order.is_loyal_customer), tuple(order.discount_codes))
+        price = cache.get(key)
+        if price is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return price
+
+        self.misses += 1
+        price = cache[key] = rules.apply(order)
+        if len(cache) > self.max_size:
+            cache.popitem(last=False)
+            self.evictions += 1
+        return price
+
+    def invalidate(self) -> None:
+        """Очищает кэш и запоминает текущую версию правил."""
+        self._cache.clear()
+        self._version = self.rules.version
+        self.invalidations += 1
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля запросов, полученных из кэша."""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def __len__(self) -> int:
+        """Возвращает количество записей в кэше."""
+        return len(self._cache)
+
+
+# Начиная с такого размера пакета векторный apply_bulk быстрее поштучного apply
+_BULK_THRESHOLD = 256
+
+
+def price_batch(orders: Sequence[Order], rules: Optional[DiscountRules] = None) -> List[float]:
+    """
+    Считает итоговые суммы пакета заказов одним вызовом.
+    Функция верхнего уровня, чтобы её можно было выполнять в пуле процессов: правила
+    передаются вместе с пакетом, поэтому процесс считает по тому же снимку правил, что
+    и вызывающий. Файл правил здесь не проверяется - это делает PricingService по таймеру.
+    Parameters:
+        orders: заказы,
+        rules: правила скидок (None - правила по умолчанию).
+    Return:
+        Итоговые суммы в порядке orders (те же, что у apply_discounts).
+    """
+    rules = rules or default_rules()
+    if len(orders) >= _BULK_THRESHOLD:
+        try:
+            return rules.apply_bulk(orders).tolist()
+        except ImportError:
+            pass
+    apply = rules.apply
+    return [apply(order) for order in orders]
+
+
+class PricingService:
+    """
+    Асинхронный сервис расчёта цен с микропакетами.
+
+    Корутины вызывают price(order) по одному заказу, а сервис собирает заказы в пакет
+    до max_batch штук или до max_delay_us микросекунд с первого заказа пакета и считает
+    пакет одним вызовом price_batch - в цикле событий или в executor (например, в пуле
+    процессов). Большой max_batch и max_delay_us повышают пропускную способность,
+    маленькие - снижают задержку; max_delay_us=0 собирает заказы, пришедшие за одну
+    итерацию цикла событий. Таймеры asyncio не точнее ~1 мс, поэтому задержки меньше
+    этого фактически округляются вверх.
+
+    Файл правил не проверяется на каждом пакете: раз в reload_interval секунд
+    reload_if_changed выполняется в отдельном потоке (asyncio.to_thread), а пакеты
+    тем временем считаются по текущему снимку правил.
+
+    Attributes:
+        max_batch: максимальный размер пакета,
+        max_delay_us: сколько микросекунд ждать заполнения пакета,
+        executor: где считать пакеты (None - прямо в цикле событий),
+        rules: правила скидок (None - правила по умолчанию),
+        reload_interval: период проверки файла правил в секундах (None - не проверять),
+        batches: сколько пакетов посчитано,
+        priced: сколько заказов посчитано,
+        reloads: сколько раз правила были перезагружены,
+        reload_error: последняя ошибка перезагрузки (прежние правила при этом остаются).
+    """
+    def __init__(
+        self,
+        max_batch: int = 256,
+        max_delay_us: int = 500,
+        executor: Optional[Executor] = None,
+        rules: Optional[DiscountRules] = None,
+        reload_interval: Optional[float] = 1.0,
+    ):
+        self.max_batch = max_batch
+        self.max_delay_us = max_delay_us
+        self.executor = executor
+        self.rules = rules or default_rules()
+        self.reload_interval = reload_interval
+        self.batches = 0
+        self.priced = 0
+        self.reloads = 0
+        self.reload_error: Optional[BaseException] = None
+        self._pending: List[Tuple[Order, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Handle] = None
+        self._reload_timer: Optional[asyncio.Handle] = None
+        self._reload_task: Optional[asyncio.Future] = None
+        self._in_flight: Set[asyncio.Future] = set()
+
+    async def price(self, order: Order) -> float:
+        """
+        Ставит заказ в текущий пакет и ждёт его расчёта.
+        Parameters:
+            order: исходный заказ
+        Return:
+            Финальная сумма после применения всех скидок (как apply_discounts).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._reload_timer is None and self.reload_interval is not None:
+            self._reload_timer = loop.call_later(self.reload_interval, self._check_rules)
+        self._pending.append((order, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            if self.max_delay_us > 0:
+                self._timer = loop.call_later(self.max_delay_us / 1_000_000, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+        return await future
+
+    async def close(self) -> None:
+        """Считает накопленный пакет, дожидается всех пакетов в executor и останавливает проверку правил."""
+        self._flush()
+        if self._reload_timer is not None:
+            self._reload_timer.cancel()
+            self._reload_timer = None
+        if self._reload_task is not None:
+            await asyncio.gather(self._reload_task, return_exceptions=True)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Средний размер посчитанного пакета."""
+        return self.priced / self.batches if self.batches else 0.0
+
+    def _check_rules(self) -> None:
+        """Запускает reload_if_changed в отдельном потоке и планирует следующую проверку по её завершении."""
+        self._reload_task = asyncio.ensure_future(asyncio.to_thread(self.rules.reload_if_changed))
+
+        def done(task: asyncio.Future) -> None:
+            self._reload_task = None
+            if task.cancelled():
+                return
+            if task.exception() is not None:
+                self.reload_error = task.exception()
+            elif task.result():
+                self.reloads += 1
+            if self._reload_timer is not None:
+                self._reload_timer = asyncio.get_running_loop().call_later(self.reload_interval, self._check_rules)
+
+        self._reload_task.add_done_callback(done)
+
+    def _flush(self) -> None:
+        """Отправляет накопленный пакет на расчёт."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.priced += len(batch)
+        orders = [order for order, _ in batch]
+        futures = [future for _, future in batch]
+
+        if self.executor is None:
+            try:
+                prices = price_batch(orders, self.rules)
+            except Exception as exc:
+                _fail(futures, exc)
+            else:
+                _resolve(futures, prices)
+            return
+
+        task = asyncio.get_running_loop().run_in_executor(self.executor, price_batch, orders, self.rules)
+        self._in_flight.add(task)
+
+        def done(task: asyncio.Future) -> None:
+            self._in_flight.discard(task)
+            if task.cancelled():
+                _fail(futures, asyncio.CancelledError())
+            elif task.exception() is not None:
+                _fail(futures, task.exception())
+            else:
+                _resolve(futures, task.result())
+
+        task.add_done_callback(done)
+
+
+def _resolve(futures: List[asyncio.Future], prices: List[float]) -> None:
+    """Передаёт цены ожидающим корутинам (пропуская отменённые)."""
+    for future, price in zip(futures, prices):
+        if not future.done():
+            future.set_result(price)
+
+
+def _fail(futures: List[asyncio.Future], exc: BaseException) -> None:
+    """Передаёт ошибку расчёта пакета всем ожидающим корутинам."""
+    for future in futures:
+        if not future.done():
+            future.set_exception(exc)
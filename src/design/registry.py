@@ -0,0 +1,104 @@
+import time
+from typing import Any, Callable, Dict, Hashable, Type
+
+
+# Группа entry points, через которую сторонние пакеты добавляют свои парсеры.
+# Загрузка модуля из entry point должна регистрировать парсеры через register_parser.
+ENTRY_POINT_GROUP = "src.design.parsers"
+
+# Реестр классов парсеров: тип источника -> класс парсера
+_PARSER_CLASSES: Dict[Hashable, Type] = {}
+
+_entry_points_loaded = False
+
+
+def register_parser(message_type: Hashable) -> Callable[[Type], Type]:
+    """
+    Декоратор, регистрирующий класс парсера для типа источника.
+
+    Тип источника - любой хэшируемый ключ: член MessageType или собственного
+    перечисления подключаемого пакета (например, для Discord или Teams).
+    Parameters:
+        message_type: тип источника
+    Return:
+        Декоратор, возвращающий класс без изменений.
+    """
+    def decorator(parser_class: Type) -> Type:
+        _PARSER_CLASSES[message_type] = parser_class
+        return parser_class
+
+    return decorator
+
+
+def registered_parsers() -> Dict[Hashable, Type]:
+    """Возвращает копию реестра: тип источника -> класс парсера."""
+    return dict(_PARSER_CLASSES)
+
+
+def entry_points(group: str):
+    """Возвращает entry points группы (importlib.metadata импортируется при первом вызове)."""
+    from importlib.metadata import entry_points
+
+    return entry_points(group=group)
+
+
+def load_entry_points() -> None:
+    """
+    Один раз импортирует модули, объявленные в группе ENTRY_POINT_GROUP.
+    Вызывается лениво, когда для типа источника не нашлось парсера.
+    """
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        entry_point.load()
+
+
+class ParserStats:
+    """
+    Счётчики работы одного парсера.
+
+    Attributes:
+        calls: количество вызовов parse(),
+        errors: количество вызовов, завершившихся исключением,
+        bytes: суммарная длина разобранных payload в символах,
+        seconds: суммарное время разбора.
+    """
+    __slots__ = ("calls", "errors", "bytes", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Возвращает значения счётчиков в виде словаря."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def profiled(parse: Callable[[str], Any], stats: ParserStats) -> Callable[[str], Any]:
+    """
+    Оборачивает метод parse парсера подсчётом вызовов, ошибок, объёма и времени.
+    Parameters:
+        parse: исходный метод parse,
+        stats: счётчики, которые нужно обновлять.
+    Return:
+        Функция с той же сигнатурой.
+    """
+    perf_counter = time.perf_counter
+
+    def wrapper(payload: str):
+        stats.calls += 1
+        stats.bytes += len(payload)
+        start = perf_counter()
+        try:
+            return parse(payload)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.seconds += perf_counter() - start
+
+    return wrapper
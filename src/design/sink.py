@@ -0,0 +1,259 @@
+import gzip
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.design.messages import ParsedMessage
+
+
+# Форматы записи: расширение файла
+FORMATS = {"ndjson": ".ndjson", "binary": ".bin"}
+
+# Сжатие блоков: расширение файла
+COMPRESSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+# Заголовок записи двоичного формата: длины имени и текста в байтах UTF-8.
+# Одиночные суррогаты (их даёт JsonDecoder для "\ud800") кодируются как есть - "surrogatepass"
+_HEADER = struct.Struct("<II")
+
+_encode_string = json.JSONEncoder(ensure_ascii=False).encode
+
+# Размер куска, который читатель NDJSON разбирает за один вызов json.loads
+_READ_CHUNK = 1 << 20
+
+
+def _ndjson_record(message: ParsedMessage) -> bytes:
+    """Кодирует сообщение строкой NDJSON: {"user":...,"text":...}\\n."""
+    return f'{{"user":{_encode_string(message.user)},"text":{_encode_string(message.text)}}}\n'.encode("utf-8", "surrogatepass")
+
+
+def _binary_record(message: ParsedMessage) -> bytes:
+    """Кодирует сообщение записью с префиксом длины: <длина имени><длина текста><имя><текст>."""
+    user = message.user.encode("utf-8", "surrogatepass")
+    text = message.text.encode("utf-8", "surrogatepass")
+    return _HEADER.pack(len(user), len(text)) + user + text
+
+
+_ENCODERS: Dict[str, Callable[[ParsedMessage], bytes]] = {"ndjson": _ndjson_record, "binary": _binary_record}
+
+
+class MessageSink:
+    """
+    Буферизованная запись потока ParsedMessage в файлы для архивации.
+
+    Сообщения кодируются в NDJSON или компактный двоичный формат с префиксом длины
+    и копятся в памяти до buffer_size байт; затем блок целиком (при необходимости
+    сжатый gzip или zstd) записывается одним вызовом write. Каждый сжатый блок - отдельный
+    gzip-член или zstd-кадр, поэтому файл остаётся корректным gzip/zstd-файлом.
+    Когда файл достигает max_file_size байт, запись продолжается в следующий файл:
+    <directory>/<prefix>-00000.ndjson[.gz], <prefix>-00001.ndjson[.gz], ...
+
+    Attributes:
+        directory: каталог для файлов,
+        format: "ndjson" или "binary",
+        compression: None, "gzip" или "zstd" (требуется zstandard),
+        buffer_size: размер блока в байтах до сжатия,
+        max_file_size: размер файла, после которого начинается новый,
+        prefix: префикс имён файлов,
+        files: записанные файлы в порядке создания,
+        written: сколько сообщений записано.
+    """
+    def __init__(
+        self,
+        directory: Path | str,
+        format: str = "ndjson",
+        compression: Optional[str] = None,
+        buffer_size: int = 1 << 20,
+        max_file_size: int = 256 << 20,
+        prefix: str = "messages",
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Неизвестный формат: {format}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Неизвестное сжатие: {compression}")
+        self.directory = Path(directory)
+        self.format = format
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.max_file_size = max_file_size
+        self.prefix = prefix
+        self.files: List[Path] = []
+        self.written = 0
+        self._encode = _ENCODERS[format]
+        self._compress = _compressor(compression)
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._file = None
+        self._file_size = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, message: ParsedMessage) -> None:
+        """Добавляет сообщение в буфер (блок записывается на диск при заполнении)."""
+        record = self._encode(message)
+        self._buffer.append(record)
+        self._buffered += len(record)
+        self.written += 1
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, messages: Iterable[ParsedMessage]) -> None:
+        """Добавляет в буфер поток сообщений, например результат handle_messages."""
+        encode = self._encode
+        buffer = self._buffer
+        for message in messages:
+            record = encode(message)
+            buffer.append(record)
+            self._buffered += len(record)
+            self.written += 1
+            if self._buffered >= self.buffer_size:
+                self.flush()
+                buffer = self._buffer
+
+    def flush(self) -> None:
+        """Записывает накопленный блок в текущий файл (и начинает новый файл, если текущий заполнен)."""
+        if not self._buffer:
+            return
+        block = b"".join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        if self._compress is not None:
+            block = self._compress(block)
+        if self._file is None:
+            self._open_next()
+        self._file.write(block)
+        self._file_size += len(block)
+        if self._file_size >= self.max_file_size:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        """Записывает остаток буфера и закрывает текущий файл."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "MessageSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _open_next(self) -> None:
+        """Открывает следующий файл серии."""
+        suffix = FORMATS[self.format] + COMPRESSIONS[self.compression]
+        path = self.directory / f"{self.prefix}-{len(self.files):05d}{suffix}"
+        self._file = open(path, "wb", buffering=0)
+        self._file_size = 0
+        self.files.append(path)
+
+
+def _compressor(compression: Optional[str]) -> Optional[Callable[[bytes], bytes]]:
+    """Возвращает функцию сжатия блока (zstandard импортируется только для "zstd")."""
+    if compression == "gzip":
+        return lambda block: gzip.compress(block, compresslevel=6, mtime=0)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).compress
+    return None
+
+
+def read_messages(path: Path | str) -> Iterator[ParsedMessage]:
+    """
+    Читает сообщения из файла MessageSink. Формат и сжатие определяются по расширению.
+    Несжатый файл отображается в память (mmap) и разбирается без копирования в Python-объекты
+    целиком; сжатый - сначала распаковывается в память.
+    Parameters:
+        path: путь к файлу
+    Return:
+        Итератор ParsedMessage в порядке записи.
+    """
+    path = Path(path)
+    data_format, compression = _detect(path)
+    with open(path, "rb") as file:
+        if path.stat().st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = mapped if compression is None else _decompress(compression, mapped)
+            if data_format == "ndjson":
+                yield from _read_ndjson(data)
+            else:
+                yield from _read_binary(data)
+
+
+def replay(paths: Iterable[Path | str]) -> Iterator[ParsedMessage]:
+    """
+    Читает сообщения из нескольких файлов подряд (например, MessageSink.files).
+    Parameters:
+        paths: пути к файлам в порядке записи
+    Return:
+        Итератор ParsedMessage.
+    """
+    for path in paths:
+        yield from read_messages(path)
+
+
+def _detect(path: Path) -> Tuple[str, Optional[str]]:
+    """Определяет формат и сжатие по расширениям файла."""
+    suffixes = path.suffixes
+    compression = None
+    for name, suffix in COMPRESSIONS.items():
+        if suffix and suffixes and suffixes[-1] == suffix:
+            compression = name
+            suffixes = suffixes[:-1]
+    for name, suffix in FORMATS.items():
+        if suffixes and suffixes[-1] == suffix:
+            return name, compression
+    raise ValueError(f"Неизвестный формат файла: {path.name}")
+
+
+def _decompress(compression: str, data) -> bytes:
+    """Распаковывает файл из последовательности сжатых блоков."""
+    if compression == "gzip":
+        return gzip.decompress(data)
+    import zstandard
+
+    # файл - несколько кадров подряд, каждый читается отдельно
+    return zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True).read()
+
+
+def _read_ndjson(data) -> Iterator[ParsedMessage]:
+    """
+    Разбирает строки NDJSON из буфера кусками примерно по _READ_CHUNK байт.
+    В JSON перевод строки внутри строк экранирован, поэтому кусок из целых строк
+    превращается в JSON-массив заменой переводов строк на запятые и разбирается одним json.loads
+    (он декодирует bytes с "surrogatepass", как и записаны строки).
+    """
+    loads = json.loads
+    start = 0
+    size = len(data)
+    while start < size:
+        end = data.rfind(b"\n", start, start + _READ_CHUNK)
+        if end < 0:
+            end = data.find(b"\n", start + _READ_CHUNK)
+        if end < 0:
+            end = size
+        chunk = data[start:end].rstrip(b"\n")
+        if chunk:
+            for record in loads(b"[" + chunk.replace(b"\n", b",") + b"]"):
+                yield ParsedMessage(record["user"], record["text"])
+        start = end + 1
+
+
+def _read_binary(data) -> Iterator[ParsedMessage]:
+    """Разбирает записи с префиксом длины из буфера."""
+    unpack_from = _HEADER.unpack_from
+    header_size = _HEADER.size
+    offset = 0
+    size = len(data)
+    while offset < size:
+        user_size, text_size = unpack_from(data, offset)
+        offset += header_size
+        user = str(data[offset:offset + user_size], "utf-8", "surrogatepass")
+        offset += user_size
+        text = str(data[offset:offset + text_size], "utf-8", "surrogatepass")
+        offset += text_size
+        yield ParsedMessage(user, text)
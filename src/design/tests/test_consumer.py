@@ -0,0 +1,86 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.design.consumer import LatencyStats, MessageConsumer, QueueSource
+from src.design.messages import JsonMessage, MessageType, ParsedMessage
+
+
+def telegram(text: str, padding: int = 0) -> JsonMessage:
+    return JsonMessage(MessageType.TELEGRAM, json.dumps({"from": "Andrew", "message": text, "pad": "x" * padding}))
+
+
+def slack(text: str) -> JsonMessage:
+    return JsonMessage(MessageType.SLACK, json.dumps({"user_name": "Bob", "content": text}))
+
+
+async def feed(source: QueueSource, messages) -> None:
+    for message in messages:
+        await source.put(message)
+    await source.close()
+
+
+class TestMessageConsumer:
+    def run(self, consumer, *batches):
+        async def main():
+            sources = [QueueSource(maxsize=2) for _ in batches]
+            feeders = [asyncio.create_task(feed(source, batch)) for source, batch in zip(sources, batches)]
+            await consumer.run(sources)
+            await asyncio.gather(*feeders)
+
+        asyncio.run(main())
+
+    def test_run(self):
+        received = []
+        consumer = MessageConsumer(received.append, workers=3, queue_size=2)
+        self.run(consumer, [telegram(str(i)) for i in range(20)], [slack(str(i)) for i in range(10)])
+
+        assert len(received) == 30
+        assert sorted(int(m.text) for m in received if m.user == "Bob") == list(range(10))
+        assert consumer.stats.count(MessageType.TELEGRAM) == 20
+        assert consumer.stats.count(MessageType.SLACK) == 10
+
+    def test_async_handler__offload(self):
+        received = []
+
+        async def handler(message: ParsedMessage):
+            await asyncio.sleep(0)
+            received.append(message.text)
+
+        with ThreadPoolExecutor(2) as executor:
+            consumer = MessageConsumer(handler, offload_threshold=1000, executor=executor)
+            self.run(consumer, [telegram("small"), telegram("large", padding=5000)])
+        assert sorted(received) == ["large", "small"]
+
+    def test_parse_error(self):
+        with pytest.raises(KeyError):
+            self.run(MessageConsumer(lambda message: None), [JsonMessage(MessageType.SLACK, '{"x": 1}')])
+
+    def test_parse_error__on_error(self):
+        errors = []
+        consumer = MessageConsumer(lambda message: None, on_error=lambda message, exc: errors.append(exc))
+        self.run(consumer, [JsonMessage(MessageType.SLACK, '{"x": 1}'), slack("ok")])
+        assert len(errors) == 1
+
+
+class TestLatencyStats:
+    def test_percentiles(self):
+        stats = LatencyStats(max_samples=100)
+        for i in range(1, 201):
+            stats.record(MessageType.SLACK, i / 1000)
+        percentiles = stats.percentiles((50, 99, 100))[MessageType.SLACK]
+        assert percentiles == {50: 0.15, 99: 0.199, 100: 0.2}
+
+    def test_nearest_rank(self):
+        stats = LatencyStats()
+        for value in (4, 1, 3, 2, 10, 9, 8, 7, 6, 5):
+            stats.record(MessageType.SLACK, value)
+        # ранг ceil(p / 100 * 10): 0 -> 1, 25 -> 3 (а не 2 при банковском округлении 2.5), 50 -> 5
+        assert stats.percentiles((0, 25, 50, 100))[MessageType.SLACK] == {0: 1, 25: 3, 50: 5, 100: 10}
+
+        even = LatencyStats()
+        for value in (1, 2, 3, 4):
+            even.record(MessageType.SLACK, value)
+        assert even.percentiles((50, 51))[MessageType.SLACK] == {50: 2, 51: 3}
@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from src.design.decoders import (
+    JsonDecoder,
+    MsgspecDecoder,
+    OrjsonDecoder,
+    ScannerDecoder,
+    default_decoder,
+    fast_decoder,
+)
+from src.design.messages import JsonMessage, ParserFactory, MessageType, ParsedMessage, handle_message
+
+
+PAYLOAD = json.dumps({
+    "id": 17,
+    "attachments": [{"name": 'a \\" ] } [ {', "data": "x" * 1000, "meta": {"ok": True, "size": None}}],
+    "from": "Андрей",
+    "tags": [],
+    "empty": {},
+    "message": "Привет, \"ревьюер\"!\n",
+    "extra": -1.5e3,
+})
+
+
+@pytest.fixture(
+    params=[JsonDecoder, lambda: ScannerDecoder(small_payload=0), ScannerDecoder, OrjsonDecoder, MsgspecDecoder],
+    ids=["json", "scanner", "scanner-small", "orjson", "msgspec"],
+)
+def decoder(request):
+    try:
+        return request.param()
+    except ImportError:
+        pytest.skip("декодер недоступен")
+
+
+class TestDecoders:
+    def test_extract(self, decoder):
+        assert decoder.extract(PAYLOAD, ("from", "message")) == ("Андрей", 'Привет, "ревьюер"!\n')
+
+    def test_extract__nested_value(self, decoder):
+        assert decoder.extract(PAYLOAD, ("tags", "empty", "extra", "id")) == ([], {}, -1500.0, 17)
+
+    def test_extract__whitespace(self, decoder):
+        payload = ' \n{ "from" : "a" ,\t"message":\n"b" } '
+        assert decoder.extract(payload, ("from", "message")) == ("a", "b")
+
+    def test_missing_key(self, decoder):
+        with pytest.raises(KeyError):
+            decoder.extract('{"from": "a", "x": [1, 2]}', ("from", "message"))
+
+    @pytest.mark.parametrize("payload", ['["from", "message"]', '{"from": "a", "message"', "not json"])
+    def test_invalid(self, decoder, payload):
+        with pytest.raises(ValueError):
+            decoder.extract(payload, ("from", "message"))
+
+    def test_duplicate_key__last_wins(self, decoder):
+        payload = '{"from": "a", "message": "b", "from": "c"}'
+        assert decoder.extract(payload, ("from", "message")) == ("c", "b")
+
+    @pytest.mark.parametrize("tail", ["x", "}", ', "from": "a"}'])
+    def test_trailing_data(self, decoder, tail):
+        with pytest.raises(ValueError):
+            decoder.extract(PAYLOAD + tail, ("from", "message"))
+
+    def test_default_decoder(self):
+        assert isinstance(default_decoder(), JsonDecoder)
+        assert isinstance(fast_decoder(), (MsgspecDecoder, OrjsonDecoder, ScannerDecoder))
+
+
+# Корректные для json.loads payload, которые msgspec и orjson разбирают иначе
+NON_STANDARD = [
+    '{"from": "a", "message": NaN}',
+    '{"from": "a", "message": -Infinity}',
+    '{"from": "a", "message": 1e400}',
+    '{"from": "\\ud800", "message": "b"}',
+    '{"from": "a", "message": 12345678901234567890123}',
+]
+
+
+class TestJsonParity:
+    @pytest.mark.parametrize("payload", NON_STANDARD)
+    @pytest.mark.parametrize("decoder", [default_decoder(), ScannerDecoder(small_payload=0)], ids=["default", "scanner"])
+    def test_non_standard(self, decoder, payload):
+        expected = json.loads(payload)
+        assert repr(decoder.extract(payload, ("from", "message"))) == repr((expected["from"], expected["message"]))
+
+    @pytest.mark.parametrize("payload", NON_STANDARD)
+    def test_handle_message(self, payload):
+        expected = json.loads(payload)
+        parsed = handle_message(JsonMessage(MessageType.TELEGRAM, payload))
+        assert repr((parsed.user, parsed.text)) == repr((expected["from"], expected["message"]))
+
+    @pytest.mark.parametrize(
+        "skipped",
+        ["tru", "01", "1.", "-", "nul", '"\\q"', '"\\u12"', '["\\q"]', "[tru]"],
+    )
+    def test_scanner_rejects_invalid_skipped_value(self, skipped):
+        payload = '{"x": %s, "from": "a", "message": "b"}' % skipped
+        with pytest.raises(ValueError):
+            json.loads(payload)
+        with pytest.raises(ValueError):
+            ScannerDecoder(small_payload=0).extract(payload, ("from", "message"))
+
+    @pytest.mark.parametrize(
+        "skipped",
+        [
+            '[tru, "%s"]' % ("y" * 4096),  # содержимое крупных массивов проверяется только на строки и скобки
+            '"a\tb"',  # управляющие символы в пропускаемых строках не проверяются
+        ],
+    )
+    def test_scanner_divergence(self, skipped):
+        payload = '{"x": %s, "from": "a", "message": "b"}' % skipped
+        with pytest.raises(ValueError):
+            json.loads(payload)
+        assert ScannerDecoder(small_payload=0).extract(payload, ("from", "message")) == ("a", "b")
+
+
+class TestParsersWithDecoder:
+    def test(self, decoder):
+        parser = ParserFactory(decoder).get_parser(MessageType.TELEGRAM)
+        assert parser.parse(PAYLOAD) == ParsedMessage(user="Андрей", text='Привет, "ревьюер"!\n')
@@ -0,0 +1,61 @@
+import pytest
+
+from src.design.dedup import Deduplicator
+from src.design.messages import JsonMessage, MessageType
+
+
+def telegram(text: str) -> JsonMessage:
+    return JsonMessage(MessageType.TELEGRAM, f'{{"from": "Andrew", "message": "{text}"}}')
+
+
+class TestDeduplicator:
+    def test_filter(self):
+        dedup = Deduplicator()
+        messages = [telegram("1"), telegram("2"), telegram("1"), telegram("3"), telegram("2")]
+        assert [m.payload for m in dedup.filter(messages)] == [m.payload for m in messages[:2] + messages[3:4]]
+        assert dedup.dedup_ratio == pytest.approx(0.4)
+
+    def test_type_is_part_of_fingerprint(self):
+        dedup = Deduplicator()
+        payload = '{"from": "a", "message": "b"}'
+        assert not dedup.is_duplicate(JsonMessage(MessageType.TELEGRAM, payload))
+        assert not dedup.is_duplicate(JsonMessage(MessageType.SLACK, payload))
+
+    def test_max_size(self):
+        dedup = Deduplicator(max_size=2)
+        for text in ("1", "2", "3"):
+            dedup.is_duplicate(telegram(text))
+        assert len(dedup) == 2
+        assert not dedup.is_duplicate(telegram("1"))
+
+    def test_window_seconds(self):
+        now = [0.0]
+        dedup = Deduplicator(window_seconds=10, clock=lambda: now[0])
+        dedup.is_duplicate(telegram("1"))
+        now[0] = 5.0
+        assert dedup.is_duplicate(telegram("1"))
+        now[0] = 10.5
+        assert not dedup.is_duplicate(telegram("1"))
+
+    def test_hash_collision(self, monkeypatch):
+        dedup = Deduplicator()
+        monkeypatch.setattr("builtins.hash", lambda value: 0)
+        assert not dedup.is_duplicate(telegram("1"))
+        assert not dedup.is_duplicate(telegram("2"))
+        assert dedup.is_duplicate(telegram("2"))
+
+    def test_window_stores_digest(self):
+        dedup = Deduplicator()
+        payload = '{"from": "a", "message": "b", "attachment": "%s"}' % ("x" * 100_000)
+        dedup.is_duplicate(JsonMessage(MessageType.TELEGRAM, payload))
+        (_, digest), = dedup._window.values()
+        assert len(digest) == 16
+        # равная, но другая строка
+        assert dedup.is_duplicate(JsonMessage(MessageType.TELEGRAM, "".join(payload)))
+
+    def test_fifo(self):
+        dedup = Deduplicator(max_size=2)
+        for text in ("1", "2", "1", "3"):
+            dedup.is_duplicate(telegram(text))
+        # повторное "1" не продлило его жизнь в окне: вытеснено первым
+        assert not dedup.is_duplicate(telegram("1"))
@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.design.messages import (
+    InternTable,
+    JsonMessage,
+    MessageType,
+    ParsedMessage,
+    ParsedMessageBatch,
+    handle_message,
+    handle_messages,
+)
+
+
+def make_messages():
+    return [
+        JsonMessage(MessageType.TELEGRAM, '{"from": "Andrew", "message": "one"}'),
+        JsonMessage(MessageType.SLACK, '{"user_name": "Bob", "content": "two"}'),
+        JsonMessage(MessageType.MATTERMOST, '{"username": "Eve", "text": "three"}'),
+        JsonMessage(MessageType.TELEGRAM, '{"from": "Andrew", "message": "four"}'),
+        JsonMessage(MessageType.SLACK, '{"user_name": "Bob", "content": "five"}'),
+    ]
+
+
+class TestHandleMessage:
+    @pytest.mark.parametrize(
+        "message_type, payload",
+        [
+            (MessageType.TELEGRAM, '{"from": "Andrew", "message": "Hello"}'),
+            (MessageType.MATTERMOST, '{"username": "Andrew", "text": "Hello"}'),
+            (MessageType.SLACK, '{"user_name": "Andrew", "content": "Hello"}'),
+        ],
+    )
+    def test(self, message_type, payload):
+        assert handle_message(JsonMessage(message_type, payload)) == ParsedMessage(user="Andrew", text="Hello")
+
+    def test_unknown_type(self):
+        with pytest.raises(ValueError):
+            handle_message(JsonMessage("discord", "{}"))
+
+
+class TestHandleMessages:
+    @pytest.fixture
+    def messages(self):
+        return make_messages() * 3
+
+    @pytest.fixture
+    def reference(self, messages):
+        return [handle_message(message) for message in messages]
+
+    @pytest.mark.parametrize("batch_size", [1, 4, 1024])
+    def test_order(self, messages, reference, batch_size):
+        assert list(handle_messages(iter(messages), batch_size=batch_size)) == reference
+
+    def test_executor(self, messages, reference):
+        with ThreadPoolExecutor(2) as executor:
+            results = list(handle_messages(messages, executor=executor, parallel_threshold=2))
+        assert results == reference
+
+    def test_lazy(self):
+        def source():
+            yield from make_messages()
+            raise AssertionError("источник прочитан дальше первой пачки")
+
+        results = handle_messages(source(), batch_size=5)
+        assert [next(results).text for _ in range(5)] == ["one", "two", "three", "four", "five"]
+
+
+class TestInternTable:
+    def test_same_object(self):
+        interner = InternTable()
+        first = interner("".join(["And", "rew"]))
+        second = interner("".join(["Andr", "ew"]))
+        assert first is second
+
+    def test_bounded(self):
+        interner = InternTable(maxsize=2)
+        for name in ("a", "b", "a", "c"):
+            interner(name)
+        assert len(interner) == 2
+        assert interner._strings.keys() == {"a", "c"}
+
+    def test_threads(self):
+        class SlowHashStr(str):
+            """Строка, отпускающая GIL при хешировании: вытеснение из другого потока
+            попадает между чтением строки из таблицы и её перемещением."""
+            def __hash__(self):
+                time.sleep(0)
+                return str.__hash__(self)
+
+        interner = InternTable(maxsize=2)
+        names = [SlowHashStr(f"user{i}") for i in range(3)]
+        start = threading.Barrier(8)
+
+        def work(offset):
+            start.wait()
+            return [interner(names[(offset + i) % 3]) for i in range(1_000)]
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(work, range(8)))
+        assert results == [[names[(offset + i) % 3] for i in range(1_000)] for offset in range(8)]
+        assert len(interner) == 2
+
+    def test_handle_message(self):
+        first = handle_message(JsonMessage(MessageType.TELEGRAM, '{"from": "Andrew", "message": "1"}'))
+        second = handle_message(JsonMessage(MessageType.SLACK, '{"user_name": "Andrew", "content": "2"}'))
+        assert first.user is second.user
+
+
+class TestParsedMessageBatch:
+    def test(self):
+        messages = [handle_message(message) for message in make_messages()]
+        batch = ParsedMessageBatch(messages)
+        assert len(batch) == 5
+        assert list(batch) == messages
+        assert batch[2] == messages[2]
+        assert batch.users == ["Andrew", "Bob", "Eve"]
+
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            ParsedMessage(user="a", text="b").extra = 1
@@ -0,0 +1,208 @@
+import dataclasses
+import json
+import random
+from decimal import Decimal
+
+import pytest
+
+from src.design.orders import (
+    DiscountFactory,
+    DiscountRules,
+    FixedDiscount,
+    LoyaltyDiscount,
+    Order,
+    PercentageDiscount,
+    apply_discounts,
+    apply_discounts_bulk,
+    apply_discounts_exact,
+    default_rules,
+    from_minor_units,
+    to_minor_units,
+    total_exact,
+)
+from src.wallets.currency import rub, usd
+from src.wallets.exceptions import NotComparisonException
+from src.wallets.money import Money
+
+
+class TestApplyDiscounts:
+    @pytest.mark.parametrize(
+        "order, expected",
+        [
+            (Order(100.0, True, ["FIX10", "PERCENT5"]), 80.0),
+            (Order(100.0, False, ["FIX10", "FIX10"]), 80.0),
+            (Order(100.0, False, ["UNKNOWN", "PERCENT5"]), 95.0),
+            (Order(8.0, True, ["FIX10"]), 0.0),
+            (Order(50.0, False, []), 50.0),
+        ],
+    )
+    def test(self, order, expected):
+        assert apply_discounts(order) == expected
+
+    def test_factory(self):
+        discounts = DiscountFactory.get_discounts_for_order(Order(100.0, True, ["PERCENT5", "FIX10"]))
+        assert [type(d) for d in discounts] == [PercentageDiscount, FixedDiscount, LoyaltyDiscount]
+
+    def test_shared_instances(self):
+        first = DiscountFactory.get_discounts_for_order(Order(100.0, False, ["FIX10"]))
+        second = DiscountFactory.get_discounts_for_order(Order(50.0, False, ["FIX10"]))
+        assert first[0] is second[0]
+
+    @pytest.mark.parametrize(
+        "discount, name", [(FixedDiscount(10), "amount"), (PercentageDiscount(5), "percent"), (LoyaltyDiscount(5), "amount")]
+    )
+    def test_immutable(self, discount, name):
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            setattr(discount, name, 50)
+
+
+class TestDiscountRules:
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"codes": {"FIX10": {"type": "fixed", "amount": 10}}}))
+        return path
+
+    def test_apply(self, path):
+        rules = DiscountRules(path)
+        assert rules.apply(Order(100.0, True, ["FIX10", "PERCENT5"])) == 90.0
+
+    def test_reload(self, path):
+        rules = DiscountRules(path)
+        old_table = rules.table
+        path.write_text(json.dumps({
+            "codes": {"SALE50": {"type": "percentage", "percent": 50}},
+            "loyalty": {"type": "loyalty", "amount": 1},
+        }))
+        rules.reload()
+
+        assert rules.version == old_table.version + 1
+        assert rules.apply(Order(100.0, True, ["FIX10", "SALE50"])) == 49.0
+        assert "FIX10" in old_table.codes  # прежний снимок не изменился
+
+    def test_reload_if_changed(self, path):
+        rules = DiscountRules(path)
+        assert not rules.reload_if_changed()
+        path.write_text(json.dumps({"codes": {}}))
+        assert rules.reload_if_changed()
+        assert rules.apply(Order(100.0, False, ["FIX10"])) == 100.0
+
+    def test_unknown_type(self, path):
+        path.write_text(json.dumps({"codes": {"X": {"type": "gift"}}}))
+        with pytest.raises(ValueError):
+            DiscountRules(path)
+
+
+class TestApplyDiscountsBulk:
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        return pytest.importorskip("numpy")
+
+    def test_matches_scalar(self):
+        rnd = random.Random(1)
+        code_sets = [[], ["FIX10"], ["PERCENT5"], ["PERCENT5", "FIX10", "FIX10"], ["UNKNOWN", "PERCENT5"]]
+        orders = [
+            Order(rnd.uniform(0, 30), rnd.random() < 0.5, list(rnd.choice(code_sets)))
+            for _ in range(2000)
+        ]
+        result = apply_discounts_bulk(orders)
+        assert result.tolist() == [apply_discounts(order) for order in orders]
+
+    def test_custom_rules(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({
+            "codes": {"SALE50": {"type": "percentage", "percent": 50}, "VIP": {"type": "loyalty", "amount": 3}},
+            "loyalty": {"type": "loyalty", "amount": 1},
+        }))
+        rules = DiscountRules(path)
+        orders = [Order(100.0, True, ["VIP", "SALE50"]), Order(100.0, False, ["VIP"]), Order(0.5, True, [])]
+        assert rules.apply_bulk(orders).tolist() == [46.0, 100.0, 0.0]
+
+    def test_empty(self):
+        assert apply_discounts_bulk([]).shape == (0,)
+
+
+class TestExactPricing:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (3, 300),
+            (19.99, 1999),
+            (1.005, 101),
+            (-0.125, -13),
+            (Decimal("2.345"), 235),
+            (Money(Decimal("7.1"), usd), 710),
+            (1e15 + 0.5, 100000000000000050),
+        ],
+    )
+    def test_to_minor_units(self, value, expected):
+        assert to_minor_units(value) == expected
+
+    def test_from_minor_units(self):
+        assert from_minor_units(1999, usd) == Money(Decimal("19.99"), usd)
+
+    @pytest.mark.parametrize(
+        "order, expected",
+        [
+            (Order(100.0, True, ["FIX10", "PERCENT5"]), Decimal("80.00")),
+            (Order(0.3, False, ["PERCENT5"]), Decimal("0.28")),  # скидка 1.5 копейки -> 2
+            (Order(0.1, False, ["PERCENT5"]), Decimal("0.09")),  # скидка 0.5 копейки -> 1
+            (Order(8.0, True, ["FIX10"]), Decimal("0.00")),
+        ],
+    )
+    def test_apply(self, order, expected):
+        assert apply_discounts_exact(order) == Money(expected, rub)
+
+    def test_money_amount(self):
+        order = Order(Money(Decimal("100.10"), usd), False, ["PERCENT5"])
+        assert apply_discounts_exact(order) == Money(Decimal("95.09"), usd)
+
+    def test_total_has_no_drift(self):
+        orders = [Order(0.1, False, []) for _ in range(1000)]
+        assert sum(apply_discounts(order) for order in orders) != 100.0
+        assert total_exact(orders) == Money(Decimal("100.00"), rub)
+
+    def test_total_currency(self):
+        orders = [Order(Money(Decimal("10.00"), usd), False, []), Order(Money(Decimal("0.10"), usd), False, [])]
+        assert total_exact(orders) == Money(Decimal("10.10"), usd)
+        assert total_exact(orders) == apply_discounts_exact(orders[0]) + apply_discounts_exact(orders[1])
+
+    def test_total_mixed_currencies(self):
+        orders = [Order(Money(Decimal("10.00"), usd), False, []), Order(Money(Decimal("1.00"), rub), False, [])]
+        with pytest.raises(NotComparisonException):
+            total_exact(orders)
+
+    @pytest.mark.parametrize("percent", [5, 5.0, Decimal("5"), Decimal("5.0")])
+    def test_percentage_types(self, percent):
+        discount = PercentageDiscount(percent)
+        assert discount.apply_minor(Order(0.3, False, []), 30) == 2  # 1.5 копейки -> 2
+        assert discount.apply(Order(100.0, False, [])) == 5.0
+
+    def test_bulk_matches_scalar(self):
+        pytest.importorskip("numpy")
+        rules = default_rules()
+        rnd = random.Random(2)
+        amounts = [0.1, 0.3, 1.005, -2.5, 1e12 + 0.5, Decimal("100.10"), Money(Decimal("7.77"), rub), 15]
+        amounts += [round(rnd.uniform(0, 300), rnd.choice([1, 2, 3])) for _ in range(2000)]
+        code_sets = [[], ["FIX10"], ["PERCENT5"], ["PERCENT5", "FIX10", "PERCENT5"]]
+        orders = [Order(amount, rnd.random() < 0.5, list(rnd.choice(code_sets))) for amount in amounts]
+
+        assert rules.apply_bulk_minor(orders).tolist() == [rules.apply_minor(order) for order in orders]
+
+    def test_bulk_non_terminating_percent(self, tmp_path):
+        # 100 / 3 = 33.333333333333336: числитель точной дроби ~3e16, произведение не помещается в int64
+        pytest.importorskip("numpy")
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"codes": {"THIRD": {"type": "percentage", "percent": 100 / 3}}}))
+        rules = DiscountRules(path)
+        orders = [Order(100.0, False, ["THIRD"]), Order(2500.0, False, ["THIRD"]), Order(-7.5, False, ["THIRD"])]
+
+        assert rules.apply_bulk_minor(orders).tolist() == [rules.apply_minor(order) for order in orders]
+        assert rules.apply_bulk_minor(orders).tolist()[:2] == [6667, 166667]
+
+    def test_bulk_nan(self):
+        pytest.importorskip("numpy")
+        with pytest.raises(ValueError):
+            to_minor_units(float("nan"))
+        with pytest.raises(ValueError):
+            default_rules().apply_bulk_minor([Order(float("nan"), False, []), Order(1.0, False, [])])
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.design.orders import DiscountRules, Order, apply_discounts
+from src.design.pricing import PricingCache, PricingService
+
+
+class TestPricingCache:
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({
+            "codes": {"FIX10": {"type": "fixed", "amount": 10}, "PERCENT5": {"type": "percentage", "percent": 5}},
+            "loyalty": {"type": "loyalty", "amount": 5},
+        }))
+        return path
+
+    @pytest.fixture
+    def cache(self, path):
+        return PricingCache(DiscountRules(path), max_size=2)
+
+    def test_hits(self, cache):
+        order = Order(100.0, True, ["FIX10", "PERCENT5"])
+        assert cache.apply(order) == 80.0
+        assert cache.apply(Order(100.0, True, ["FIX10", "PERCENT5"])) == 80.0
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate == 0.5
+
+    def test_codes_order_and_duplicates_matter(self, cache):
+        assert cache.apply(Order(100.0, False, ["FIX10"])) == 90.0
+        assert cache.apply(Order(100.0, False, ["FIX10", "FIX10"])) == 80.0
+        assert cache.misses == 2
+
+    def test_lru_eviction(self, cache):
+        first, second, third = (Order(amount, False, []) for amount in (1.0, 2.0, 3.0))
+        cache.apply(first)
+        cache.apply(second)
+        cache.apply(first)  # second становится самым старым
+        cache.apply(third)
+        assert (len(cache), cache.evictions) == (2, 1)
+        cache.apply(first)
+        assert cache.hits == 2
+
+    def test_invalidation_on_reload(self, cache, path):
+        order = Order(100.0, False, ["FIX10"])
+        assert cache.apply(order) == 90.0
+        path.write_text(json.dumps({"codes": {"FIX10": {"type": "fixed", "amount": 20}}}))
+        cache.rules.reload()
+
+        assert cache.apply(order) == 80.0
+        assert (cache.invalidations, cache.hits, len(cache)) == (1, 0, 1)
+
+    def test_default_rules(self):
+        order = Order(42.5, True, ["PERCENT5"])
+        assert PricingCache().apply(order) == apply_discounts(order)
+
+
+class TestPricingService:
+    def test_batches_by_size(self):
+        async def main():
+            service = PricingService(max_batch=4, max_delay_us=1_000_000)
+            prices = await asyncio.gather(*(service.price(order) for order in orders))
+            return service, prices
+
+        orders = [Order(float(amount), amount % 2 == 0, ["PERCENT5"]) for amount in range(1, 9)]
+        service, prices = asyncio.run(main())
+        assert prices == [apply_discounts(order) for order in orders]
+        assert (service.batches, service.mean_batch_size) == (2, 4.0)
+
+    def test_batches_by_delay(self):
+        async def main():
+            service = PricingService(max_batch=100, max_delay_us=1000)
+            first = asyncio.ensure_future(service.price(Order(100.0, False, ["FIX10"])))
+            await asyncio.sleep(0.05)
+            second = await service.price(Order(100.0, False, []))
+            return service, await first, second
+
+        service, first, second = asyncio.run(main())
+        assert (first, second, service.batches) == (90.0, 100.0, 2)
+
+    def test_executor(self):
+        async def main():
+            with ThreadPoolExecutor(2) as executor:
+                service = PricingService(max_batch=3, max_delay_us=0, executor=executor)
+                prices = await asyncio.gather(*(service.price(order) for order in orders))
+                await service.close()
+            return prices
+
+        orders = [Order(float(amount), True, ["FIX10"]) for amount in range(10)]
+        assert asyncio.run(main()) == [apply_discounts(order) for order in orders]
+
+    def test_error_is_passed_to_callers(self, monkeypatch):
+        async def main():
+            service = PricingService(max_batch=2)
+            return await asyncio.gather(
+                service.price(Order(1.0, False, [])), service.price(Order(2.0, False, [])), return_exceptions=True
+            )
+
+        monkeypatch.setattr("src.design.pricing.price_batch", lambda orders, rules: 1 / 0)
+        assert [type(result) for result in asyncio.run(main())] == [ZeroDivisionError, ZeroDivisionError]
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"codes": {"FIX10": {"type": "fixed", "amount": 10}}}))
+        return path
+
+    def test_custom_rules(self, path):
+        async def main():
+            service = PricingService(max_batch=2, rules=DiscountRules(path))
+            return await asyncio.gather(service.price(Order(100.0, True, ["FIX10"])), service.price(Order(5.0, True, [])))
+
+        assert asyncio.run(main()) == [90.0, 5.0]  # в файле нет скидки лояльности
+
+    def test_rules_are_reloaded_by_timer(self, path, monkeypatch):
+        rules = DiscountRules(path)
+        checks = []
+        reload_if_changed = rules.reload_if_changed
+        monkeypatch.setattr(rules, "reload_if_changed", lambda: checks.append(1) or reload_if_changed())
+
+        async def main():
+            service = PricingService(max_batch=1, rules=rules, reload_interval=0.01)
+            first = [await service.price(Order(100.0, False, ["FIX10"])) for _ in range(5)]
+            assert not checks  # пакеты не проверяют файл правил
+            path.write_text(json.dumps({"codes": {"FIX10": {"type": "fixed", "amount": 20}}}))
+            await asyncio.sleep(0.1)
+            second = await service.price(Order(100.0, False, ["FIX10"]))
+            await service.close()
+            return service, first, second
+
+        service, first, second = asyncio.run(main())
+        assert (first, second, service.reloads) == ([90.0] * 5, 80.0, 1)
+        assert checks
+
+    def test_reload_error_keeps_rules(self, path):
+        async def main():
+            service = PricingService(max_batch=1, rules=DiscountRules(path), reload_interval=0.01)
+            path.write_text("{")
+            await service.price(Order(100.0, False, []))
+            await asyncio.sleep(0.05)
+            price = await service.price(Order(100.0, False, ["FIX10"]))
+            await service.close()
+            return service, price
+
+        service, price = asyncio.run(main())
+        assert price == 90.0
+        assert isinstance(service.reload_error, ValueError)
+
+    def test_rules_are_picklable(self, path):
+        # правила передаются в пул процессов вместе с пакетом
+        rules = pickle.loads(pickle.dumps(DiscountRules(path)))
+        assert rules.apply(Order(100.0, False, ["FIX10"])) == 90.0
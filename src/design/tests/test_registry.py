@@ -0,0 +1,75 @@
+import enum
+
+import pytest
+
+from src.design import registry
+from src.design.messages import MessageParser, MessageType, ParsedMessage, ParserFactory
+from src.design.registry import register_parser
+
+
+class ExtraType(enum.Enum):
+    DISCORD = enum.auto()
+    TEAMS = enum.auto()
+
+
+class DiscordParser(MessageParser):
+    def parse(self, payload: str) -> ParsedMessage:
+        user, text = self.decoder.extract(payload, ("author", "content"))
+        return self._message(user, text)
+
+
+@pytest.fixture
+def clean_registry(monkeypatch):
+    monkeypatch.setattr(registry, "_PARSER_CLASSES", registry.registered_parsers())
+    monkeypatch.setattr(registry, "_entry_points_loaded", False)
+
+
+class TestRegistry:
+    def test_builtin(self):
+        assert set(registry.registered_parsers()) >= set(MessageType)
+
+    def test_register_after_factory(self, clean_registry):
+        factory = ParserFactory()
+        register_parser(ExtraType.DISCORD)(DiscordParser)
+        assert factory.parse(ExtraType.DISCORD, '{"author": "Andrew", "content": "hi"}') == ParsedMessage("Andrew", "hi")
+
+    def test_entry_points(self, clean_registry, monkeypatch):
+        class EntryPoint:
+            def load(self):
+                return register_parser(ExtraType.TEAMS)(DiscordParser)
+
+        monkeypatch.setattr(registry, "entry_points", lambda group: [EntryPoint()])
+        assert isinstance(ParserFactory().get_parser(ExtraType.TEAMS), DiscordParser)
+
+    def test_unknown(self, clean_registry, monkeypatch):
+        monkeypatch.setattr(registry, "entry_points", lambda group: [])
+        with pytest.raises(ValueError):
+            ParserFactory().parse(ExtraType.TEAMS, "{}")
+
+
+class TestProfiling:
+    def test_stats(self):
+        factory = ParserFactory(profile=True)
+        factory.parse(MessageType.SLACK, '{"user_name": "Bob", "content": "1"}')
+        factory.get_parser(MessageType.SLACK).parse_many(['{"user_name": "Bob", "content": "2"}'])
+        with pytest.raises(KeyError):
+            factory.parse(MessageType.SLACK, '{"content": "3"}')
+
+        snapshot = factory.stats_snapshot()["SLACK"]
+        assert snapshot["parser"] == "SlackParser"
+        assert snapshot["calls"] == 3
+        assert snapshot["errors"] == 1
+        assert snapshot["bytes"] == 36 * 2 + 16
+        assert snapshot["seconds"] > 0
+        assert factory.stats_snapshot()["TELEGRAM"]["calls"] == 0
+
+    def test_disabled(self):
+        factory = ParserFactory()
+        assert factory.stats_snapshot() == {}
+        assert "parse" not in vars(factory.get_parser(MessageType.SLACK))
+
+    def test_enable_profiling(self):
+        factory = ParserFactory()
+        factory.enable_profiling()
+        factory.parse(MessageType.TELEGRAM, '{"from": "Andrew", "message": "1"}')
+        assert factory.stats_snapshot()["TELEGRAM"]["calls"] == 1
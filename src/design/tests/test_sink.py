@@ -0,0 +1,72 @@
+import gzip
+import json
+
+import pytest
+
+from src.design.messages import JsonMessage, MessageType, ParsedMessage, handle_message
+from src.design.sink import MessageSink, read_messages, replay
+
+
+@pytest.fixture
+def messages():
+    return [ParsedMessage(f"user{i % 7}", f"сообщение {i}\n\"с кавычками\"") for i in range(1000)]
+
+
+class TestMessageSink:
+    @pytest.mark.parametrize("data_format", ["ndjson", "binary"])
+    @pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+    def test_roundtrip(self, tmp_path, messages, data_format, compression):
+        if compression == "zstd":
+            pytest.importorskip("zstandard")
+        with MessageSink(tmp_path, format=data_format, compression=compression, buffer_size=4096) as sink:
+            sink.write(messages[0])
+            sink.write_many(messages[1:])
+        assert len(sink.files) == 1
+        assert list(read_messages(sink.files[0])) == messages
+
+    @pytest.mark.parametrize("data_format", ["ndjson", "binary"])
+    def test_lone_surrogate_roundtrip(self, tmp_path, data_format):
+        # JsonDecoder, как и json.loads, превращает "\ud800" в одиночный суррогат
+        payload = json.dumps({"from": "\ud800user", "message": "текст \udfff"})
+        message = handle_message(JsonMessage(MessageType.TELEGRAM, payload))
+        assert "\ud800" in message.user
+        with MessageSink(tmp_path, format=data_format) as sink:
+            sink.write(message)
+            sink.write(ParsedMessage("user", "обычный"))
+        assert list(read_messages(sink.files[0])) == [message, ParsedMessage("user", "обычный")]
+
+    def test_rotation(self, tmp_path, messages):
+        with MessageSink(tmp_path, buffer_size=1024, max_file_size=8192) as sink:
+            sink.write_many(messages)
+        assert len(sink.files) > 1
+        assert all(path.stat().st_size < 8192 + 2048 for path in sink.files)
+        assert list(replay(sink.files)) == messages
+        assert sink.written == len(messages)
+
+    def test_ndjson_is_plain_json_lines(self, tmp_path, messages):
+        with MessageSink(tmp_path, compression="gzip") as sink:
+            sink.write_many(messages[:3])
+        lines = gzip.decompress(sink.files[0].read_bytes()).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [{"user": m.user, "text": m.text} for m in messages[:3]]
+
+    def test_buffering(self, tmp_path, messages):
+        sink = MessageSink(tmp_path, buffer_size=1 << 20)
+        sink.write_many(messages)
+        assert sink.files == []  # всё ещё в буфере
+        sink.close()
+        assert list(read_messages(sink.files[0])) == messages
+
+    def test_ndjson_read_in_chunks(self, tmp_path, messages, monkeypatch):
+        monkeypatch.setattr("src.design.sink._READ_CHUNK", 100)
+        with MessageSink(tmp_path) as sink:
+            sink.write_many(messages)
+        assert list(read_messages(sink.files[0])) == messages
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "messages-00000.bin"
+        path.touch()
+        assert list(read_messages(path)) == []
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            MessageSink(tmp_path, format="xml")
@@ -0,0 +1,208 @@
+import os
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[Tuple[Any, ...]]:
+    """
+    Лениво разбивает поток на кортежи по size элементов (последний может быть короче).
+    Parameters:
+        iterable: исходный поток,
+        size: размер пачки.
+    Return:
+        Итератор кортежей.
+    """
+    if size < 1:
+        raise ValueError("Размер пачки должен быть положительным.")
+    iterator = iter(iterable)
+    while batch := tuple(islice(iterator, size)):
+        yield batch
+
+
+def window(iterable: Iterable[Any], size: int, step: int = 1) -> Iterator[Tuple[Any, ...]]:
+    """
+    Скользящее окно по потоку: кортежи из size подряд идущих элементов со сдвигом step.
+    Неполное окно в конце потока не возвращается.
+    Parameters:
+        iterable: исходный поток,
+        size: размер окна,
+        step: сдвиг окна.
+    Return:
+        Итератор кортежей.
+    """
+    if size < 1 or step < 1:
+        raise ValueError("Размер и шаг окна должны быть положительными.")
+    iterator = iter(iterable)
+    items: Deque[Any] = deque(islice(iterator, size), maxlen=size)
+    while len(items) == size:
+        yield tuple(items)
+        new = tuple(islice(iterator, step))
+        if len(new) < step:
+            return
+        items.extend(new[-size:])
+
+
+def _map_chunk(fn: Callable[[Any], Any], chunk: Tuple[Any, ...]) -> List[Any]:
+    """Применяет fn к пачке элементов (функция верхнего уровня - для пула процессов)."""
+    return [fn(item) for item in chunk]
+
+
+def map_parallel(
+    fn: Callable[[Any], Any],
+    iterable: Iterable[Any],
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    chunk_size: int = 64,
+    max_in_flight: Optional[int] = None,
+    executor: Optional["Executor"] = None,
+) -> Iterator[Any]:
+    """
+    Применяет fn к элементам потока в пуле процессов.
+
+    Элементы отправляются в пул пачками по chunk_size, чтобы накладные расходы
+    на передачу между процессами делились на много элементов. В работе одновременно
+    не больше max_in_flight пачек: исходный поток читается, только когда результаты
+    забирают (backpressure), поэтому память ограничена и на бесконечных потоках.
+    Parameters:
+        fn: функция одного аргумента (для пула процессов - верхнего уровня, чтобы её можно было передать),
+        iterable: исходный поток,
+        workers: число процессов (None - по числу ядер),
+        ordered: сохранять порядок элементов (False - отдавать пачки по мере готовности),
+        chunk_size: размер пачки,
+        max_in_flight: сколько пачек обрабатывается одновременно (None - два на процесс),
+        executor: готовый пул (если None - создаётся ProcessPoolExecutor на время обхода).
+    Return:
+        Итератор результатов fn.
+    """
+    # concurrent.futures импортируется при первом использовании: он заметно замедляет импорт пакета
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    pool = executor
+    if pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(workers)
+    limit = max_in_flight or 2 * (workers or os.cpu_count() or 1)
+    chunks = batched(iterable, chunk_size)
+    pending: Deque[Any] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(_map_chunk, fn, chunk))
+            if len(pending) < limit:
+                continue
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown()
+
+
+class _TeeBuffer:
+    """Общий буфер копий tee: элементы хранятся, пока их не прочитают все копии."""
+    def __init__(self, iterable: Iterable[Any], n: int, max_buffer: int):
+        self.iterator = iter(iterable)
+        self.max_buffer = max_buffer
+        self.items: Deque[Any] = deque()
+        self.offset = 0  # номер первого элемента в буфере
+        self.positions = [0] * n
+
+    def next(self, copy: int) -> Any:
+        position = self.positions[copy]
+        index = position - self.offset
+        if index == len(self.items):
+            if len(self.items) >= self.max_buffer:
+                raise BufferError(
+                    f"Копия tee опередила остальные больше чем на {self.max_buffer} элементов."
+                )
+            self.items.append(next(self.iterator))
+        item = self.items[index]
+        self.positions[copy] = position + 1
+        # первый элемент буфера больше никому не нужен, когда его прочитала самая отстающая копия
+        if index == 0 and min(self.positions) > self.offset:
+            self.items.popleft()
+            self.offset += 1
+        return item
+
+
+class _TeeCopy:
+    """
+    Одна копия tee. Обычный итератор, а не генератор: после BufferError
+    копию можно продолжить, когда отстающие копии догонят её.
+    """
+    def __init__(self, buffer: _TeeBuffer, number: int):
+        self._buffer = buffer
+        self._number = number
+
+    def __iter__(self) -> "_TeeCopy":
+        return self
+
+    def __next__(self) -> Any:
+        return self._buffer.next(self._number)
+
+
+def tee(iterable: Iterable[Any], n: int = 2, max_buffer: int = 1024) -> Tuple[Iterator[Any], ...]:
+    """
+    Делит поток на n независимых копий с ограниченным буфером.
+    В отличие от itertools.tee, буфер не растёт бесконечно: если одна копия опередила
+    самую отстающую больше чем на max_buffer элементов, возбуждается BufferError
+    (копию можно читать дальше, когда отстающие копии продвинутся).
+    Parameters:
+        iterable: исходный поток,
+        n: число копий,
+        max_buffer: наибольшее число элементов, хранимых для отстающих копий.
+    Return:
+        Кортеж из n итераторов.
+    """
+    buffer = _TeeBuffer(iterable, n, max_buffer)
+    return tuple(_TeeCopy(buffer, number) for number in range(n))
+
+
+class Pipeline:
+    """
+    Ленивый конвейер над любым итерируемым источником (например, Fibo или RetrieveRemoteData).
+    Каждый шаг возвращает новый Pipeline, а элементы вычисляются только при итерации:
+
+        Pipeline(RetrieveRemoteData(per_page=3)).filter(is_even).map_parallel(heavy).batched(100)
+    """
+    def __init__(self, source: Iterable[Any]):
+        self._source = source
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._source)
+
+    def map(self, fn: Callable[[Any], Any]) -> "Pipeline":
+        """Применяет fn к каждому элементу в текущем процессе."""
+        return Pipeline(map(fn, self._source))
+
+    def map_parallel(self, fn: Callable[[Any], Any], workers: Optional[int] = None, ordered: bool = True, **kwargs) -> "Pipeline":
+        """Применяет fn к элементам в пуле процессов (см. map_parallel)."""
+        return Pipeline(map_parallel(fn, self._source, workers=workers, ordered=ordered, **kwargs))
+
+    def filter(self, predicate: Callable[[Any], bool]) -> "Pipeline":
+        """Оставляет элементы, для которых predicate истинен."""
+        return Pipeline(filter(predicate, self._source))
+
+    def batched(self, size: int) -> "Pipeline":
+        """Разбивает поток на кортежи по size элементов (см. batched)."""
+        return Pipeline(batched(self._source, size))
+
+    def window(self, size: int, step: int = 1) -> "Pipeline":
+        """Скользящее окно по потоку (см. window)."""
+        return Pipeline(window(self._source, size, step))
+
+    def tee(self, n: int = 2, max_buffer: int = 1024) -> Tuple["Pipeline", ...]:
+        """Делит поток на n копий с ограниченным буфером (см. tee)."""
+        return tuple(Pipeline(copy) for copy in tee(self._source, n, max_buffer))
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+
+import pytest
+
+from src.iterators.pipeline import Pipeline, batched, map_parallel, tee, window
+from src.iterators.utils import Fibo, RetrieveRemoteData
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+class TestBatched:
+    def test(self):
+        assert list(batched(range(7), 3)) == [(0, 1, 2), (3, 4, 5), (6,)]
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            list(batched(range(3), 0))
+
+
+class TestWindow:
+    @pytest.mark.parametrize(
+        "size, step, expected",
+        [
+            (3, 1, [(0, 1, 2), (1, 2, 3), (2, 3, 4)]),
+            (3, 2, [(0, 1, 2), (2, 3, 4)]),
+            (2, 3, [(0, 1), (3, 4)]),
+            (6, 1, []),
+        ],
+    )
+    def test(self, size, step, expected):
+        assert list(window(range(5), size, step)) == expected
+
+
+class TestMapParallel:
+    def test_ordered(self):
+        assert list(map_parallel(square, range(100), workers=2, chunk_size=7)) == [x * x for x in range(100)]
+
+    def test_unordered(self):
+        with ThreadPoolExecutor(4) as executor:
+            results = map_parallel(square, range(100), ordered=False, chunk_size=3, executor=executor)
+            assert sorted(results) == [x * x for x in range(100)]
+
+    def test_backpressure(self):
+        read = []
+
+        def source():
+            for x in count():
+                read.append(x)
+                yield x
+
+        with ThreadPoolExecutor(2) as executor:
+            results = map_parallel(square, source(), chunk_size=10, max_in_flight=2, executor=executor)
+            assert list(islice(results, 5)) == [0, 1, 4, 9, 16]
+            results.close()
+        assert len(read) <= 30
+
+
+class TestTee:
+    def test(self):
+        first, second = tee(Fibo(10), max_buffer=16)
+        assert list(first) == [0, 1, 1, 2, 3, 5, 8, 13, 21, 34]
+        assert list(second) == [0, 1, 1, 2, 3, 5, 8, 13, 21, 34]
+
+    def test_bounded_buffer(self):
+        first, second = tee(range(100), max_buffer=3)
+        assert [next(first) for _ in range(3)] == [0, 1, 2]
+        with pytest.raises(BufferError):
+            next(first)
+        assert next(second) == 0
+        assert next(first) == 3
+
+
+class TestPipeline:
+    def test_compose(self):
+        pipeline = Pipeline(RetrieveRemoteData(per_page=3)).filter(lambda x: x % 2 == 0).map(square).batched(2)
+        assert list(pipeline) == [(0, 4), (16, 36), (64,)]
+
+    def test_map_parallel_and_window(self):
+        pipeline = Pipeline(Fibo(8)).map_parallel(square, workers=2, chunk_size=2).window(2)
+        assert list(pipeline) == [(0, 1), (1, 1), (1, 4), (4, 9), (9, 25), (25, 64), (64, 169)]
+
+    def test_tee(self):
+        evens, odds = Pipeline(range(6)).tee()
+        assert list(evens.filter(lambda x: x % 2 == 0)) == [0, 2, 4]
+        assert list(odds.filter(lambda x: x % 2)) == [1, 3, 5]
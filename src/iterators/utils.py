@@ -1,5 +1,4 @@
 from dataclasses import dataclass, field
-from more_itertools import batched
 from typing import Iterable, TypeAlias
 
 SomeRemoteData: TypeAlias = int
@@ -68,6 +67,8 @@ def request(query: Query) -> Page:
     Return:
         объект Page с результатами и next
     """
+    from more_itertools import batched
+
     data = [i for i in range(0, 10)]
     chunks = list(batched(data, query.per_page))
     return Page(
@@ -0,0 +1,275 @@
+import re
+from array import array
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Заголовки нужных столбцов таблицы бюллетеня (после нормализации пробелов и переносов)
+HEADERS = {
+    "exchange_product_id": "код инструмента",
+    "exchange_product_name": "наименование инструмента",
+    "delivery_basis_name": "базис поставки",
+    "volume": "объем договоров в единицах измерения",
+    "total": "обьем договоров, руб.",
+    "count": "количество договоров, шт.",
+}
+
+# Раздел бюллетеня, из которого берутся строки
+SECTION_MARKER = "единица измерения: метрическая тонна"
+
+# Первая ячейка строки, завершающей таблицу
+TOTAL_MARKER = "итого"
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+@dataclass
+class BulletinColumns:
+    """
+    Строки одного бюллетеня в колоночном виде.
+
+    Строковые столбцы хранятся списками, числовые - типизированными массивами array("q"),
+    поэтому данные компактны и без копирования превращаются в NumPy/Arrow.
+
+    Attributes:
+        file_date: дата торгов (ключ партиционирования),
+        exchange_product_id: код инструмента (например "A100NVY060F"),
+        exchange_product_name: наименование инструмента,
+        oil_id: код продукта (первые 4 символа кода инструмента),
+        delivery_basis_id: код базиса поставки (символы 5-7),
+        delivery_basis_name: базис поставки,
+        delivery_type_id: код вида поставки (последний символ),
+        volume: объём договоров в единицах измерения,
+        total: объём договоров в рублях,
+        count: количество договоров.
+    """
+    file_date: date
+    exchange_product_id: List[str] = field(default_factory=list)
+    exchange_product_name: List[str] = field(default_factory=list)
+    oil_id: List[str] = field(default_factory=list)
+    delivery_basis_id: List[str] = field(default_factory=list)
+    delivery_basis_name: List[str] = field(default_factory=list)
+    delivery_type_id: List[str] = field(default_factory=list)
+    volume: array = field(default_factory=lambda: array("q"))
+    total: array = field(default_factory=lambda: array("q"))
+    count: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        """Возвращает количество строк."""
+        return len(self.exchange_product_id)
+
+    def append(self, product_id: str, product_name: str, basis_name: str, volume: int, total: int, count: int) -> None:
+        """Добавляет строку таблицы, вычисляя производные коды из кода инструмента."""
+        self.exchange_product_id.append(product_id)
+        self.exchange_product_name.append(product_name)
+        self.oil_id.append(product_id[:4])
+        self.delivery_basis_id.append(product_id[4:7])
+        self.delivery_basis_name.append(basis_name)
+        self.delivery_type_id.append(product_id[-1:])
+        self.volume.append(volume)
+        self.total.append(total)
+        self.count.append(count)
+
+    def columns(self) -> Dict[str, Sequence[Any]]:
+        """
+        Return:
+            Словарь {имя столбца: значения} без столбца даты.
+        """
+        return {name: getattr(self, name) for name in COLUMN_NAMES}
+
+    def to_numpy(self):
+        """
+        Преобразует строки в структурированный массив NumPy (требуется numpy).
+        Return:
+            numpy.ndarray со столбцами COLUMN_NAMES и file_date (datetime64[D]).
+        """
+        import numpy as np
+
+        dtype = [(name, object if name in STRING_COLUMNS else np.int64) for name in COLUMN_NAMES]
+        result = np.empty(len(self), dtype=dtype + [("file_date", "datetime64[D]")])
+        for name, values in self.columns().items():
+            result[name] = values
+        result["file_date"] = np.datetime64(self.file_date, "D")
+        return result
+
+    def to_arrow(self):
+        """
+        Преобразует строки в таблицу Arrow (требуется pyarrow).
+        Return:
+            pyarrow.Table со столбцами COLUMN_NAMES и file_date.
+        """
+        import pyarrow as pa
+
+        arrays = {
+            name: pa.array(values, type=pa.string() if name in STRING_COLUMNS else pa.int64())
+            for name, values in self.columns().items()
+        }
+        arrays["file_date"] = pa.array([self.file_date] * len(self), type=pa.date32())
+        return pa.table(arrays)
+
+
+# Порядок столбцов в выходных данных
+COLUMN_NAMES = (
+    "exchange_product_id",
+    "exchange_product_name",
+    "oil_id",
+    "delivery_basis_id",
+    "delivery_basis_name",
+    "delivery_type_id",
+    "volume",
+    "total",
+    "count",
+)
+STRING_COLUMNS = frozenset(COLUMN_NAMES[:6])
+
+
+def normalize_rows(rows: Iterable[Sequence[Any]], file_date: date) -> BulletinColumns:
+    """
+    Выбирает строки таблицы "Метрическая тонна" и приводит их к типизированным столбцам.
+    Строки без заключённых договоров (количество "-" или 0) пропускаются.
+    Parameters:
+        rows: строки листа как последовательности значений ячеек;
+        file_date: дата бюллетеня.
+    Returns:
+        BulletinColumns со строками таблицы (пустой, если таблица не найдена).
+    """
+    result = BulletinColumns(file_date)
+    positions: Optional[Dict[str, int]] = None
+    in_section = False
+
+    for row in rows:
+        first = _normalize(row[0]) if row else ""
+        if positions is None:
+            in_section = in_section or any(SECTION_MARKER in _normalize(cell) for cell in row)
+            if in_section:
+                positions = _find_headers(row)
+            continue
+
+        if first.startswith(TOTAL_MARKER):
+            break
+
+        count = _to_int(row[positions["count"]])
+        if not count:
+            continue
+        result.append(
+            str(row[positions["exchange_product_id"]]).strip(),
+            str(row[positions["exchange_product_name"]]).strip(),
+            str(row[positions["delivery_basis_name"]]).strip(),
+            _to_int(row[positions["volume"]]),
+            _to_int(row[positions["total"]]),
+            count,
+        )
+
+    return result
+
+
+def parse_bulletin_file(path: Path | str, file_date: date) -> BulletinColumns:
+    """
+    Читает .xls-файл бюллетеня (требуется xlrd) и нормализует строки.
+    Функция верхнего уровня, чтобы её можно было выполнять в пуле процессов.
+    Parameters:
+        path: путь к файлу;
+        file_date: дата бюллетеня.
+    Returns:
+        BulletinColumns со строками бюллетеня.
+    """
+    import xlrd
+
+    book = xlrd.open_workbook(str(path), on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        return normalize_rows((sheet.row_values(i) for i in range(sheet.nrows)), file_date)
+    finally:
+        book.release_resources()
+
+
+def parse_bulletins(
+    files: Iterable[Tuple[Path | str, date]],
+    executor: Optional[Executor] = None,
+    max_in_flight: int = 8,
+) -> Iterator[BulletinColumns]:
+    """
+    Параллельно парсит бюллетени и отдаёт результаты по мере готовности в исходном порядке.
+    В обработке одновременно не более max_in_flight файлов, поэтому в памяти
+    не накапливаются все бюллетени сразу.
+    Parameters:
+        files: пары (путь к файлу, дата), например из BulletinDownloader.download_all;
+        executor: пул для парсинга (если None - создаётся ProcessPoolExecutor);
+        max_in_flight: сколько файлов может обрабатываться одновременно.
+    Returns:
+        Итератор BulletinColumns, по одному на файл.
+    """
+    pool = executor
+    if pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor()
+    pending = deque()
+    try:
+        for path, file_date in files:
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+            pending.append(pool.submit(parse_bulletin_file, path, file_date))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown()
+
+
+def write_parquet_partitioned(batches: Iterable[BulletinColumns], directory: Path | str) -> List[Path]:
+    """
+    Записывает бюллетени в Parquet с партиционированием по дате (требуется pyarrow):
+    <directory>/file_date=YYYY-MM-DD/part-N.parquet.
+    Parameters:
+        batches: бюллетени, например результат parse_bulletins;
+        directory: корневой каталог набора данных.
+    Returns:
+        Список записанных файлов.
+    """
+    import pyarrow.parquet as pq
+
+    written = []
+    for batch in batches:
+        partition = Path(directory) / f"file_date={batch.file_date.isoformat()}"
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / f"part-{len(list(partition.glob('part-*.parquet')))}.parquet"
+        pq.write_table(batch.to_arrow(), path)
+        written.append(path)
+    return written
+
+
+def _find_headers(row: Sequence[Any]) -> Optional[Dict[str, int]]:
+    """
+    Ищет в строке заголовки нужных столбцов.
+    Return:
+        Словарь {имя столбца: индекс ячейки} или None, если это не строка заголовков.
+    """
+    cells = [_normalize(cell) for cell in row]
+    positions = {}
+    for name, header in HEADERS.items():
+        if header not in cells:
+            return None
+        positions[name] = cells.index(header)
+    return positions
+
+
+def _normalize(cell: Any) -> str:
+    """Приводит текст ячейки к нижнему регистру и схлопывает пробелы и переносы строк."""
+    return _SPACES_RE.sub(" ", str(cell)).strip().lower()
+
+
+def _to_int(cell: Any) -> int:
+    """Преобразует числовую ячейку в int ("-" и пустые ячейки - 0)."""
+    if isinstance(cell, (int, float)):
+        return int(round(cell))
+    text = str(cell).strip().replace(" ", "")
+    if not text or text == "-":
+        return 0
+    return int(round(float(text.replace(",", "."))))
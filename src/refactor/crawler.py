@@ -0,0 +1,151 @@
+import asyncio
+from concurrent.futures import Executor
+from datetime import date
+from typing import Callable, List, Optional, Tuple
+
+from src.refactor.index import LinkIndex
+from src.refactor.links import BASE_URL, PageLinksCache, extract_page_links
+from src.refactor.transport import Transport
+
+
+# Адрес страниц со списком бюллетеней
+LISTING_URL = f"{BASE_URL}/markets/oil_products/trades/results/"
+
+
+def listing_page_url(page: int) -> str:
+    """
+    Формирует адрес страницы списка бюллетеней по её номеру.
+    Parameters:
+        page: номер страницы, начиная с 1
+    Return:
+        Полный URL страницы.
+    """
+    return f"{LISTING_URL}?page=page-{page}"
+
+
+class BulletinCrawler:
+    """
+    Краулер страниц со ссылками на бюллетени.
+
+    Загружает страницы окнами по `concurrency` штук через асинхронный транспорт,
+    парсит их в пуле процессов и останавливается, как только на странице
+    встречается дата раньше `start_date` (страницы упорядочены от новых к старым).
+
+    Attributes:
+        transport: транспорт для загрузки страниц,
+        executor: пул для парсинга HTML (если None — создаётся ProcessPoolExecutor на время обхода),
+        concurrency: сколько страниц загружается одновременно,
+        page_url: функция, возвращающая URL страницы по её номеру,
+        max_pages: ограничение на число страниц за один обход,
+        index: индекс ранее найденных ссылок. Если задан, обход инкрементальный:
+            все найденные ссылки сохраняются в индекс, обход прекращается на первой странице
+            с уже известным URL, а результат берётся из индекса,
+        cache: кэш разбора страниц. Если задан, неизменившиеся страницы не разбираются повторно.
+    """
+    def __init__(
+        self,
+        transport: Transport,
+        executor: Optional[Executor] = None,
+        concurrency: int = 4,
+        page_url: Callable[[int], str] = listing_page_url,
+        max_pages: int = 1000,
+        index: Optional[LinkIndex] = None,
+        cache: Optional[PageLinksCache] = None,
+    ):
+        self.transport = transport
+        self.executor = executor
+        self.concurrency = concurrency
+        self.page_url = page_url
+        self.max_pages = max_pages
+        self.index = index
+        self.cache = cache
+
+    async def crawl(self, start_date: date, end_date: date) -> List[Tuple[str, date]]:
+        """
+        Обходит страницы и собирает ссылки на бюллетени за период.
+        Parameters:
+            start_date: начальная дата фильтра;
+            end_date: конечная дата фильтра.
+        Returns:
+            Список (URL, дата) без дубликатов в порядке обхода
+            (при инкрементальном обходе - в порядке LinkIndex.range).
+        """
+        executor = self.executor
+        if executor is None:
+            # multiprocessing импортируется, только когда пул действительно нужен
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor()
+        try:
+            return await self._crawl(executor, start_date, end_date)
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+
+    async def _crawl(self, executor: Executor, start_date: date, end_date: date) -> List[Tuple[str, date]]:
+        seen = set()
+        results = []
+
+        # индекс непрерывно покрывает даты от самой новой до min_date (обход всегда идёт с первой страницы),
+        # поэтому встретив известный URL, можно остановиться, если более ранние даты уже есть в индексе
+        oldest = self.index.min_date() if self.index is not None else None
+        stop_on_known = oldest is not None and oldest <= start_date
+
+        page = 1
+        stop = False
+        while not stop and page <= self.max_pages:
+            numbers = range(page, min(page + self.concurrency, self.max_pages + 1))
+            pages = await asyncio.gather(
+                *(self._load_page(executor, n) for n in numbers), return_exceptions=True
+            )
+
+            # страницы обрабатываются по порядку, чтобы ранняя остановка была детерминированной;
+            # ошибки страниц за точкой остановки (например, 404 после последней) не важны
+            for links in pages:
+                if isinstance(links, BaseException):
+                    raise links
+
+                for url, file_date in links:
+                    if start_date <= file_date <= end_date and url not in seen:
+                        seen.add(url)
+                        results.append((url, file_date))
+
+                stop = self._is_last_page(links, start_date)
+                if self.index is not None:
+                    stop = stop or (stop_on_known and any(url in self.index for url, _ in links))
+                    self.index.add_many(links)
+                if stop:
+                    break
+
+            page += len(numbers)
+
+        if self.index is not None:
+            return self.index.range(start_date, end_date)
+        return results
+
+    async def _load_page(self, executor: Executor, page: int) -> List[Tuple[str, date]]:
+        """
+        Загружает страницу и парсит её в пуле (если её нет в кэше разбора).
+        Хэширование и файловые операции кэша выполняются в потоке, чтобы не блокировать цикл событий.
+        Return:
+            Все ссылки со страницы без фильтрации по дате.
+        """
+        html = await self.transport.fetch(self.page_url(page))
+        if self.cache is not None:
+            links = await asyncio.to_thread(self.cache.get, html)
+            if links is not None:
+                return links
+        loop = asyncio.get_running_loop()
+        links = await loop.run_in_executor(executor, extract_page_links, html)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, html, links)
+        return links
+
+    @staticmethod
+    def _is_last_page(links: List[Tuple[str, date]], start_date: date) -> bool:
+        """
+        Проверяет, нужно ли прекратить обход после этой страницы.
+        Return:
+            True, если страница пуста или содержит даты раньше start_date.
+        """
+        return not links or min(file_date for _, file_date in links) < start_date
@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import os
+from datetime import date
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from src.refactor.transport import Transport
+
+
+class BulletinCache:
+    """
+    Локальный кэш файлов бюллетеней.
+
+    Путь к файлу определяется хэшем от пары (URL, дата), поэтому один и тот же
+    бюллетень всегда попадает в одно место и повторно не скачивается.
+    Недокачанные файлы хранятся рядом с суффиксом ".part".
+
+    Attributes:
+        directory: корневой каталог кэша.
+    """
+    def __init__(self, directory: Path | str):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(url: str, file_date: date) -> str:
+        """
+        Вычисляет ключ кэша.
+        Parameters:
+            url: полный адрес файла,
+            file_date: дата бюллетеня.
+        Return:
+            Шестнадцатеричный sha256 от "URL|дата".
+        """
+        return hashlib.sha256(f"{url}|{file_date.isoformat()}".encode()).hexdigest()
+
+    def path_for(self, url: str, file_date: date) -> Path:
+        """
+        Возвращает путь к файлу в кэше (файла может ещё не быть).
+        Файлы раскладываются по подкаталогам из первых двух символов ключа.
+        """
+        key = self.key(url, file_date)
+        suffix = Path(url.split("?")[0]).suffix
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    def __contains__(self, item: Tuple[str, date]) -> bool:
+        """Проверяет, скачан ли уже файл для пары (URL, дата)."""
+        url, file_date = item
+        return self.path_for(url, file_date).exists()
+
+
+class BulletinDownloader:
+    """
+    Параллельная загрузка бюллетеней в локальный кэш.
+
+    Одновременно скачивается не более `concurrency` файлов, каждый пишется на диск
+    блоками по `chunk_size` байт. Прерванная загрузка продолжается с места остановки
+    через HTTP Range, а уже закэшированные файлы пропускаются.
+
+    Attributes:
+        transport: транспорт для загрузки файлов,
+        cache: кэш, в который сохраняются файлы,
+        concurrency: максимальное число одновременных загрузок,
+        chunk_size: размер блока записи в байтах.
+    """
+    def __init__(self, transport: Transport, cache: BulletinCache, concurrency: int = 4, chunk_size: int = 64 * 1024):
+        self.transport = transport
+        self.cache = cache
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+
+    async def download_all(self, links: Iterable[Tuple[str, date]]) -> List[Tuple[str, date, Path]]:
+        """
+        Скачивает все файлы из списка, полученного от parse_page_links.
+        Parameters:
+            links: пары (URL, дата)
+        Returns:
+            Список (URL, дата, путь к файлу) в исходном порядке.
+        """
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def download(url: str, file_date: date) -> Tuple[str, date, Path]:
+            async with slots:
+                return url, file_date, await self.download(url, file_date)
+
+        return list(await asyncio.gather(*(download(url, file_date) for url, file_date in links)))
+
+    async def download(self, url: str, file_date: date) -> Path:
+        """
+        Скачивает один файл, если его ещё нет в кэше.
+        Parameters:
+            url: полный адрес файла,
+            file_date: дата бюллетеня.
+        Return:
+            Путь к файлу в кэше.
+        """
+        path = self.cache.path_for(url, file_date)
+        if path.exists():
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part = path.with_name(path.name + ".part")
+        await self.transport.download(url, part, self.chunk_size)
+        os.replace(part, path)  # файл появляется в кэше только целиком
+        return path
@@ -0,0 +1,83 @@
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+
+class LinkIndex:
+    """
+    Постоянный индекс всех когда-либо найденных ссылок на бюллетени.
+
+    Хранится в SQLite: URL - первичный ключ, по дате построен B-tree индекс,
+    поэтому выборка за период - это бинарный поиск границы и чтение подряд идущих строк.
+    Даты хранятся как порядковые номера (date.toordinal()).
+
+    Attributes:
+        path: путь к файлу базы (":memory:" - индекс в памяти).
+    """
+    def __init__(self, path: Path | str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS links (
+                url TEXT PRIMARY KEY,
+                file_date INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS links_file_date ON links (file_date);
+            """
+        )
+
+    def add_many(self, links: Iterable[Tuple[str, date]]) -> int:
+        """
+        Добавляет ссылки в индекс, уже известные URL пропускаются.
+        Parameters:
+            links: пары (URL, дата)
+        Return:
+            Количество новых ссылок.
+        """
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO links (url, file_date) VALUES (?, ?)",
+                ((url, file_date.toordinal()) for url, file_date in links),
+            )
+            return self._conn.total_changes - before
+
+    def range(self, start_date: date, end_date: date) -> List[Tuple[str, date]]:
+        """
+        Возвращает ссылки за период.
+        Parameters:
+            start_date: начальная дата (включительно);
+            end_date: конечная дата (включительно).
+        Returns:
+            Список (URL, дата) от новых к старым, как на страницах сайта.
+        """
+        rows = self._conn.execute(
+            "SELECT url, file_date FROM links WHERE file_date BETWEEN ? AND ? ORDER BY file_date DESC, url",
+            (start_date.toordinal(), end_date.toordinal()),
+        )
+        return [(url, date.fromordinal(ordinal)) for url, ordinal in rows]
+
+    def min_date(self) -> Optional[date]:
+        """Возвращает самую раннюю дату в индексе или None, если индекс пуст."""
+        (ordinal,) = self._conn.execute("SELECT MIN(file_date) FROM links").fetchone()
+        return date.fromordinal(ordinal) if ordinal is not None else None
+
+    def __contains__(self, url: str) -> bool:
+        """Проверяет, есть ли URL в индексе."""
+        return self._conn.execute("SELECT 1 FROM links WHERE url = ?", (url,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        """Возвращает количество ссылок в индексе."""
+        return self._conn.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        self._conn.close()
+
+    def __enter__(self) -> "LinkIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,7 +1,14 @@
 import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
 from datetime import date
-from typing import List, Tuple, Optional
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Tuple, Optional
 
 
 # Базовый URL на случай относительных ссылок
@@ -10,44 +17,237 @@ BASE_URL = "https://spimex.com"
 # Валидная часть пути
 EXPECTED_PATH_PREFIX = "/upload/reports/oil_xls/oil_xls_"
 
-def parse_page_links(html: str, start_date: date, end_date: date) -> List[Tuple[str, date]]:
+# Ссылка целиком: префикс, 8 цифр даты, имя файла с расширением ".xls", затем конец строки или query-параметры.
+# Группа 1 - путь без query-параметров, группа 2 - дата.
+_XLS_LINK_RE = re.compile(rf"({re.escape(EXPECTED_PATH_PREFIX)}([0-9]{{8}})[^?]*\.xls)(?:\?|\Z)")
+
+# Версия результатов разбора в PageLinksCache: входит в ключ, поэтому записи, сделанные прежним
+# разбором, не читаются. Увеличивать при изменении _XLS_LINK_RE, EXPECTED_PATH_PREFIX,
+# селектора BeautifulSoup в extract_page_links или формата записи кэша.
+_CACHE_FORMAT = 1
+
+def parse_page_links(
+    html: str, start_date: date, end_date: date, cache: Optional["PageLinksCache"] = None
+) -> List[Tuple[str, date]]:
     """
     Парсит ссылки на бюллетени с одной страницы.
     Возвращает список кортежей: (полная ссылка на файл, дата в имени файла)
     Parameters:
         html: HTML страницы;
         start_date: начальная дата фильтра;
-        end_date: конечная дата фильтра.
+        end_date: конечная дата фильтра;
+        cache: кэш результатов разбора (если страница не менялась, BeautifulSoup не вызывается).
     Returns:
         Список (URL, дата), если дата входит в заданный диапазон.
     """
+    links = cache.extract(html) if cache is not None else extract_page_links(html)
+    return filter_links_by_date(links, start_date, end_date)
+
+
+def extract_page_links(html: str) -> List[Tuple[str, date]]:
+    """
+    Извлекает все ссылки на бюллетени со страницы без фильтрации по дате.
+    Используется там, где фильтр применяется позже (например, краулером, которому
+    нужна самая ранняя дата на странице, чтобы решить, продолжать ли обход).
+    Parameters:
+        html: HTML страницы.
+    Returns:
+        Список (URL, дата) в порядке следования ссылок на странице.
+    """
+    # bs4 импортируется при первом разборе: модулю, которому нужны только ссылки и даты, он не нужен
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     links = soup.find_all("a", class_="accordeon-inner__item-title link xls")
+    return extract_links([link.get("href") for link in links])
+
+
+class PageLinksCache:
+    """
+    Дисковый кэш результатов extract_page_links для страниц списка бюллетеней.
 
+    Ключ - хэш blake2b от HTML страницы и версии разбора (_CACHE_FORMAT), значение - все ссылки страницы без фильтра
+    по дате, поэтому к закэшированному результату применим любой диапазон дат.
+    Каждая запись - отдельный JSON-файл; при превышении max_bytes удаляются записи,
+    которые дольше всего не читались. Порядок чтения и размеры записей хранятся
+    в памяти (каталог просматривается один раз при создании кэша, по mtime файлов,
+    которое обновляется при чтении), поэтому запись и вытеснение не обходят каталог.
+    При создании кэша удаляются временные файлы, оставшиеся от прерванной записи.
+    Кэш можно использовать из нескольких потоков.
+
+    Attributes:
+        directory: каталог кэша,
+        max_bytes: наибольший суммарный размер записей,
+        hits: сколько страниц найдено в кэше,
+        misses: сколько страниц пришлось разобрать,
+        evictions: сколько записей удалено из-за ограничения размера.
+    """
+    def __init__(self, directory: Path | str, max_bytes: int = 64 << 20):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # ключ -> размер записи в байтах, от давно не читавшихся к недавним
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        for temporary in self.directory.glob("*.tmp"):
+            temporary.unlink(missing_ok=True)
+        stats = [(path.stat(), path.stem) for path in self.directory.glob("*.json")]
+        for stat, key in sorted(stats, key=lambda item: item[0].st_mtime_ns):
+            self._entries[key] = stat.st_size
+        self._size = sum(self._entries.values())
+
+    @staticmethod
+    def key(html: str) -> str:
+        """Вычисляет ключ кэша: 128-битный blake2b от HTML с версией разбора в параметре person."""
+        person = f"page-links-v{_CACHE_FORMAT}".encode()
+        return hashlib.blake2b(html.encode(), digest_size=16, person=person).hexdigest()
+
+    def get(self, html: str) -> Optional[List[Tuple[str, date]]]:
+        """
+        Возвращает закэшированные ссылки страницы.
+        Return:
+            Список (URL, дата) или None, если страницы нет в кэше.
+        """
+        key = self.key(html)
+        path = self._path(key)
+        try:
+            records = json.loads(path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # запись вытеснена другим потоком после чтения
+        return [(url, date.fromordinal(ordinal)) for url, ordinal in records]
+
+    def put(self, html: str, links: List[Tuple[str, date]]) -> None:
+        """Сохраняет ссылки страницы (атомарно, через временный файл) и при необходимости вытесняет старые записи."""
+        key = self.key(html)
+        path = self._path(key)
+        data = json.dumps([(url, file_date.toordinal()) for url, file_date in links]).encode()
+        temporary = path.with_suffix(f".{threading.get_ident()}.tmp")
+        temporary.write_bytes(data)
+        with self._lock:
+            os.replace(temporary, path)
+            self._size += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def extract(self, html: str) -> List[Tuple[str, date]]:
+        """
+        Как extract_page_links, но с кэшем: страница разбирается, только если её нет в кэше.
+        Parameters:
+            html: HTML страницы.
+        Returns:
+            Список (URL, дата) в порядке следования ссылок на странице.
+        """
+        links = self.get(html)
+        if links is None:
+            links = extract_page_links(html)
+            self.put(html, links)
+        return links
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля страниц, найденных в кэше."""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _evict(self) -> None:
+        """
+        Удаляет давно не читавшиеся записи, пока размер кэша не станет меньше max_bytes
+        (вызывается под self._lock; последняя, только что добавленная запись не удаляется).
+        """
+        entries = self._entries
+        while self._size > self.max_bytes and len(entries) > 1:
+            key, size = entries.popitem(last=False)
+            self._path(key).unlink(missing_ok=True)
+            self._size -= size
+            self.evictions += 1
+
+
+def extract_links(hrefs: Iterable[Optional[str]]) -> List[Tuple[str, date]]:
+    """
+    Пакетно отбирает ссылки на бюллетени и извлекает из них даты.
+    Эквивалентно is_valid_xls_link + extract_date_from_href для каждой ссылки,
+    но проверяет форму ссылки одним заранее скомпилированным выражением.
+    Parameters:
+        hrefs: значения атрибута href (пустые и None пропускаются).
+    Returns:
+        Список (полный URL без query-параметров, дата) в исходном порядке.
+    """
     results = []
-    for link in links:
-        href = link.get("href")
+    match = _XLS_LINK_RE.match
+    for href in hrefs:
         if not href:
             continue
+        found = match(href)
+        if found is None:
+            continue
+        file_date = _date_from_digits(found.group(2))
+        if file_date is None:
+            continue
+        results.append((f"{BASE_URL}{found.group(1)}", file_date))
+    return results
 
-        href = href.split("?")[0]  # удаляем query-параметр (например ?utm...)
 
-        if not is_valid_xls_link(href):
-            continue
+def match_xls_link(href: str) -> Optional[Tuple[str, date]]:
+    """
+    Проверяет одну ссылку и извлекает из неё дату за один проход.
+    Parameters:
+        href: ссылка в виде строки (может содержать query-параметры)
+    Return:
+        Кортеж (путь без query-параметров, дата) или None, если ссылка не подходит.
+    """
+    found = _XLS_LINK_RE.match(href)
+    if found is None:
+        return None
+    file_date = _date_from_digits(found.group(2))
+    if file_date is None:
+        return None
+    return found.group(1), file_date
 
-        file_date = extract_date_from_href(href)
-        if not file_date:
-            # TODO: вместо print можно логировать ошибку извлечения даты
-            continue
 
-        if start_date <= file_date <= end_date:
-            full_url = href if href.startswith("http") else f"{BASE_URL}{href}"
-            results.append((full_url, file_date))
-        else:
-            # TODO: вместо print можно логировать ссылку вне диапазона
-            pass
+@lru_cache(maxsize=4096)
+def _date_from_digits(digits: str) -> Optional[date]:
+    """
+    Собирает дату из строки вида YYYYMMDD срезами, без strptime.
+    На странице архива много ссылок за одни и те же даты, поэтому результат кэшируется.
+    Return:
+        Дату или None, если такой даты не существует.
+    """
+    try:
+        return date(int(digits[:4]), int(digits[4:6]), int(digits[6:]))
+    except ValueError:
+        return None
 
-    return results
+
+def filter_links_by_date(
+    links: Iterable[Tuple[str, date]], start_date: date, end_date: date
+) -> List[Tuple[str, date]]:
+    """
+    Оставляет только ссылки, дата которых входит в заданный диапазон.
+    Parameters:
+        links: пары (URL, дата);
+        start_date: начальная дата фильтра;
+        end_date: конечная дата фильтра.
+    Returns:
+        Список (URL, дата) в исходном порядке.
+    """
+    return [(url, file_date) for url, file_date in links if start_date <= file_date <= end_date]
 
 
 def is_valid_xls_link(href: str) -> bool:
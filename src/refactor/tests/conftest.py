@@ -0,0 +1,65 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Обработчик локального сервера: отдаёт заранее заданные ответы по пути."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Range")))
+        body = self.server.routes.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        status = 200
+        content_range = None
+        range_header = self.headers.get("Range")
+        if range_header and self.server.ranges:
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start = max(start - self.server.range_shift, 0)
+            content_range = f"bytes {start}-{len(body) - 1}/{len(body)}"
+            status, body = 206, body[start:]
+
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if content_range:
+            self.send_header("Content-Range", content_range)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """
+    Локальный HTTP-сервер вместо spimex.com.
+    Ответы задаются через server.routes[path] = bytes,
+    поддержка Range включается через server.ranges = True,
+    а server.range_shift сдвигает начало ответа 206 назад (сервер отдаёт не тот диапазон).
+    """
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.routes = {}
+    httpd.requests = []
+    httpd.ranges = False
+    httpd.range_shift = 0
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from src.refactor.bulletins import BulletinColumns, normalize_rows, parse_bulletins, write_parquet_partitioned
+
+
+ROWS = [
+    ["Бюллетень по итогам торгов", "", "", "", "", ""],
+    ["Единица измерения: Метрическая тонна", "", "", "", "", ""],
+    ["Код\nИнструмента", "Наименование\nИнструмента", "Базис\nпоставки",
+     "Объем\nДоговоров\nв единицах\nизмерения", "Обьем\nДоговоров,\nруб.", "Количество\nДоговоров,\nшт."],
+    ["A100ANK060F", "Бензин (АИ-100-К5), ст. Ангарск-группа станций", "ст. Ангарск-группа станций",
+     "60", "5 040 000", "1"],
+    ["A100NVY060F", "Бензин (АИ-100-К5), Новоярославская", "Новоярославская", 120.0, 9840000.0, 2.0],
+    ["A92ANK060F", "Бензин (АИ-92-К5), ст. Ангарск-группа станций", "ст. Ангарск-группа станций", "-", "-", "-"],
+    ["Итого:", "", "", "180", "14880000", "3"],
+    ["Единица измерения: Килограмм", "", "", "", "", ""],
+]
+
+
+class TestNormalizeRows:
+    def test(self):
+        columns = normalize_rows(ROWS, date(2024, 1, 10))
+        assert len(columns) == 2
+        assert columns.exchange_product_id == ["A100ANK060F", "A100NVY060F"]
+        assert columns.oil_id == ["A100", "A100"]
+        assert columns.delivery_basis_id == ["ANK", "NVY"]
+        assert columns.delivery_type_id == ["F", "F"]
+        assert columns.delivery_basis_name == ["ст. Ангарск-группа станций", "Новоярославская"]
+        assert list(columns.volume) == [60, 120]
+        assert list(columns.total) == [5040000, 9840000]
+        assert list(columns.count) == [1, 2]
+
+    def test_no_table(self):
+        assert len(normalize_rows(ROWS[:1], date(2024, 1, 10))) == 0
+
+    def test_to_numpy(self):
+        np = pytest.importorskip("numpy")
+        array = normalize_rows(ROWS, date(2024, 1, 10)).to_numpy()
+        assert array["total"].sum() == 14880000
+        assert (array["file_date"] == np.datetime64("2024-01-10")).all()
+
+
+class TestParseBulletins:
+    @pytest.fixture
+    def files(self, tmp_path):
+        xlwt = pytest.importorskip("xlwt")
+        pytest.importorskip("xlrd")
+        files = []
+        for day in (9, 10, 11):
+            book = xlwt.Workbook()
+            sheet = book.add_sheet("TRADE_SUMMARY")
+            for i, row in enumerate(ROWS[: 3 + day - 8] + ROWS[6:]):
+                for j, value in enumerate(row):
+                    sheet.write(i, j, value)
+            path = tmp_path / f"oil_xls_202401{day}162000.xls"
+            book.save(str(path))
+            files.append((path, date(2024, 1, day)))
+        return files
+
+    def test_parse_bulletins(self, files):
+        with ThreadPoolExecutor(2) as executor:
+            results = list(parse_bulletins(iter(files), executor=executor, max_in_flight=2))
+        assert [batch.file_date for batch in results] == [date(2024, 1, 9), date(2024, 1, 10), date(2024, 1, 11)]
+        assert [len(batch) for batch in results] == [1, 2, 2]
+
+    def test_write_parquet_partitioned(self, files, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        with ThreadPoolExecutor(2) as executor:
+            written = write_parquet_partitioned(parse_bulletins(files, executor=executor), tmp_path / "dataset")
+        assert [path.parent.name for path in written] == [
+            "file_date=2024-01-09", "file_date=2024-01-10", "file_date=2024-01-11",
+        ]
+        table = pq.read_table(written[1])
+        assert table.column("volume").to_pylist() == [60, 120]
+        assert table.column("file_date").to_pylist() == [date(2024, 1, 10)] * 2
+
+
+class TestBulletinColumns:
+    def test_columns(self):
+        columns = BulletinColumns(date(2024, 1, 10))
+        columns.append("A100NVY060F", "Бензин", "Новоярославская", 1, 2, 3)
+        assert columns.columns()["delivery_basis_id"] == ["NVY"]
+        assert columns.columns()["count"].typecode == "q"
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from src.refactor.crawler import BulletinCrawler
+from src.refactor.index import LinkIndex
+from src.refactor.links import BASE_URL, PageLinksCache
+from src.refactor.transport import HttpTransport, TransportError
+
+
+def listing_html(*days: str) -> bytes:
+    links = "".join(
+        f'<a class="accordeon-inner__item-title link xls" '
+        f'href="/upload/reports/oil_xls/oil_xls_{day}162000.xls?r=1">{day}</a>'
+        for day in days
+    )
+    return f"<html><body>{links}</body></html>".encode()
+
+
+def url(day: str) -> str:
+    return f"{BASE_URL}/upload/reports/oil_xls/oil_xls_{day}162000.xls"
+
+
+@pytest.fixture
+def pages(server):
+    # страницы упорядочены от новых к старым, дубликат на стыке второй и третьей
+    server.routes = {
+        "/list?page=1": listing_html("20240110", "20240109"),
+        "/list?page=2": listing_html("20240108", "20240105"),
+        "/list?page=3": listing_html("20240105", "20240104"),
+        "/list?page=4": listing_html("20231229", "20231228"),
+        "/list?page=5": listing_html("20231227"),
+        "/list?page=6": listing_html(),
+    }
+    return server
+
+
+def crawl(server, start_date, end_date, concurrency=2, index=None, cache=None):
+    transport = HttpTransport(pool_size=2)
+    crawler = BulletinCrawler(
+        transport,
+        executor=ThreadPoolExecutor(),
+        concurrency=concurrency,
+        page_url=lambda n: f"{server.base_url}/list?page={n}",
+        index=index,
+        cache=cache,
+    )
+    try:
+        return asyncio.run(crawler.crawl(start_date, end_date))
+    finally:
+        transport.close()
+
+
+class TestBulletinCrawler:
+    def test_crawl(self, pages):
+        results = crawl(pages, date(2024, 1, 4), date(2024, 1, 9))
+        assert results == [
+            (url("20240109"), date(2024, 1, 9)),
+            (url("20240108"), date(2024, 1, 8)),
+            (url("20240105"), date(2024, 1, 5)),
+            (url("20240104"), date(2024, 1, 4)),
+        ]
+
+    def test_crawl__stops_early(self, pages):
+        crawl(pages, date(2024, 1, 6), date(2024, 1, 10))
+        assert ("/list?page=3", None) not in pages.requests
+
+    def test_crawl__empty_page(self, pages):
+        results = crawl(pages, date(2000, 1, 1), date(2030, 1, 1), concurrency=4)
+        assert len(results) == 8
+        assert ("/list?page=9", None) not in pages.requests
+
+    def test_crawl__parse_cache(self, pages, tmp_path):
+        cache = PageLinksCache(tmp_path)
+        first = crawl(pages, date(2024, 1, 4), date(2024, 1, 9), cache=cache)
+        misses = cache.misses
+        assert crawl(pages, date(2024, 1, 4), date(2024, 1, 9), cache=cache) == first
+        assert (cache.misses, cache.hits) == (misses, misses)
+
+    def test_crawl__cache_off_event_loop(self, pages, tmp_path):
+        cache = PageLinksCache(tmp_path)
+        threads = []
+        for name in ("get", "put"):
+            method = getattr(cache, name)
+
+            def record(*args, method=method):
+                threads.append(threading.current_thread())
+                return method(*args)
+
+            setattr(cache, name, record)
+        crawl(pages, date(2024, 1, 4), date(2024, 1, 9), cache=cache)
+        assert threads and threading.main_thread() not in threads
+
+    def test_crawl__http_error(self, server):
+        with pytest.raises(TransportError):
+            crawl(server, date(2024, 1, 1), date(2024, 1, 10))
+
+
+class TestIncrementalCrawl:
+    @pytest.fixture
+    def index(self):
+        with LinkIndex() as index:
+            yield index
+
+    def test_crawl__stops_on_known(self, pages, index):
+        crawl(pages, date(2024, 1, 4), date(2024, 1, 10), index=index)
+        assert len(index) == 7
+
+        # на сайте появилась новая страница, остальные сдвинулись
+        pages.routes = {
+            "/list?page=1": listing_html("20240112", "20240111"),
+            "/list?page=2": listing_html("20240110", "20240109"),
+            "/list?page=3": listing_html("20240108", "20240105"),
+        }
+        pages.requests.clear()
+        results = crawl(pages, date(2024, 1, 5), date(2024, 1, 31), index=index)
+
+        assert sorted(path for path, _ in pages.requests) == ["/list?page=1", "/list?page=2"]
+        assert [file_date.day for _, file_date in results] == [12, 11, 10, 9, 8, 5]
+
+    def test_crawl__index_does_not_cover_start(self, pages, index):
+        crawl(pages, date(2024, 1, 9), date(2024, 1, 10), index=index)
+        results = crawl(pages, date(2024, 1, 4), date(2024, 1, 10), index=index)
+        assert [file_date.day for _, file_date in results] == [10, 9, 8, 5, 4]
@@ -0,0 +1,102 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from src.refactor.downloader import BulletinCache, BulletinDownloader
+from src.refactor.transport import HttpTransport
+
+
+class TestBulletinDownloader:
+    @pytest.fixture
+    def files(self, server):
+        server.routes = {
+            "/oil_xls_20240110162000.xls": b"a" * 1000,
+            "/oil_xls_20240109162000.xls": b"b" * 300,
+        }
+        server.ranges = True
+        return [
+            (f"{server.base_url}/oil_xls_20240110162000.xls", date(2024, 1, 10)),
+            (f"{server.base_url}/oil_xls_20240109162000.xls", date(2024, 1, 9)),
+        ]
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return BulletinCache(tmp_path)
+
+    def download(self, cache, files):
+        transport = HttpTransport(pool_size=2)
+        downloader = BulletinDownloader(transport, cache, concurrency=2, chunk_size=128)
+        try:
+            return asyncio.run(downloader.download_all(files))
+        finally:
+            transport.close()
+
+    def test_download(self, server, cache, files):
+        results = self.download(cache, files)
+        assert [(url, file_date) for url, file_date, _ in results] == files
+        assert results[0][2].read_bytes() == b"a" * 1000
+        assert results[1][2].read_bytes() == b"b" * 300
+        assert all((url, file_date) in cache for url, file_date in files)
+
+    def test_download__cached(self, server, cache, files):
+        self.download(cache, files)
+        server.requests.clear()
+        self.download(cache, files)
+        assert server.requests == []
+
+    def test_download__resume(self, server, cache, files):
+        url, file_date = files[0]
+        path = cache.path_for(url, file_date)
+        path.parent.mkdir(parents=True)
+        path.with_name(path.name + ".part").write_bytes(b"a" * 400)
+
+        self.download(cache, files[:1])
+        assert server.requests == [("/oil_xls_20240110162000.xls", "bytes=400-")]
+        assert path.read_bytes() == b"a" * 1000
+
+    def test_download__complete_part(self, server, cache, files):
+        url, file_date = files[1]
+        path = cache.path_for(url, file_date)
+        path.parent.mkdir(parents=True)
+        path.with_name(path.name + ".part").write_bytes(b"b" * 300)
+
+        self.download(cache, files[1:])
+        assert server.requests == [("/oil_xls_20240109162000.xls", "bytes=300-")]
+        assert path.read_bytes() == b"b" * 300
+
+    def test_download__oversized_part(self, server, cache, files):
+        url, file_date = files[1]
+        path = cache.path_for(url, file_date)
+        path.parent.mkdir(parents=True)
+        path.with_name(path.name + ".part").write_bytes(b"x" * 400)
+
+        self.download(cache, files[1:])
+        assert server.requests == [("/oil_xls_20240109162000.xls", "bytes=400-"), ("/oil_xls_20240109162000.xls", None)]
+        assert path.read_bytes() == b"b" * 300
+
+    def test_download__range_mismatch(self, server, cache, files):
+        server.range_shift = 100
+        url, file_date = files[0]
+        path = cache.path_for(url, file_date)
+        path.parent.mkdir(parents=True)
+        path.with_name(path.name + ".part").write_bytes(b"a" * 400)
+
+        self.download(cache, files[:1])
+        assert server.requests == [("/oil_xls_20240110162000.xls", "bytes=400-"), ("/oil_xls_20240110162000.xls", None)]
+        assert path.read_bytes() == b"a" * 1000
+
+    def test_download__no_range_support(self, server, cache, files):
+        server.ranges = False
+        url, file_date = files[1]
+        path = cache.path_for(url, file_date)
+        path.parent.mkdir(parents=True)
+        path.with_name(path.name + ".part").write_bytes(b"stale")
+
+        self.download(cache, files[1:])
+        assert path.read_bytes() == b"b" * 300
+
+    def test_key__depends_on_date(self, cache):
+        url = "https://spimex.com/upload/reports/oil_xls/oil_xls_20240110162000.xls"
+        assert cache.path_for(url, date(2024, 1, 10)) != cache.path_for(url, date(2024, 1, 11))
+        assert cache.path_for(url, date(2024, 1, 10)).suffix == ".xls"
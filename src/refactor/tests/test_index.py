@@ -0,0 +1,33 @@
+from datetime import date
+
+import pytest
+
+from src.refactor.index import LinkIndex
+
+
+class TestLinkIndex:
+    @pytest.fixture
+    def index(self, tmp_path):
+        with LinkIndex(tmp_path / "links.sqlite") as index:
+            index.add_many([("a", date(2024, 1, 1)), ("b", date(2024, 1, 3)), ("c", date(2024, 1, 5))])
+            yield index
+
+    def test_add_many__skips_known(self, index):
+        assert index.add_many([("a", date(2024, 1, 1)), ("d", date(2024, 1, 2))]) == 1
+        assert len(index) == 4
+
+    def test_range(self, index):
+        assert index.range(date(2024, 1, 2), date(2024, 1, 5)) == [("c", date(2024, 1, 5)), ("b", date(2024, 1, 3))]
+
+    def test_contains(self, index):
+        assert "a" in index
+        assert "z" not in index
+
+    def test_min_date(self, index):
+        assert index.min_date() == date(2024, 1, 1)
+        assert LinkIndex().min_date() is None
+
+    def test_persistent(self, index, tmp_path):
+        index.close()
+        with LinkIndex(tmp_path / "links.sqlite") as reopened:
+            assert len(reopened) == 3
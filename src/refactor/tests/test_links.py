@@ -0,0 +1,161 @@
+import os
+from datetime import date
+
+import pytest
+
+from src.refactor.links import (
+    BASE_URL,
+    PageLinksCache,
+    extract_date_from_href,
+    extract_links,
+    is_valid_xls_link,
+    match_xls_link,
+    parse_page_links,
+)
+
+
+PREFIX = "/upload/reports/oil_xls/oil_xls_"
+
+HREFS = [
+    f"{PREFIX}20240110162000.xls",
+    f"{PREFIX}20240110162000.xls?r=5",
+    f"{PREFIX}20240230162000.xls",
+    f"{PREFIX}2024011.xls",
+    f"{PREFIX}20241301000000.xls",
+    f"{PREFIX}20240110162000.xlsx",
+    f"{PREFIX}20240110162000.xls.bak",
+    f"{PREFIX}20240110.xls",
+    f"{PREFIX}20240110162000.pdf?f=.xls",
+    f"/upload/reports/oil_xls/20240110162000.xls",
+    f"{BASE_URL}{PREFIX}20240110162000.xls",
+    "",
+    None,
+]
+
+
+def reference(hrefs):
+    results = []
+    for href in hrefs:
+        if not href:
+            continue
+        href = href.split("?")[0]
+        if not is_valid_xls_link(href):
+            continue
+        file_date = extract_date_from_href(href)
+        if file_date:
+            results.append((f"{BASE_URL}{href}", file_date))
+    return results
+
+
+class TestExtractLinks:
+    def test_matches_reference(self):
+        assert extract_links(HREFS) == reference(HREFS)
+
+    @pytest.mark.parametrize(
+        "href, expected",
+        [
+            (f"{PREFIX}20240110162000.xls?r=5", (f"{PREFIX}20240110162000.xls", date(2024, 1, 10))),
+            (f"{PREFIX}20240230162000.xls", None),
+            (f"{PREFIX}20240110162000.xlsx", None),
+        ],
+    )
+    def test_match_xls_link(self, href, expected):
+        assert match_xls_link(href) == expected
+
+
+class TestParsePageLinks:
+    def test(self):
+        html = "".join(
+            f'<a class="accordeon-inner__item-title link xls" href="{href}">x</a>'
+            for href in HREFS if href is not None
+        )
+        results = parse_page_links(html, date(2024, 1, 1), date(2024, 1, 31))
+        assert results == [
+            (f"{BASE_URL}{PREFIX}20240110162000.xls", date(2024, 1, 10)),
+            (f"{BASE_URL}{PREFIX}20240110162000.xls", date(2024, 1, 10)),
+            (f"{BASE_URL}{PREFIX}20240110.xls", date(2024, 1, 10)),
+        ]
+        assert parse_page_links(html, date(2024, 2, 1), date(2024, 2, 28)) == []
+
+
+def listing_page(*days: str) -> str:
+    return "".join(
+        f'<a class="accordeon-inner__item-title link xls" href="{PREFIX}{day}162000.xls">{day}</a>' for day in days
+    )
+
+
+class TestPageLinksCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return PageLinksCache(tmp_path / "cache")
+
+    def test_hit(self, cache, monkeypatch):
+        html = listing_page("20240110", "20240105")
+        first = parse_page_links(html, date(2024, 1, 1), date(2024, 1, 31), cache=cache)
+
+        monkeypatch.setattr("src.refactor.links.extract_page_links", lambda html: pytest.fail("разбор без кэша"))
+        assert parse_page_links(html, date(2024, 1, 1), date(2024, 1, 31), cache=cache) == first
+        # в кэше все ссылки, поэтому подходит любой диапазон дат
+        assert parse_page_links(html, date(2024, 1, 6), date(2024, 1, 31), cache=cache) == first[:1]
+        assert (cache.hits, cache.misses, cache.hit_rate) == (2, 1, pytest.approx(2 / 3))
+
+    def test_changed_page(self, cache):
+        cache.extract(listing_page("20240110"))
+        assert cache.extract(listing_page("20240111")) == [(f"{BASE_URL}{PREFIX}20240111162000.xls", date(2024, 1, 11))]
+        assert cache.misses == 2
+
+    def test_persistent(self, cache, tmp_path):
+        html = listing_page("20240110")
+        cache.extract(html)
+        reopened = PageLinksCache(tmp_path / "cache")
+        assert reopened.get(html) == cache.extract(html)
+
+    def test_format_version(self, cache, tmp_path, monkeypatch):
+        html = listing_page("20240110")
+        cache.extract(html)
+        monkeypatch.setattr("src.refactor.links._CACHE_FORMAT", 2)
+        assert PageLinksCache(tmp_path / "cache").get(html) is None
+
+    def test_stale_temporary_files(self, cache, tmp_path):
+        html = listing_page("20240110")
+        cache.extract(html)
+        stale = cache._path(cache.key(html)).with_suffix(".12345.tmp")
+        stale.write_bytes(b"[")
+        reopened = PageLinksCache(tmp_path / "cache")
+        assert not stale.exists()
+        assert reopened.get(html) is not None
+
+    def test_eviction(self, tmp_path):
+        pages = [listing_page(f"202401{day:02d}") for day in range(1, 6)]
+        PageLinksCache(tmp_path / "probe").extract(pages[0])
+        entry_size = next((tmp_path / "probe").glob("*.json")).stat().st_size
+        cache = PageLinksCache(tmp_path / "cache", max_bytes=entry_size * 3)
+        for i, html in enumerate(pages[:3]):
+            cache.extract(html)
+            os.utime(cache._path(cache.key(html)), ns=(i, i))
+        cache.get(pages[0])  # первая страница снова нужна
+        cache.extract(pages[3])
+
+        assert cache.evictions == 1
+        assert cache.get(pages[1]) is None
+        assert cache.get(pages[0]) is not None
+
+    def test_eviction__no_directory_scan(self, tmp_path, monkeypatch):
+        pages = [listing_page(f"202401{day:02d}") for day in range(1, 21)]
+        cache = PageLinksCache(tmp_path / "cache", max_bytes=1)
+        monkeypatch.setattr("pathlib.Path.glob", lambda *args: pytest.fail("обход каталога при записи"))
+        for html in pages:
+            cache.extract(html)
+        assert cache.evictions == 19
+        assert [path.name for path in os.scandir(tmp_path / "cache")] == [f"{cache.key(pages[-1])}.json"]
+
+    def test_reopened_order(self, tmp_path):
+        pages = [listing_page(f"202401{day:02d}") for day in range(1, 4)]
+        cache = PageLinksCache(tmp_path / "cache")
+        for i, html in enumerate(pages):
+            cache.extract(html)
+            os.utime(cache._path(cache.key(html)), ns=(3 - i, 3 - i))  # первая страница читалась последней
+        reopened = PageLinksCache(tmp_path / "cache", max_bytes=cache._size)
+        reopened.extract(listing_page("20240104"))
+        assert reopened.get(pages[0]) is not None
+        assert reopened.get(pages[2]) is None
@@ -0,0 +1,228 @@
+import asyncio
+import http.client
+import queue
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# Ключ пула соединений: (схема, хост, порт)
+PoolKey = Tuple[str, str, int]
+
+
+class TransportError(Exception):
+    """
+    Исключение, возникающее при ошибке сети или неуспешном HTTP-ответе.
+    """
+    pass
+
+
+# Content-Range: "bytes <начало>-<конец>/<размер>" или "bytes */<размер>"
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)")
+
+
+def _content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Разбирает заголовок Content-Range.
+    Return:
+        Кортеж (начало диапазона, полный размер); неизвестные части - None.
+    """
+    match = _CONTENT_RANGE_RE.fullmatch(value.strip()) if value else None
+    if match is None:
+        return None, None
+    start, total = match.groups()
+    return (int(start) if start else None), (int(total) if total != "*" else None)
+
+
+class Transport:
+    """
+    Абстрактный асинхронный транспорт для загрузки страниц.
+    Позволяет подменять реальную сеть (например, локальным сервером в тестах).
+    """
+    async def fetch(self, url: str) -> str:
+        """
+        Загружает страницу и возвращает её текст.
+        Parameters:
+            url: полный адрес страницы
+        Return:
+            HTML страницы в виде строки.
+        """
+        raise NotImplementedError("Метод fetch() должен быть реализован в подклассе.")
+
+    async def download(self, url: str, path: Path, chunk_size: int = 64 * 1024) -> None:
+        """
+        Скачивает файл в path по частям. Если path уже содержит начало файла,
+        загрузка продолжается с места остановки.
+        Parameters:
+            url: полный адрес файла,
+            path: куда сохранить файл,
+            chunk_size: размер читаемого за раз блока в байтах.
+        """
+        raise NotImplementedError("Метод download() должен быть реализован в подклассе.")
+
+    def close(self) -> None:
+        """Освобождает ресурсы транспорта."""
+        pass
+
+
+class HttpTransport(Transport):
+    """
+    HTTP-транспорт с пулом keep-alive соединений.
+
+    Блокирующие запросы http.client выполняются в потоках, а число
+    одновременных запросов ограничено размером пула.
+
+    Attributes:
+        pool_size: максимальное число одновременных соединений,
+        timeout: таймаут сокета в секундах,
+        headers: заголовки, добавляемые к каждому запросу.
+    """
+    def __init__(self, pool_size: int = 4, timeout: float = 30.0, headers: Optional[Dict[str, str]] = None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._idle: Dict[PoolKey, queue.SimpleQueue] = {}
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def fetch(self, url: str) -> str:
+        async with self._slots:
+            return await asyncio.to_thread(self._fetch_sync, url)
+
+    async def download(self, url: str, path: Path, chunk_size: int = 64 * 1024) -> None:
+        async with self._slots:
+            await asyncio.to_thread(self._download_sync, url, path, chunk_size)
+
+    def _fetch_sync(self, url: str) -> str:
+        """
+        Выполняет GET-запрос в текущем потоке, переиспользуя соединение из пула.
+        Parameters:
+            url: полный адрес страницы
+        Return:
+            Тело ответа, декодированное по charset из заголовков (по умолчанию utf-8).
+        """
+        key, conn, response = self._open("GET", url)
+        body = self._read(key, conn, response, url)
+        if response.status != 200:
+            raise TransportError(f"Неуспешный ответ {response.status}: {url}")
+        charset = response.headers.get_content_charset() or "utf-8"
+        return body.decode(charset, errors="replace")
+
+    def _download_sync(self, url: str, path: Path, chunk_size: int) -> None:
+        """
+        Скачивает файл по частям, продолжая с текущего размера path (Range-запрос).
+        Если сервер не поддерживает Range и вернул 200, файл перезаписывается целиком.
+        Ответ на Range-запрос сверяется с заголовком Content-Range: 416 означает, что файл
+        скачан, только если полный размер равен размеру path, а 206 дописывается, только если
+        начинается ровно с этого размера; иначе (устаревший или лишний кусок) файл
+        обрезается и скачивается заново с нуля.
+        """
+        offset = path.stat().st_size if path.exists() else 0
+        while True:
+            headers = {"Range": f"bytes={offset}-"} if offset else None
+            key, conn, response = self._open("GET", url, headers)
+            if response.status not in (206, 416) or not offset:
+                break
+            start, total = _content_range(response.headers.get("Content-Range"))
+            if response.status == 206 and start == offset:
+                break
+            self._read(key, conn, response, url)
+            if response.status == 416 and total == offset:
+                return  # запрошенный диапазон за концом файла: файл уже скачан полностью
+            path.write_bytes(b"")
+            offset = 0
+
+        if response.status not in (200, 206):
+            self._read(key, conn, response, url)
+            raise TransportError(f"Неуспешный ответ {response.status}: {url}")
+
+        mode = "ab" if response.status == 206 and offset else "wb"
+        try:
+            with open(path, mode) as file:
+                while chunk := response.read(chunk_size):
+                    file.write(chunk)
+        except (http.client.HTTPException, OSError) as exc:
+            conn.close()
+            raise TransportError(f"Ошибка загрузки {url}: {exc}") from exc
+        self._release(key, conn, response)
+
+    def _open(self, method: str, url: str, headers: Optional[Dict[str, str]] = None):
+        """
+        Отправляет запрос и получает заголовки ответа (тело не читается).
+        Если соединение из пула оказалось закрытым сервером, запрос повторяется на новом.
+        Return:
+            Кортеж (ключ пула, соединение, ответ).
+        """
+        key, target = self._split_url(url)
+        request_headers = {**self.headers, **(headers or {})}
+
+        for attempt in range(2):
+            conn, reused = self._acquire(key)
+            try:
+                conn.request(method, target, headers=request_headers)
+                return key, conn, conn.getresponse()
+            except (http.client.HTTPException, OSError) as exc:
+                conn.close()
+                if reused and attempt == 0:
+                    continue  # keep-alive соединение устарело, пробуем новое
+                raise TransportError(f"Ошибка запроса {url}: {exc}") from exc
+
+    def _read(self, key: PoolKey, conn: http.client.HTTPConnection, response: http.client.HTTPResponse, url: str) -> bytes:
+        """
+        Дочитывает тело ответа и возвращает соединение в пул.
+        Return:
+            Тело ответа.
+        """
+        try:
+            body = response.read()
+        except (http.client.HTTPException, OSError) as exc:
+            conn.close()
+            raise TransportError(f"Ошибка запроса {url}: {exc}") from exc
+        self._release(key, conn, response)
+        return body
+
+    def _split_url(self, url: str) -> Tuple[PoolKey, str]:
+        """
+        Разбирает URL на ключ пула и путь запроса.
+        Return:
+            Кортеж ((схема, хост, порт), путь с query-строкой).
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise TransportError(f"Неподдерживаемый URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        return (parts.scheme, parts.hostname, port), target
+
+    def _acquire(self, key: PoolKey) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Берёт свободное соединение из пула или открывает новое.
+        Return:
+            Кортеж (соединение, было ли оно переиспользовано).
+        """
+        idle = self._idle.setdefault(key, queue.SimpleQueue())
+        try:
+            return idle.get_nowait(), True
+        except queue.Empty:
+            pass
+        scheme, host, port = key
+        conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return conn_class(host, port, timeout=self.timeout), False
+
+    def _release(self, key: PoolKey, conn: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        """Возвращает соединение в пул, если сервер не закрыл его."""
+        if response.will_close:
+            conn.close()
+        else:
+            self._idle[key].put(conn)
+
+    def close(self) -> None:
+        for idle in self._idle.values():
+            while True:
+                try:
+                    idle.get_nowait().close()
+                except queue.Empty:
+                    break
+        self._idle.clear()
@@ -0,0 +1,75 @@
+import pkgutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import src
+
+ROOT = Path(src.__path__[0]).parent
+
+# Бюджет холодного импорта всех модулей подпакета, мс (с запасом ~3x от замеров bench_imports)
+IMPORT_BUDGET_MS = {
+    "wallets": 80,
+    "descriptors": 50,
+    "iterators": 60,
+    "design": 200,
+    "refactor": 250,
+}
+
+# Модули, которые должны загружаться только при первом использовании
+LAZY_MODULES = (
+    "bs4",
+    "more_itertools",
+    "msgspec",
+    "orjson",
+    "numpy",
+    "pyarrow",
+    "xlrd",
+    "importlib.metadata",
+    "multiprocessing",
+)
+
+# Дополнительные ленивые модули для отдельных подпакетов
+PACKAGE_LAZY_MODULES = {
+    "iterators": ("concurrent.futures",),
+}
+
+
+def import_code(name: str) -> str:
+    """Код, импортирующий все модули подпакета src.<name>, кроме тестов."""
+    modules = [f"src.{name}"] + [
+        f"src.{name}.{module.name}"
+        for module in pkgutil.iter_modules([str(ROOT / "src" / name)])
+        if module.name != "tests"
+    ]
+    return "; ".join(f"import {module}" for module in modules)
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True, cwd=ROOT)
+
+
+def import_time_ms(name: str) -> float:
+    """Суммарное время импорта модулей src по данным -X importtime, мс."""
+    total = 0
+    for line in run_python("-X", "importtime", "-c", import_code(name)).stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        if not module.startswith("  ") and module.strip().split(".")[0] == "src":
+            total += int(cumulative)
+    return total / 1000
+
+
+@pytest.mark.parametrize("name", sorted(IMPORT_BUDGET_MS))
+class TestImportBudget:
+    def test_no_eager_heavy_imports(self, name):
+        lazy = LAZY_MODULES + PACKAGE_LAZY_MODULES.get(name, ())
+        code = import_code(name) + f"; import sys; print(*[m for m in {lazy!r} if m in sys.modules])"
+        assert run_python("-c", code).stdout.split() == []
+
+    def test_import_time(self, name):
+        best = min(import_time_ms(name) for _ in range(3))
+        assert best < IMPORT_BUDGET_MS[name]
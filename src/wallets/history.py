@@ -0,0 +1,140 @@
+import time
+from array import array
+from bisect import bisect_right
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+from src.wallets.currency import Currency
+from src.wallets.money import Money
+
+
+class CurrencyHistory:
+    """
+    История баланса в одной валюте: append-only массив времён изменений
+    и соответствующих им балансов.
+
+    Баланс после каждого изменения - это префиксная сумма всех движений до него,
+    поэтому баланс на момент времени и чистый поток за период находятся
+    двоичным поиском по времени за O(log n), без повторного проигрывания операций.
+
+    Attributes:
+        times: времена изменений (неубывающие),
+        balances: баланс сразу после каждого изменения.
+    """
+    __slots__ = ("times", "balances")
+
+    def __init__(self):
+        self.times = array("d")
+        self.balances: List[Decimal] = []
+
+    def __len__(self) -> int:
+        """Возвращает количество записей."""
+        return len(self.times)
+
+    def append(self, when: float, balance: Decimal) -> None:
+        """Добавляет запись; время меньше последнего приравнивается к нему."""
+        if self.times and when < self.times[-1]:
+            when = self.times[-1]
+        self.times.append(when)
+        self.balances.append(balance)
+
+    def balance_at(self, when: float) -> Decimal:
+        """Возвращает баланс на момент when (0, если изменений ещё не было)."""
+        position = bisect_right(self.times, when)
+        return self.balances[position - 1] if position else Decimal(0)
+
+    def compact(self, before: float, interval: float) -> int:
+        """
+        Сжимает записи старше before до контрольных точек: в каждом интервале
+        длиной interval остаётся только последняя запись.
+        Return:
+            Количество удалённых записей.
+        """
+        end = bisect_right(self.times, before)
+        kept_times = array("d")
+        kept_balances: List[Decimal] = []
+        for i in range(end):
+            bucket = self.times[i] // interval
+            if i + 1 < end and self.times[i + 1] // interval == bucket:
+                continue
+            kept_times.append(self.times[i])
+            kept_balances.append(self.balances[i])
+
+        removed = end - len(kept_times)
+        self.times[:end] = kept_times
+        self.balances[:end] = kept_balances
+        return removed
+
+
+class WalletHistory:
+    """
+    История балансов кошелька по валютам (включается передачей в Wallet(history=...)).
+
+    Каждое изменение баланса записывается со временем из clock. Старую историю можно
+    сжать до периодических контрольных точек (compact), чтобы ограничить память:
+    после сжатия запросы к сжатому периоду точны на границах интервалов и в моменты
+    сохранённых записей.
+
+    Attributes:
+        clock: источник времени (по умолчанию time.time - время в секундах эпохи).
+    """
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._currencies: Dict[Currency, CurrencyHistory] = {}
+
+    def record(self, currency: Currency, balance: Decimal, when: Optional[float] = None) -> None:
+        """
+        Записывает новый баланс в валюте.
+        Parameters:
+            currency: валюта,
+            balance: баланс после изменения,
+            when: время изменения (None - текущее время из clock).
+        """
+        history = self._currencies.get(currency)
+        if history is None:
+            history = self._currencies[currency] = CurrencyHistory()
+        history.append(self.clock() if when is None else when, balance)
+
+    def balance_at(self, currency: Currency, when: float) -> Money:
+        """
+        Возвращает баланс в валюте на момент времени.
+        Parameters:
+            currency: валюта,
+            when: момент времени (в единицах clock).
+        Return:
+            Money с балансом после всех изменений не позже when.
+        """
+        history = self._currencies.get(currency)
+        return Money(history.balance_at(when) if history else Decimal(0), currency)
+
+    def net_flow(self, currency: Currency, start: float, end: float) -> Money:
+        """
+        Возвращает чистое изменение баланса за период (start, end].
+        Parameters:
+            currency: валюта,
+            start: начало периода (изменения в этот момент не входят),
+            end: конец периода (изменения в этот момент входят).
+        Return:
+            Money с разницей балансов на конец и начало периода.
+        """
+        return self.balance_at(currency, end) - self.balance_at(currency, start)
+
+    def compact(self, before: float, interval: float) -> int:
+        """
+        Сжимает историю старше before до контрольных точек с шагом interval.
+        Parameters:
+            before: записи не позже этого момента сжимаются,
+            interval: длина интервала контрольной точки (например, 3600 - час).
+        Return:
+            Количество удалённых записей по всем валютам.
+        """
+        return sum(history.compact(before, interval) for history in self._currencies.values())
+
+    @property
+    def currencies(self):
+        """Возвращает валюты, по которым есть история."""
+        return self._currencies.keys()
+
+    def __len__(self) -> int:
+        """Возвращает общее количество записей по всем валютам."""
+        return sum(len(history) for history in self._currencies.values())
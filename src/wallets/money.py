@@ -1,10 +1,13 @@
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Optional
 
 from src.wallets.currency import Currency
 from src.wallets.exceptions import NegativeValueException, NotComparisonException
 
+if TYPE_CHECKING:
+    from src.wallets.history import WalletHistory
+
 
 @dataclass
 class Money:
@@ -36,12 +39,14 @@ class Money:
 
 class Wallet:
     """Кошелёк, хранящий денежные суммы в разных валютах."""
-    def __init__(self, *args: Money):
+    def __init__(self, *args: Money, history: Optional["WalletHistory"] = None):
         """
         Инициализирует кошелёк с произвольным числом денежных сумм.
         Все суммы будут сгруппированы по валютам.
+        Если передана история (WalletHistory), в неё записывается каждое изменение баланса.
         """
         self._balances: Dict[Currency, Money] = {}
+        self.history = history
         for money in args:
             self.add(money)
 
@@ -54,11 +59,15 @@ class Wallet:
         if currency != money.currency:
             raise ValueError("Несоответствие валют.")
         self._balances[currency] = money
+        if self.history is not None:
+            self.history.record(currency, money.value)
 
     def __delitem__(self, currency: Currency):
         """Удаляет валюту из кошелька, если она там есть."""
         if currency in self._balances:
             del self._balances[currency]
+            if self.history is not None:
+                self.history.record(currency, Decimal(0))
 
     def __contains__(self, currency: Currency) -> bool:
         """Проверяет, содержится ли валюта в кошельке."""
@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+import pytest
+
+from src.wallets.currency import rub, usd
+from src.wallets.history import WalletHistory
+from src.wallets.money import Money, Wallet
+
+
+class TestWalletHistory:
+    @pytest.fixture
+    def now(self):
+        return [0.0]
+
+    @pytest.fixture
+    def wallet(self, now):
+        history = WalletHistory(clock=lambda: now[0])
+        wallet = Wallet(Money(Decimal(100), usd), history=history)
+        for when, amount in ((10.0, 50), (20.0, -30), (30.0, 80)):
+            now[0] = when
+            if amount > 0:
+                wallet.add(Money(Decimal(amount), usd))
+            else:
+                wallet.sub(Money(Decimal(-amount), usd))
+        return wallet
+
+    @pytest.mark.parametrize(
+        "when, expected",
+        [(-1.0, 0), (0.0, 100), (9.9, 100), (10.0, 150), (25.0, 120), (100.0, 200)],
+    )
+    def test_balance_at(self, wallet, when, expected):
+        assert wallet.history.balance_at(usd, when) == Money(Decimal(expected), usd)
+
+    def test_net_flow(self, wallet):
+        assert wallet.history.net_flow(usd, 10.0, 30.0) == Money(Decimal(50), usd)
+        assert wallet.history.net_flow(rub, 0.0, 30.0) == Money(Decimal(0), rub)
+
+    def test_delete(self, wallet, now):
+        now[0] = 40.0
+        del wallet[usd]
+        assert wallet.history.balance_at(usd, 40.0) == Money(Decimal(0), usd)
+        assert wallet.history.balance_at(usd, 39.0) == Money(Decimal(200), usd)
+
+    def test_clock_going_back(self, wallet, now):
+        now[0] = 5.0
+        wallet.add(Money(Decimal(1), usd))
+        assert wallet.history.balance_at(usd, 30.0) == Money(Decimal(201), usd)
+
+    def test_compact(self, wallet):
+        removed = wallet.history.compact(before=25.0, interval=100.0)
+        assert (removed, len(wallet.history)) == (2, 2)
+        assert wallet.history.balance_at(usd, 25.0) == Money(Decimal(120), usd)
+        assert wallet.history.balance_at(usd, 30.0) == Money(Decimal(200), usd)
+
+    def test_disabled_by_default(self):
+        assert Wallet(Money(Decimal(1), rub)).history is None